@@ -0,0 +1,427 @@
+import numpy as np
+from manim import (
+    DOWN,
+    GRAY,
+    LEFT,
+    RIGHT,
+    UP,
+    Circle,
+    Create,
+    CurvedArrow,
+    FadeIn,
+    FadeOut,
+    GrowFromCenter,
+    Indicate,
+    LaggedStart,
+    Line,
+    ReplacementTransform,
+    VGroup,
+)
+
+from algorithms.aho_corasick import (
+    ROOT,
+    AhoCorasickAutomaton,
+    aho_corasick_build_trace,
+    aho_corasick_search_trace,
+)
+from algorithms.text_source import TextSource, code_at
+from algorithms.trace import (
+    Backtrack,
+    Compare,
+    Found,
+    Match,
+    TableWrite,
+    Transition,
+    TrieNode,
+)
+from utils.base_visualization import BaseVisualization
+from utils.text_cache import cached_text
+from utils.visual_array import StreamingVisualArray, WindowedVisualArray
+
+
+class AhoCorasick(BaseVisualization):
+    """
+    A Manim animation that visualizes the Aho-Corasick search for many patterns:
+    building the trie and its failure links, then a single pass over the text.
+    """
+
+    TEXT = "ahishers"
+    PATTERNS = ["he", "she", "his", "hers"]
+    # A multi-pattern search is about finding every occurrence of every pattern
+    FIND_ALL = True
+    # Number of text cells on screen, longer texts scroll through this window
+    TEXT_WINDOW_SIZE = 20
+    CELL_WIDTH = 0.5
+    NODE_RADIUS = 0.22
+    # Area the trie is laid out in, below its root
+    TRIE_TOP = UP * 2.4 + RIGHT * 1.5
+    TRIE_WIDTH = 8.0
+    TRIE_HEIGHT = 4.2
+    INFO_FONT_SIZE = 22
+
+    def __init__(self, patterns=None, pattern=None, **kwargs):
+        if pattern is not None:
+            self.PATTERNS = pattern.split("\n")
+        if patterns is not None:
+            self.PATTERNS = patterns
+        super().__init__(**kwargs)
+        self.root_links_explained = False
+
+    @classmethod
+    def with_inputs(cls, text=None, pattern=None):
+        """
+        Returns a subclass of the scene that visualizes the given text and patterns,
+        one pattern per line of pattern, the way batch and service jobs pass them.
+        """
+        scene = super().with_inputs(text)
+        if pattern is not None:
+            scene.PATTERNS = pattern.split("\n")
+        return scene
+
+    def layout_trie(self):
+        """
+        Returns the position of every state, placed by depth with the leaves spread
+        evenly and every other state centered above its children.
+        """
+        automaton = self.automaton
+        children = [[] for _ in range(automaton.state_count)]
+        for state in automaton.breadth_first[1:]:
+            children[automaton.parent[state]].append(state)
+
+        # Leaves are numbered from left to right in depth-first order
+        x = np.zeros(automaton.state_count)
+        leaves = 0
+        stack = [ROOT]
+        while stack:
+            state = stack.pop()
+            stack.extend(reversed(children[state]))
+            if not children[state]:
+                x[state] = leaves
+                leaves += 1
+        for state in reversed(automaton.breadth_first):
+            if children[state]:
+                x[state] = x[children[state]].mean()
+
+        horizontal_gap = min(1.2, self.TRIE_WIDTH / max(leaves - 1, 1))
+        vertical_gap = min(1.0, self.TRIE_HEIGHT / max(max(automaton.depth), 1))
+        return [
+            self.TRIE_TOP
+            + RIGHT * (x[state] - (leaves - 1) / 2) * horizontal_gap
+            + DOWN * automaton.depth[state] * vertical_gap
+            for state in range(automaton.state_count)
+        ]
+
+    def create_node(self, state):
+        """
+        Creates the circle of a state labeled with its number, outlined in the
+        match color when a pattern ends at it.
+        """
+        ends_pattern = self.automaton.terminal[state] != -1
+        circle = Circle(
+            radius=self.NODE_RADIUS,
+            color=self.MATCH_COLOR if ends_pattern else self.ACCENT_COLOR,
+        ).move_to(self.positions[state])
+        label = cached_text(
+            str(state), font=self.FONT_NAME, font_size=18, color=self.TEXT_COLOR
+        ).move_to(circle)
+        return VGroup(circle, label)
+
+    def create_edge(self, parent, state, character):
+        """
+        Creates the trie edge from parent to state, labeled with its character.
+        """
+        start, end = self.positions[parent], self.positions[state]
+        direction = (end - start) / np.linalg.norm(end - start)
+        line = Line(
+            start + direction * self.NODE_RADIUS,
+            end - direction * self.NODE_RADIUS,
+            color=self.ACCENT_COLOR,
+        )
+        label = cached_text(
+            chr(character), font=self.FONT_NAME, font_size=20, color=self.TEXT_COLOR
+        ).next_to(line.get_center(), LEFT, buff=0.15)
+        return VGroup(line, label)
+
+    def create_fail_link(self, state, target):
+        """
+        Creates the arrow of the failure link from state to target.
+        """
+        start, end = self.positions[state], self.positions[target]
+        direction = (end - start) / np.linalg.norm(end - start)
+        return CurvedArrow(
+            start + direction * self.NODE_RADIUS,
+            end - direction * self.NODE_RADIUS,
+            angle=-np.pi / 4,
+            color=self.MISMATCH_COLOR,
+            stroke_width=2,
+            tip_length=0.15,
+        )
+
+    def indicate_fail_link(self, state):
+        """
+        Returns the animations indicating the failure link of a state, if drawn.
+        """
+        if state not in self.fail_links:
+            return []
+        return [Indicate(self.fail_links[state])]
+
+    def create_pointer(self, state, color):
+        return Circle(radius=self.NODE_RADIUS * 1.4, color=color).move_to(
+            self.positions[state]
+        )
+
+    def create_info_message(self, message):
+        """
+        Creates a message at the bottom left, below the patterns.
+        """
+        return (
+            cached_text(
+                message,
+                font=self.FONT_NAME,
+                font_size=self.INFO_FONT_SIZE,
+                color=self.TEXT_COLOR,
+            )
+            .to_edge(LEFT, buff=0.75)
+            .shift(DOWN * 2.2)
+        )
+
+    def show_message(self, message):
+        text = self.create_info_message(message)
+        self.play(FadeIn(text))
+        self.wait(1)
+        self.play(FadeOut(text))
+
+    def build_automaton(self):
+        """
+        Animates the construction of the trie and its failure links by replaying
+        the build trace.
+        """
+        pointer = None
+        current = None
+        for event in aho_corasick_build_trace(self.automaton):
+            if isinstance(event, TrieNode):
+                character = chr(event.character)
+                self.mark_step(
+                    description=f"Add state {event.state} for '{character}' "
+                    f"below state {event.parent}"
+                )
+                node = self.create_node(event.state)
+                edge = self.create_edge(event.parent, event.state, event.character)
+                self.nodes[event.state] = node
+                self.play(Create(edge), GrowFromCenter(node), run_time=0.5)
+                continue
+
+            # Every other event belongs to the failure link of the state it starts with
+            state = event[0]
+            if state != current:
+                current = state
+                self.mark_step(description=f"Failure link of state {state}")
+                if pointer is not None:
+                    self.play(FadeOut(pointer), run_time=0.2)
+                    pointer = None
+            if isinstance(event, Compare):
+                if pointer is None:
+                    pointer = self.create_pointer(event.pattern_index, GRAY)
+                    self.play(
+                        Indicate(self.nodes[state], color=self.HIGHLIGHT_COLOR),
+                        Create(pointer),
+                        run_time=0.5,
+                    )
+                self.describe_step(
+                    f"Does state {event.pattern_index} have an edge for "
+                    f"'{chr(self.automaton.character[state])}'?"
+                )
+            elif isinstance(event, Match):
+                target = self.positions[event.pattern_index]
+                self.play(
+                    pointer.animate.move_to(target).set_color(self.MATCH_COLOR),
+                    run_time=0.5,
+                )
+            elif isinstance(event, Backtrack):
+                self.describe_step(
+                    f"No edge at state {event.from_index}, follow its failure link "
+                    f"to state {event.to_index}"
+                )
+                self.play(
+                    pointer.animate.move_to(self.positions[event.to_index]),
+                    *self.indicate_fail_link(event.from_index),
+                    run_time=0.5,
+                )
+            elif isinstance(event, TableWrite):
+                self.describe_step(f"fail[{event.index}] = {event.value}")
+                if event.value != ROOT:
+                    link = self.create_fail_link(event.index, event.value)
+                    self.fail_links[event.index] = link
+                    self.play(Create(link), run_time=0.5)
+                elif not self.root_links_explained:
+                    self.show_message(
+                        "Failure links to the root (state 0) are not drawn"
+                    )
+                    self.root_links_explained = True
+        if pointer is not None:
+            self.play(FadeOut(pointer), run_time=0.2)
+
+    def summarize_skipped_steps(self, start, end):
+        """
+        Grays out the text read while skipping.
+        """
+        start = 0 if start is None else start
+        end = self.text_mobject.element_count() if end is None else end
+        animations = self.text_mobject.get_change_range_color_animations(
+            start, end, GRAY
+        )
+        if not animations:
+            return []
+        return [LaggedStart(*animations, lag_ratio=0.1)]
+
+    def search_text(self):
+        """
+        Animates the single pass of the search over the text by replaying its trace.
+        """
+        pointer = self.create_pointer(ROOT, self.HIGHLIGHT_COLOR)
+        self.play(Create(pointer))
+        found_text = None
+        trace = aho_corasick_search_trace(
+            self.text, self.automaton, find_all=self.FIND_ALL
+        )
+        for event in self.plan_fast_forward(trace, (Backtrack, Transition)):
+            if isinstance(event, Backtrack):
+                character = chr(code_at(self.text, event.text_index))
+                self.mark_step(
+                    event.text_index,
+                    f"No edge for '{character}' at state {event.from_index}, "
+                    f"follow its failure link to state {event.to_index}",
+                )
+                self.flush_color_changes()
+                if self.text_mobject.ensure_visible(event.text_index):
+                    self.match_overlay.update_markers()
+                animations = [
+                    pointer.animate.move_to(self.positions[event.to_index]).set_color(
+                        self.MISMATCH_COLOR
+                    ),
+                    self.text_mobject.get_change_element_color_animation(
+                        event.text_index, self.HIGHLIGHT_COLOR
+                    ),
+                ]
+                animations.extend(self.indicate_fail_link(event.from_index))
+                self.play(*animations, run_time=0.5)
+            elif isinstance(event, Transition):
+                character = chr(code_at(self.text, event.text_index))
+                if event.to_state == ROOT:
+                    description = f"No edge for '{character}' at the root, stay there"
+                else:
+                    description = (
+                        f"Follow the edge for '{character}' to state {event.to_state}"
+                    )
+                self.mark_step(event.text_index, description)
+                self.flush_color_changes()
+                if self.text_mobject.ensure_visible(event.text_index):
+                    self.match_overlay.update_markers()
+                # The text read since the root spells the string of the new state
+                depth = self.automaton.depth[event.to_state]
+                colors = {
+                    k: self.MATCH_COLOR
+                    for k in range(event.text_index + 1 - depth, event.text_index + 1)
+                }
+                if depth == 0:
+                    colors[event.text_index] = self.MISMATCH_COLOR
+                animations = [
+                    pointer.animate.move_to(self.positions[event.to_state]).set_color(
+                        self.HIGHLIGHT_COLOR
+                    )
+                ]
+                recolor = self.text_mobject.get_set_colors_animation(
+                    colors, default=self.TEXT_COLOR
+                )
+                if recolor is not None:
+                    animations.append(recolor)
+                self.play(*animations, run_time=0.5)
+            elif isinstance(event, Found):
+                pattern = self.PATTERNS[event.pattern]
+                self.describe_step(f"Found '{pattern}' at text index {event.position}")
+                self.flush_color_changes()
+                new_found_text = self.create_info_message(
+                    f"Found '{pattern}' at text index {event.position}"
+                )
+                animations = [
+                    Indicate(
+                        self.nodes[self.pattern_states[event.pattern]],
+                        color=self.MATCH_COLOR,
+                    ),
+                    (
+                        FadeIn(new_found_text)
+                        if found_text is None
+                        else ReplacementTransform(found_text, new_found_text)
+                    ),
+                ]
+                if self.FIND_ALL:
+                    animations.append(
+                        self.match_overlay.get_add_marker_animation(
+                            event.position, len(pattern)
+                        )
+                    )
+                found_text = new_found_text
+                self.play(*animations, run_time=0.5)
+                if not self.FIND_ALL:
+                    self.wait(1)
+
+    def construct(self):
+        self.setup_scene("Aho-Corasick Search Algorithm")
+
+        self.text = self.load_text()
+        self.automaton = AhoCorasickAutomaton(self.PATTERNS)
+        self.positions = self.layout_trie()
+        # State at which every pattern ends
+        self.pattern_states = [
+            self.automaton.state_of(pattern) for pattern in self.automaton.patterns
+        ]
+        self.nodes = {ROOT: self.create_node(ROOT)}
+        self.fail_links = {}
+
+        patterns_text = (
+            cached_text(
+                "Patterns:\n" + "\n".join(self.PATTERNS),
+                font=self.FONT_NAME,
+                font_size=26,
+                color=self.TEXT_COLOR,
+            )
+            .to_edge(LEFT, buff=0.75)
+            .align_to(self.nodes[ROOT], UP)
+        )
+        text_title = (
+            cached_text(
+                "Text:", font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR
+            )
+            .to_edge(LEFT, buff=0.75)
+            .to_edge(DOWN, buff=0.75)
+        )
+        array_class = (
+            StreamingVisualArray
+            if isinstance(self.text, TextSource)
+            else WindowedVisualArray
+        )
+        self.text_mobject = array_class(
+            self.text,
+            font_name=self.FONT_NAME,
+            font_size=24,
+            element_color=self.TEXT_COLOR,
+            border_color=self.ACCENT_COLOR,
+            cell_width=self.CELL_WIDTH,
+            cell_height=self.CELL_WIDTH,
+            compact=self.COMPACT_ARRAYS,
+            window_size=self.TEXT_WINDOW_SIZE,
+            margin=min(
+                max(self.automaton.lengths, default=0), self.TEXT_WINDOW_SIZE // 2
+            ),
+        ).next_to(text_title, RIGHT, buff=1)
+        self.add(patterns_text, self.nodes[ROOT], text_title, self.text_mobject)
+        self.match_overlay = self.create_match_overlay(
+            self.text_mobject.get_span,
+            UP,
+            pattern_length=max(self.automaton.lengths, default=0),
+        )
+
+        self.build_automaton()
+        self.search_text()
+
+        self.wait(2)
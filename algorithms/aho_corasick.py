@@ -0,0 +1,274 @@
+"""
+Aho-Corasick search for many patterns in a single pass over the text.
+
+The failure link of a trie state generalizes the LPS table of KMP to a set of
+patterns: it leads to the state of the longest proper suffix of the state's
+string that is a prefix of any pattern. All tables are flat integer arrays
+indexed by state, with the trie edges stored as a dense table of width equal to
+the number of distinct characters in the patterns.
+"""
+
+from array import array
+
+from algorithms.core import to_codes
+from algorithms.text_source import code_at, has_index
+from algorithms.trace import (
+    Backtrack,
+    Compare,
+    Found,
+    Match,
+    TableWrite,
+    Transition,
+    TrieNode,
+)
+
+# State of the empty string, where every search starts
+ROOT = 0
+
+
+class AhoCorasickAutomaton:
+    """
+    The trie of a set of patterns with its failure and output links.
+
+    goto holds the trie edges and -1 where a state has none, while transitions
+    holds the complete automaton, with the missing edges resolved through the
+    failure links, so that a search reads one entry per text character.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [to_codes(pattern) for pattern in patterns]
+        self.lengths = array("i", [len(pattern) for pattern in self.patterns])
+
+        alphabet = sorted({code for pattern in self.patterns for code in pattern})
+        # Column of every character code in the edge tables, -1 for other codes
+        self.columns = array("i", [-1]) * (max(alphabet, default=-1) + 1)
+        for column, code in enumerate(alphabet):
+            self.columns[code] = column
+        self.width = len(alphabet)
+
+        self.goto = array("i", [-1]) * self.width
+        self.parent = array("i", [-1])
+        self.character = array("i", [-1])
+        self.depth = array("i", [0])
+        # First pattern ending at each state, and the next one ending at the same
+        # state for every pattern, for patterns that are equal
+        self.terminal = array("i", [-1])
+        self.next_terminal = array("i", [-1]) * len(self.patterns)
+        for index, pattern in enumerate(self.patterns):
+            self.insert(index, pattern)
+
+        self.build_links()
+
+    @property
+    def state_count(self):
+        return len(self.parent)
+
+    def column(self, code):
+        return self.columns[code] if code < len(self.columns) else -1
+
+    def state_of(self, codes):
+        """
+        Returns the trie state spelling a sequence of character codes, or -1 if the
+        codes are not a prefix of any pattern.
+        """
+        state = ROOT
+        for code in codes:
+            column = self.column(code)
+            if column == -1:
+                return -1
+            state = self.goto[state * self.width + column]
+            if state == -1:
+                return -1
+        return state
+
+    def insert(self, index, pattern):
+        """
+        Adds the states spelling a pattern to the trie, marking where it ends.
+        """
+        state = ROOT
+        for code in pattern:
+            slot = state * self.width + self.columns[code]
+            if self.goto[slot] == -1:
+                self.goto[slot] = self.state_count
+                self.parent.append(state)
+                self.character.append(code)
+                self.depth.append(self.depth[state] + 1)
+                self.terminal.append(-1)
+                self.goto.extend(array("i", [-1]) * self.width)
+            state = self.goto[slot]
+
+        if self.terminal[state] == -1:
+            self.terminal[state] = index
+            return
+        last = self.terminal[state]
+        while self.next_terminal[last] != -1:
+            last = self.next_terminal[last]
+        self.next_terminal[last] = index
+
+    def build_links(self):
+        """
+        Computes the failure, output and complete transition tables, visiting the
+        states in breadth-first order so that shallower states are done first.
+        """
+        width = self.width
+        self.fail = array("i", [ROOT]) * self.state_count
+        # Nearest state along the failure links at which a pattern ends
+        self.output_link = array("i", [-1]) * self.state_count
+        self.transitions = array("i", self.goto)
+        self.breadth_first = array("i", [ROOT])
+        for column in range(width):
+            if self.transitions[column] == -1:
+                self.transitions[column] = ROOT
+
+        visited = 0
+        while visited < len(self.breadth_first):
+            state = self.breadth_first[visited]
+            visited += 1
+            for column in range(width):
+                child = self.goto[state * width + column]
+                if child == -1:
+                    if state != ROOT:
+                        self.transitions[state * width + column] = self.transitions[
+                            self.fail[state] * width + column
+                        ]
+                    continue
+                self.breadth_first.append(child)
+                if state != ROOT:
+                    # The walk along the failure links of KMP, resolved in one
+                    # lookup since the failure state's transitions are complete
+                    self.fail[child] = self.transitions[
+                        self.fail[state] * width + column
+                    ]
+                fail = self.fail[child]
+                self.output_link[child] = (
+                    fail if self.terminal[fail] != -1 else self.output_link[fail]
+                )
+
+    def outputs(self, state):
+        """
+        Yields the index of every pattern ending at a state, longest first, being
+        the patterns of the state itself and of the states its output links reach.
+        """
+        if self.terminal[state] == -1:
+            state = self.output_link[state]
+        while state != -1:
+            index = self.terminal[state]
+            while index != -1:
+                yield index
+                index = self.next_terminal[index]
+            state = self.output_link[state]
+
+    def scan(self, chunks):
+        """
+        Yields (start, pattern index) for every occurrence in the text made of the
+        chunks, in order of their end.
+
+        The state of the automaton is carried from one chunk to the next, so a file
+        can be searched as it is read, in one pass and without holding it whole.
+        """
+        columns, width = self.columns, self.width
+        transitions, terminal, output_link = (
+            self.transitions,
+            self.terminal,
+            self.output_link,
+        )
+        table_size = len(columns)
+        state = ROOT
+        # Empty patterns also occur before the first character
+        for index in self.outputs(ROOT):
+            yield 0, index
+        offset = 0
+        for chunk in chunks:
+            codes = to_codes(chunk)
+            for end, code in enumerate(codes, offset + 1):
+                column = columns[code] if code < table_size else -1
+                state = transitions[state * width + column] if column >= 0 else ROOT
+                if terminal[state] != -1 or output_link[state] != -1:
+                    for index in self.outputs(state):
+                        yield end - self.lengths[index], index
+            offset += len(codes)
+
+    def find_all(self, text):
+        """
+        Yields (start, pattern index) for every occurrence in the text, a str or
+        any bytes-like object, in order of their end.
+        """
+        return self.scan([text])
+
+
+def aho_corasick_find_all(text, patterns):
+    """
+    Yields (start, pattern index) for every (possibly overlapping) occurrence of
+    any of the patterns, in order of their end.
+    """
+    return AhoCorasickAutomaton(patterns).find_all(text)
+
+
+def aho_corasick_build_trace(automaton):
+    """
+    Replays the construction of an automaton, yielding an event for every step.
+
+    TrieNode events come in the order the patterns created the states. The
+    failure link of every state is then found in breadth-first order by walking
+    the failure links from its parent, like the LPS table is built: Compare(state,
+    candidate) checks whether the candidate has an edge for the state's character,
+    Backtrack moves to the candidate's own failure link, and TableWrite(state,
+    target) sets the link.
+    """
+    for state in range(1, automaton.state_count):
+        yield TrieNode(state, automaton.parent[state], automaton.character[state])
+
+    width = automaton.width
+    for state in automaton.breadth_first[1:]:
+        parent = automaton.parent[state]
+        column = automaton.columns[automaton.character[state]]
+        if parent == ROOT:
+            # The longest proper suffix of a single character is empty
+            yield TableWrite(state, ROOT)
+            continue
+        candidate = automaton.fail[parent]
+        while True:
+            yield Compare(state, candidate)
+            target = automaton.goto[candidate * width + column]
+            if target != -1:
+                yield Match(state, target)
+                break
+            if candidate == ROOT:
+                target = ROOT
+                break
+            yield Backtrack(state, candidate, automaton.fail[candidate])
+            candidate = automaton.fail[candidate]
+        yield TableWrite(state, target)
+
+
+def aho_corasick_search_trace(text, automaton, find_all=True):
+    """
+    Runs the Aho-Corasick search, yielding an event for every step of the algorithm.
+
+    The search follows the trie edges and, where a state has no edge for the next
+    character, its failure links, rather than the complete transitions, so every
+    link followed is shown. Found events carry the index of the pattern. Unlike
+    the single pattern searches it reports every occurrence by default.
+
+    The text can be a TextSource, which is only read as far as the search gets.
+    """
+    width = automaton.width
+    state = ROOT
+    i = 0
+    while has_index(text, i):
+        column = automaton.column(code_at(text, i))
+        while True:
+            target = automaton.goto[state * width + column] if column >= 0 else -1
+            if target != -1 or state == ROOT:
+                break
+            yield Backtrack(i, state, automaton.fail[state])
+            state = automaton.fail[state]
+        target = max(target, ROOT)
+        yield Transition(i, state, target)
+        state = target
+
+        for index in automaton.outputs(state):
+            yield Found(i + 1 - automaton.lengths[index], index)
+            if not find_all:
+                return
+        i += 1
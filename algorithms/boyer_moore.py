@@ -0,0 +1,113 @@
+from algorithms.core import (
+    bad_character_table,
+    good_suffix_table,
+    last_occurrence,
+    to_codes,
+)
+from algorithms.text_source import TextSource, has_index
+from algorithms.trace import Compare, Found, GalilSkip, Match, Mismatch, Shift
+
+# "boyer_moore" shifts by the larger of the bad character and good suffix rules,
+# "horspool" by the bad character rule applied to the text character aligned with
+# the end of the pattern, and "sunday" to the text character just after it
+SHIFT_RULES = ("boyer_moore", "horspool", "sunday")
+
+
+def boyer_moore_search_trace(
+    text,
+    pattern,
+    bad_char_shift=None,
+    good_suffix_shift=None,
+    rule="boyer_moore",
+    galil=False,
+    find_all=False,
+):
+    """
+    Runs the Boyer-Moore search, yielding an event for every step of the algorithm.
+
+    The rule is one of SHIFT_RULES. Horspool looks up the bad character table of
+    pattern[:-1], so that is the table to pass for it. With galil, the characters
+    known to match after a good suffix shift are skipped instead of compared again,
+    which keeps the search linear when it finds all occurrences of a periodic
+    pattern. Stops at the first occurrence unless find_all is set.
+
+    The text can be a TextSource, which is only read as far as the search gets.
+    """
+    if rule not in SHIFT_RULES:
+        raise ValueError(f"unknown shift rule {rule!r}, expected one of {SHIFT_RULES}")
+    if isinstance(text, TextSource):
+        # Sources hold bytes, so compare them with the pattern's character codes
+        pattern = to_codes(pattern)
+    if bad_char_shift is None:
+        bad_char_shift = bad_character_table(
+            pattern[:-1] if rule == "horspool" else pattern
+        )
+    if good_suffix_shift is None and rule == "boyer_moore":
+        good_suffix_shift = good_suffix_table(pattern)
+
+    pattern_len = len(pattern)
+    # Pattern indices known_start up to known_end are known to match (Galil rule)
+    known_start = known_end = 0
+    i = 0
+    while has_index(text, i + pattern_len - 1):
+        j = pattern_len - 1  # Start matching pattern from the end
+        while j >= 0:
+            if j == known_end - 1:
+                yield GalilSkip(i + known_start, known_start, known_end - known_start)
+                j = known_start - 1
+                continue
+            yield Compare(i + j, j)
+            if pattern[j] != text[i + j]:
+                break
+            yield Match(i + j, j)
+            j -= 1
+        known_start = known_end = 0
+
+        if j < 0:  # Fully matched
+            yield Found(i)
+            if not find_all:
+                return
+        else:
+            yield Mismatch(i + j, j)
+
+        if rule == "sunday":
+            # The character just after the window is in the next one whatever the shift
+            if not has_index(text, i + pattern_len):
+                return
+            code = text[i + pattern_len]
+        elif rule == "horspool" or j < 0:
+            code = text[i + pattern_len - 1]
+        else:
+            code = text[i + j]
+        if isinstance(code, str):
+            code = ord(code)
+
+        if rule == "horspool":
+            bad_char_shift_value = (
+                pattern_len - 1 - last_occurrence(bad_char_shift, code)
+            )
+            shift_value = bad_char_shift_value
+            good_suffix_shift_value = None
+        elif rule == "sunday":
+            bad_char_shift_value = pattern_len - last_occurrence(bad_char_shift, code)
+            shift_value = bad_char_shift_value
+            good_suffix_shift_value = None
+        elif j < 0:
+            # Shift by the period of the pattern, there is no bad character
+            bad_char_shift_value = None
+            good_suffix_shift_value = shift_value = good_suffix_shift[0]
+        else:
+            bad_char_shift_value = j - last_occurrence(bad_char_shift, code)
+            good_suffix_shift_value = good_suffix_shift[j + 1]
+            shift_value = max(1, max(bad_char_shift_value, good_suffix_shift_value))
+
+        if galil and shift_value == good_suffix_shift_value:
+            # The text matched so far lies under a part of the shifted pattern that
+            # the good suffix rule aligned with an equal part
+            known_start = max(0, j + 1 - shift_value)
+            known_end = pattern_len - shift_value
+            if known_start >= known_end:
+                known_start = known_end = 0
+
+        i += shift_value
+        yield Shift(i, shift_value, bad_char_shift_value, good_suffix_shift_value)
@@ -0,0 +1,314 @@
+"""
+Headless, high-throughput implementations of the visualized search algorithms.
+
+Texts and patterns can be str or any bytes-like object (bytes, bytearray,
+memoryview, mmap). They are searched as sequences of character codes, and the
+precomputed tables are flat integer arrays rather than dictionaries.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy comes with manim, the pure Python path works without it
+    np = None
+
+# Size of the bad character table for byte and latin-1 inputs
+ALPHABET_SIZE = 256
+
+
+def to_codes(data):
+    """
+    Returns a str or bytes-like object as an indexable sequence of character codes.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    if isinstance(data, str):
+        try:
+            return data.encode("latin-1")
+        except UnicodeEncodeError:
+            return memoryview(data.encode("utf-32-le")).cast("I")
+    view = memoryview(data)
+    # Code sequences returned by an earlier call are passed through unchanged
+    return view if view.format in ("B", "I") else view.cast("B")
+
+
+def lps_table(pattern):
+    """
+    Creates the LPS (Longest Prefix Suffix) table of the pattern.
+    """
+    pattern = to_codes(pattern)
+    lps = array("i", [0]) * len(pattern)
+    j = 0
+    for i in range(1, len(pattern)):
+        while j and pattern[i] != pattern[j]:
+            j = lps[j - 1]
+        if pattern[i] == pattern[j]:
+            j += 1
+        lps[i] = j
+    return lps
+
+
+def bad_character_table(pattern, size=None):
+    """
+    Creates a bad character table holding the rightmost index of every character
+    code in the pattern, or -1 for codes that do not occur in it.
+    """
+    pattern = to_codes(pattern)
+    if size is None:
+        size = max(ALPHABET_SIZE, max(pattern, default=-1) + 1)
+    table = array("i", [-1]) * size
+    for index, code in enumerate(pattern):
+        table[code] = index
+    return table
+
+
+def bad_character_tables(patterns):
+    """
+    Creates the bad character tables of many patterns at once, one row per pattern.
+
+    Uses a single vectorized NumPy pass when NumPy is available.
+    """
+    codes = [to_codes(pattern) for pattern in patterns]
+    size = max([ALPHABET_SIZE] + [max(c) + 1 for c in codes if len(c)])
+    if np is None:
+        return [bad_character_table(c, size) for c in codes]
+
+    tables = np.full((len(codes), size), -1, dtype=np.int32)
+    if not any(len(c) for c in codes):
+        return tables
+    rows = np.repeat(np.arange(len(codes)), [len(c) for c in codes])
+    columns = np.concatenate(
+        [np.frombuffer(c, dtype=f"u{memoryview(c).itemsize}") for c in codes]
+    )
+    positions = np.concatenate([np.arange(len(c)) for c in codes])
+    # Keep the rightmost occurrence when a character repeats within a pattern
+    np.maximum.at(tables, (rows, columns), positions)
+    return tables
+
+
+def last_occurrence(bad_char_table, code):
+    """
+    Returns the rightmost index of a character code in the pattern, or -1.
+    """
+    return bad_char_table[code] if code < len(bad_char_table) else -1
+
+
+def good_suffix_table(pattern):
+    """
+    Creates the good suffix shift table.
+    """
+    pattern = to_codes(pattern)
+    m = len(pattern)
+    good_suffix_shift = array("i", [0]) * (m + 1)
+    border_pos = array("i", [0]) * (m + 1)
+    i = m
+    j = m + 1
+    border_pos[i] = j
+
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if good_suffix_shift[j] == 0:
+                good_suffix_shift[j] = j - i
+            j = border_pos[j]
+        i = i - 1
+        j = j - 1
+        border_pos[i] = j
+
+    for k in range(m + 1):
+        if good_suffix_shift[k] == 0:
+            good_suffix_shift[k] = j
+        if k == j:
+            j = border_pos[j]
+
+    return good_suffix_shift
+
+
+def naive_find_all(text, pattern):
+    """
+    Yields the start of every (possibly overlapping) occurrence of the pattern.
+    """
+    text, pattern = to_codes(text), to_codes(pattern)
+    m = len(pattern)
+    for i in range(len(text) - m + 1):
+        j = 0
+        while j < m and text[i + j] == pattern[j]:
+            j += 1
+        if j == m:
+            yield i
+
+
+def kmp_find_all(text, pattern, lps=None):
+    """
+    Yields the start of every (possibly overlapping) occurrence of the pattern.
+    """
+    text, pattern = to_codes(text), to_codes(pattern)
+    m = len(pattern)
+    if m == 0:
+        yield from range(len(text) + 1)
+        return
+    if lps is None:
+        lps = lps_table(pattern)
+
+    j = 0
+    for i, code in enumerate(text):
+        while j and code != pattern[j]:
+            j = lps[j - 1]
+        if code == pattern[j]:
+            j += 1
+            if j == m:
+                yield i - m + 1
+                # Continue from the longest border of the match
+                j = lps[j - 1]
+
+
+def boyer_moore_find_all(text, pattern, bad_char_table=None, good_suffix_shift=None):
+    """
+    Yields the start of every (possibly overlapping) occurrence of the pattern.
+    """
+    text, pattern = to_codes(text), to_codes(pattern)
+    n, m = len(text), len(pattern)
+    if m == 0:
+        yield from range(n + 1)
+        return
+    if bad_char_table is None:
+        bad_char_table = bad_character_table(pattern)
+    if good_suffix_shift is None:
+        good_suffix_shift = good_suffix_table(pattern)
+
+    table_size = len(bad_char_table)
+    i = 0
+    while i <= n - m:
+        j = m - 1
+        while j >= 0 and pattern[j] == text[i + j]:
+            j -= 1
+        if j < 0:
+            yield i
+            i += good_suffix_shift[0]
+        else:
+            code = text[i + j]
+            bad_char_shift = j - (bad_char_table[code] if code < table_size else -1)
+            i += max(1, bad_char_shift, good_suffix_shift[j + 1])
+
+
+def find(text, pattern, find_all=boyer_moore_find_all):
+    """
+    Returns the start of the first occurrence of the pattern, or -1 like str.find.
+    """
+    return next(find_all(text, pattern), -1)
+
+
+# Rabin-Karp rolling hash. The modulus is a prime below 2**31, so the product of
+# two values reduced by it always fits in an int64.
+HASH_BASE = 256
+HASH_MODULUS = 2**31 - 1
+
+
+def polynomial_hash(codes, base=HASH_BASE, modulus=HASH_MODULUS):
+    """
+    Returns the hash of a sequence of character codes, the value of the codes as
+    the digits of a number in the given base, modulo modulus.
+    """
+    value = 0
+    for code in codes:
+        value = (value * base + code) % modulus
+    return value
+
+
+def roll_hash(value, removed, added, high_power, base=HASH_BASE, modulus=HASH_MODULUS):
+    """
+    Moves the hash of a window one character forward, removing the code of its
+    first character and adding the code of the next one.
+
+    high_power is base ** (window length - 1) % modulus, the weight of the first
+    character.
+    """
+    return ((value - removed * high_power) * base + added) % modulus
+
+
+def modular_powers(base, count, modulus):
+    """
+    Returns base ** k % modulus for k in range(count) as an int64 NumPy array,
+    doubling the computed powers with every vectorized step.
+    """
+    powers = np.ones(count, dtype=np.int64)
+    factor = base % modulus
+    step = 1
+    while step < count:
+        powers[step : 2 * step] = powers[: min(step, count - step)] * factor % modulus
+        factor = factor * factor % modulus
+        step *= 2
+    return powers
+
+
+def window_hashes(text, length, base=HASH_BASE, modulus=HASH_MODULUS):
+    """
+    Returns the polynomial_hash of every window of length characters of the text,
+    indexed by the start of the window.
+
+    With NumPy the hashes are computed in one vectorized pass over prefix sums of
+    the weighted character codes, which takes a few int64 arrays the size of the
+    text. Without it they are rolled in a loop into an array("q").
+    """
+    text = to_codes(text)
+    n = len(text)
+    count = max(n - length + 1, 0)
+    if np is None:
+        hashes = array("q", [0]) * count
+        if count and length:
+            high_power = pow(base, length - 1, modulus)
+            value = hashes[0] = polynomial_hash(text[:length], base, modulus)
+            for i in range(1, count):
+                value = roll_hash(
+                    value, text[i - 1], text[i + length - 1], high_power, base, modulus
+                )
+                hashes[i] = value
+        return hashes
+
+    if not count or not length:
+        return np.zeros(count, dtype=np.int64)
+    codes = np.frombuffer(text, dtype=f"u{memoryview(text).itemsize}")
+    # Character k weighs base ** (n - 1 - k), so the difference of two prefix sums
+    # is the hash of a window scaled by base ** (characters after the window)
+    weighted = codes.astype(np.int64) % modulus * modular_powers(base, n, modulus)[::-1]
+    prefix = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(weighted % modulus, out=prefix[1:])
+    del weighted
+    windows = (prefix[length:] - prefix[:count]) % modulus
+    del prefix
+    # Undo the scaling with the powers of the inverse of the base
+    inverse_powers = modular_powers(pow(base, -1, modulus), count, modulus)[::-1]
+    return windows * inverse_powers % modulus
+
+
+def rabin_karp_find_all(text, patterns, base=HASH_BASE, modulus=HASH_MODULUS):
+    """
+    Yields (start, pattern index) for every occurrence of any of the patterns, which
+    must all have the same length, in order of their start.
+
+    The hashes of all windows are compared with the hashes of all patterns at once,
+    and only the windows with a matching hash are compared character by character,
+    which rules out the spurious hits of colliding hashes.
+    """
+    patterns = [to_codes(pattern) for pattern in patterns]
+    if not patterns:
+        return
+    length = len(patterns[0])
+    if any(len(pattern) != length for pattern in patterns):
+        raise ValueError("Rabin-Karp patterns must all have the same length")
+    # Patterns with equal hashes are verified against the same windows
+    by_hash = {}
+    for index, pattern in enumerate(patterns):
+        by_hash.setdefault(polynomial_hash(pattern, base, modulus), []).append(index)
+
+    text = to_codes(text)
+    hashes = window_hashes(text, length, base, modulus)
+    if np is None:
+        candidates = [i for i, value in enumerate(hashes) if value in by_hash]
+    else:
+        candidates = np.flatnonzero(np.isin(hashes, list(by_hash))).tolist()
+    for start in candidates:
+        window = text[start : start + length]
+        for index in by_hash[int(hashes[start])]:
+            if window == patterns[index]:
+                yield start, index
@@ -0,0 +1,184 @@
+"""
+Operation counts of the headless search algorithms, computed from their traces.
+
+The counts are what the complexity of the algorithms is usually stated in, so
+runs on the same input can be compared without rendering anything.
+"""
+
+import csv
+from collections import namedtuple
+from functools import partial
+
+from algorithms.boyer_moore import boyer_moore_search_trace
+from algorithms.core import to_codes
+from algorithms.kmp import kmp_search_trace
+from algorithms.naive import naive_search_trace
+from algorithms.rabin_karp import rabin_karp_search_trace
+from algorithms.text_source import TextSource
+from algorithms.trace import Backtrack, Compare, Found, Shift, WindowHash
+
+# Searches whose operations can be counted, keyed by the name used in exports
+SEARCH_TRACES = {
+    "naive": naive_search_trace,
+    "kmp": kmp_search_trace,
+    "boyer_moore": boyer_moore_search_trace,
+    "boyer_moore_galil": partial(boyer_moore_search_trace, galil=True),
+    "horspool": partial(boyer_moore_search_trace, rule="horspool"),
+    "sunday": partial(boyer_moore_search_trace, rule="sunday"),
+    "rabin_karp": rabin_karp_search_trace,
+}
+
+# comparisons: characters of the text compared with the pattern
+# shifts: moves of the pattern along the text, including KMP backtracks
+# skipped: characters before the end of the search that were never read, by a
+#   comparison or by rolling a hash over them
+# table_lookups: reads of a precomputed shift table (LPS, bad character, good suffix)
+# hash_updates: Rabin-Karp window hashes computed or rolled
+# matches: occurrences found
+# position: where the pattern was first found, None if it was not
+OperationCounts = namedtuple(
+    "OperationCounts",
+    [
+        "comparisons",
+        "shifts",
+        "skipped",
+        "table_lookups",
+        "hash_updates",
+        "matches",
+        "position",
+    ],
+)
+
+
+class OperationCounter:
+    """
+    Counts the operations of a search as the events of its trace are fed to it.
+
+    Unless find_all is set, counting stops at the first Found event, where the
+    scenes stop as well, so the naive search is not charged for the occurrences
+    after it.
+    """
+
+    def __init__(self, pattern_length, find_all=False):
+        self.pattern_length = pattern_length
+        self.find_all = find_all
+        self.comparisons = 0
+        self.shifts = 0
+        self.table_lookups = 0
+        self.hash_updates = 0
+        self.matches = 0
+        self.position = None
+        # Text index just past the last occurrence found
+        self.match_end = 0
+        # Searches only move their window forward, so a character more than a
+        # pattern length before the furthest one read is never read again. The
+        # distinct characters read are tracked individually only past that point.
+        self.read_before = 0
+        self.recent_reads = set()
+        self.read_end = 0
+
+    @property
+    def finished(self):
+        return self.position is not None and not self.find_all
+
+    def update(self, event):
+        """
+        Counts a trace event, returning False once the search has finished.
+        """
+        if self.finished:
+            return False
+        if isinstance(event, Compare):
+            self.comparisons += 1
+            self.mark_read(event.text_index, event.text_index + 1)
+        elif isinstance(event, WindowHash):
+            self.hash_updates += 1
+            # The first hash reads the whole window, rolling reads the character
+            # entering it
+            end = event.position + self.pattern_length
+            self.mark_read(0 if event.position == 0 else end - 1, end)
+        elif isinstance(event, Shift):
+            self.shifts += 1
+            # Boyer-Moore reads both of its tables to pick the shift
+            self.table_lookups += (event.bad_character is not None) + (
+                event.good_suffix is not None
+            )
+        elif isinstance(event, Backtrack):
+            self.shifts += 1
+            self.table_lookups += 1
+        elif isinstance(event, Found):
+            self.matches += 1
+            if self.position is None:
+                self.position = event.position
+            self.match_end = event.position + self.pattern_length
+        return not self.finished
+
+    def mark_read(self, start, end):
+        self.recent_reads.update(range(start, end))
+        self.read_end = max(self.read_end, end)
+        if len(self.recent_reads) > 2 * self.pattern_length:
+            # Amortized, as at most a pattern length of reads is kept
+            window_start = self.read_end - self.pattern_length
+            settled = {index for index in self.recent_reads if index < window_start}
+            self.read_before += len(settled)
+            self.recent_reads -= settled
+
+    def counts(self, text_length):
+        """
+        Returns the counts so far, the search having covered the text up to its
+        end or up to the end of the match.
+        """
+        end = text_length
+        if self.finished:
+            end = self.match_end
+        # Characters read before the window never lie past the match end
+        read = self.read_before + sum(index < end for index in self.recent_reads)
+        return OperationCounts(
+            self.comparisons,
+            self.shifts,
+            end - read,
+            self.table_lookups,
+            self.hash_updates,
+            self.matches,
+            self.position,
+        )
+
+
+def count_operations(algorithm, text, pattern, find_all=False):
+    """
+    Runs a search from SEARCH_TRACES and returns its OperationCounts, counting up
+    to the first occurrence or, with find_all, through the whole text.
+
+    The text can be a str or a bytes-like object such as an mmap, and for KMP,
+    Boyer-Moore and Rabin-Karp also a TextSource.
+    """
+    if not isinstance(text, str):
+        # Bytes index as integers, so compare them with the pattern's codes
+        pattern = to_codes(pattern)
+    counter = OperationCounter(len(pattern), find_all)
+    for event in SEARCH_TRACES[algorithm](text, pattern, find_all=find_all):
+        if not counter.update(event):
+            break
+    # Unless the search stopped at a match, a source has been read to its end
+    text_length = text.end if isinstance(text, TextSource) else len(text)
+    return counter.counts(text_length)
+
+
+def write_counts_csv(rows, file):
+    """
+    Writes (algorithm, text length, pattern, OperationCounts) rows as CSV.
+    """
+    writer = csv.writer(file)
+    writer.writerow(
+        [
+            "algorithm",
+            "text_length",
+            "pattern",
+            "pattern_length",
+            *OperationCounts._fields,
+        ]
+    )
+    for algorithm, text_length, pattern, counts in rows:
+        position = "" if counts.position is None else counts.position
+        writer.writerow(
+            [algorithm, text_length, pattern, len(pattern), *counts[:-1], position]
+        )
@@ -0,0 +1,79 @@
+from algorithms.core import lps_table, to_codes
+from algorithms.text_source import TextSource, has_index
+from algorithms.trace import (
+    Backtrack,
+    Compare,
+    Found,
+    Match,
+    Mismatch,
+    Shift,
+    TableWrite,
+)
+
+
+def lps_table_trace(pattern):
+    """
+    Builds the LPS (Longest Prefix Suffix) table, yielding an event for every step.
+
+    Comparisons are made within the pattern itself, so text_index is the position
+    whose LPS value is being computed and pattern_index is the prefix position.
+    """
+    lps = [0] * len(pattern)
+    i, j = 1, 0
+    while i < len(pattern):
+        yield Compare(i, j)
+        if pattern[i] == pattern[j]:
+            yield Match(i, j)
+            j += 1
+            lps[i] = j
+            yield TableWrite(i, j)
+            i += 1
+        else:
+            yield Mismatch(i, j)
+            if j != 0:
+                yield Backtrack(i, j, lps[j - 1])
+                j = lps[j - 1]
+            else:
+                yield TableWrite(i, 0)
+                i += 1
+
+
+def kmp_search_trace(text, pattern, lps=None, find_all=False):
+    """
+    Runs the KMP search, yielding an event for every step of the algorithm.
+
+    Stops at the first occurrence unless find_all is set, in which case the search
+    continues from the longest border of each match.
+
+    The text can be a TextSource, which is only read as far as the search gets.
+    """
+    if not pattern:
+        return
+    if isinstance(text, TextSource):
+        # Sources hold bytes, so compare them with the pattern's character codes
+        pattern = to_codes(pattern)
+    if lps is None:
+        lps = lps_table(pattern)
+
+    i, j = 0, 0
+    while has_index(text, i):
+        yield Compare(i, j)
+        if text[i] == pattern[j]:
+            yield Match(i, j)
+            i += 1
+            j += 1
+            if j == len(pattern):
+                yield Found(i - j)
+                if not find_all:
+                    return
+                yield Backtrack(i, j, lps[j - 1])
+                j = lps[j - 1]
+        else:
+            yield Mismatch(i, j)
+            if j != 0:
+                yield Backtrack(i, j, lps[j - 1])
+                j = lps[j - 1]
+            else:
+                # No more backtracking can be made, start from next character in text
+                i += 1
+                yield Shift(i, 1)
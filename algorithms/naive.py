@@ -0,0 +1,28 @@
+from algorithms.trace import Compare, Found, Match, Mismatch, Shift
+
+
+def naive_search_trace(text, pattern, find_all=True):
+    """
+    Runs the naive search, yielding an event for every step of the algorithm.
+
+    Unlike the other searches it reports every occurrence by default, which is
+    what the naive scene shows.
+    """
+    pattern_len = len(pattern)
+    for i in range(len(text) - pattern_len + 1):
+        if i > 0:
+            yield Shift(i, 1)
+
+        matched = True
+        for j in range(pattern_len):
+            yield Compare(i + j, j)
+            if text[i + j] != pattern[j]:
+                yield Mismatch(i + j, j)
+                matched = False
+                break
+            yield Match(i + j, j)
+
+        if matched:
+            yield Found(i)
+            if not find_all:
+                return
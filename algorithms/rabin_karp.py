@@ -0,0 +1,63 @@
+from algorithms.core import (
+    HASH_BASE,
+    HASH_MODULUS,
+    polynomial_hash,
+    roll_hash,
+    to_codes,
+)
+from algorithms.text_source import code_at, has_index
+from algorithms.trace import Compare, Found, Match, Mismatch, Shift, WindowHash
+
+
+def rabin_karp_search_trace(
+    text, pattern, base=HASH_BASE, modulus=HASH_MODULUS, find_all=False
+):
+    """
+    Runs the Rabin-Karp search, yielding an event for every step of the algorithm.
+
+    Only windows whose hash equals the hash of the pattern are compared character
+    by character, so a Mismatch after such a WindowHash is a spurious hit. Stops at
+    the first occurrence unless find_all is set.
+
+    The text can be a TextSource, which is only read as far as the search gets.
+    """
+    if not pattern:
+        return
+    pattern = to_codes(pattern)
+    pattern_len = len(pattern)
+    if not has_index(text, pattern_len - 1):
+        return
+    pattern_hash = polynomial_hash(pattern, base, modulus)
+    high_power = pow(base, pattern_len - 1, modulus)
+
+    value = polynomial_hash(
+        (code_at(text, k) for k in range(pattern_len)), base, modulus
+    )
+    i = 0
+    while True:
+        yield WindowHash(i, value)
+        if value == pattern_hash:
+            # Equal hashes can still come from different windows, verify it
+            for j in range(pattern_len):
+                yield Compare(i + j, j)
+                if code_at(text, i + j) != pattern[j]:
+                    yield Mismatch(i + j, j)
+                    break
+                yield Match(i + j, j)
+            else:
+                yield Found(i)
+                if not find_all:
+                    return
+
+        if not has_index(text, i + pattern_len):
+            return
+        value = roll_hash(
+            value,
+            code_at(text, i),
+            code_at(text, i + pattern_len),
+            high_power,
+            base,
+            modulus,
+        )
+        i += 1
+        yield Shift(i, 1)
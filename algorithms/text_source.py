@@ -0,0 +1,109 @@
+"""
+Incremental access to texts too large to hold in memory.
+
+The search traces only move forward through the text, Boyer-Moore looking back at
+most a pattern length, so a TextSource keeps a sliding buffer of a file instead
+of reading it whole. Memory-mapped files (mmap) can be searched directly as well,
+since they are indexable sequences of byte values with a length.
+"""
+
+# Bytes read from the file at a time
+CHUNK_SIZE = 64 * 1024
+# Bytes kept before the furthest index read, enough for the pattern and display
+LOOKBEHIND = 64 * 1024
+
+
+class TextSource:
+    """
+    A text read incrementally from a binary file.
+
+    Indexing returns byte values, like bytes does. Only indices up to lookbehind
+    bytes before the furthest index read so far can be accessed, and the length is
+    only known once the end of the file has been read.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE, lookbehind=LOOKBEHIND):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.lookbehind = lookbehind
+        self.buffer = bytearray()
+        # Text index of the first byte in the buffer
+        self.start = 0
+        self.length = None
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        return cls(open(path, "rb"), **kwargs)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def end(self):
+        """
+        Text index just after the last byte read so far.
+        """
+        return self.start + len(self.buffer)
+
+    def fill(self, end):
+        """
+        Reads from the file until the buffer reaches end or the end of the file.
+        """
+        while self.end < end and self.length is None:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                self.length = self.end
+                break
+            # Drop what is out of reach, but only a chunk at a time, and only what
+            # was read so far when jumping further ahead than the lookbehind
+            discard = min(end - self.lookbehind, self.end) - self.start
+            if discard >= self.chunk_size:
+                del self.buffer[:discard]
+                self.start += discard
+            self.buffer += chunk
+
+    def available(self, index):
+        """
+        Checks whether the text extends to index, reading ahead if needed.
+        """
+        self.fill(index + 1)
+        return index < self.end
+
+    def __getitem__(self, index):
+        if index < self.start:
+            raise IndexError(f"text index {index} was discarded from the buffer")
+        if not self.available(index):
+            raise IndexError(f"text index {index} is past the end of the text")
+        return self.buffer[index - self.start]
+
+    def chars(self, start, end):
+        """
+        Returns the bytes from start up to end as characters, one per byte.
+        """
+        self.fill(end)
+        if start < self.start:
+            raise IndexError(f"text index {start} was discarded from the buffer")
+        return self.buffer[start - self.start : end - self.start].decode("latin-1")
+
+
+def has_index(text, index):
+    """
+    Checks whether a text, sequence or TextSource, extends to index.
+    """
+    if isinstance(text, TextSource):
+        return text.available(index)
+    return index < len(text)
+
+
+def code_at(text, index):
+    """
+    Returns the character code at index of a str, bytes-like text or TextSource.
+    """
+    code = text[index]
+    return ord(code) if isinstance(code, str) else code
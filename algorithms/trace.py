@@ -0,0 +1,54 @@
+"""
+Typed events emitted by the headless search algorithms.
+
+The scenes replay these traces instead of running the algorithms themselves,
+so a run can be inspected and sized without importing manim.
+"""
+
+from collections import Counter, namedtuple
+
+# Characters at text_index and pattern_index are about to be compared
+Compare = namedtuple("Compare", ["text_index", "pattern_index"])
+Match = namedtuple("Match", ["text_index", "pattern_index"])
+Mismatch = namedtuple("Mismatch", ["text_index", "pattern_index"])
+
+# Pattern is moved by value so that it starts at text index position.
+# Boyer-Moore also reports the shifts suggested by each of its rules.
+Shift = namedtuple(
+    "Shift",
+    ["position", "value", "bad_character", "good_suffix"],
+    defaults=[None, None],
+)
+
+# KMP fallback through the LPS table after a mismatch at text_index. Aho-Corasick
+# follows a failure link from state from_index to state to_index the same way.
+Backtrack = namedtuple("Backtrack", ["text_index", "from_index", "to_index"])
+
+# Value written into a precomputed table (e.g. the LPS table)
+TableWrite = namedtuple("TableWrite", ["index", "value"])
+
+# Boyer-Moore Galil rule: length pattern characters from pattern_index are known
+# to match the text from text_index and are skipped instead of compared again
+GalilSkip = namedtuple("GalilSkip", ["text_index", "pattern_index", "length"])
+
+# Rabin-Karp hash of the text window starting at position, rolled from the hash
+# of the previous window
+WindowHash = namedtuple("WindowHash", ["position", "value"])
+
+# Aho-Corasick trie state created below parent for a character code
+TrieNode = namedtuple("TrieNode", ["state", "parent", "character"])
+
+# Aho-Corasick automaton moves from from_state along the trie edge for the
+# character at text_index, or stays at the root when it has no such edge
+Transition = namedtuple("Transition", ["text_index", "from_state", "to_state"])
+
+# Whole pattern matched the text starting at position. Multi-pattern searches
+# also report the index of the pattern.
+Found = namedtuple("Found", ["position", "pattern"], defaults=[None])
+
+
+def count_events(trace):
+    """
+    Counts the events of each type in a trace, keyed by event name.
+    """
+    return Counter(type(event).__name__ for event in trace)
@@ -0,0 +1,121 @@
+"""
+Measures the multi-pattern searches against one single pattern search per pattern.
+
+    python -m benchmarks.multi_pattern --megabytes 1 --pattern-counts 1 16 64
+
+Rabin-Karp hashes every window of the text once and looks all pattern hashes up
+at the same time, and Aho-Corasick reads every character once, while the loops
+of the naive and KMP searches are run again for every pattern. All of them find
+the same occurrences, which is checked for every run.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from algorithms.aho_corasick import aho_corasick_find_all
+from algorithms.core import kmp_find_all, naive_find_all, np, rabin_karp_find_all
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def per_pattern(find_all):
+    """
+    Returns a search for the (start, pattern index) of every occurrence that runs
+    a single pattern search for one pattern after the other.
+    """
+    return lambda text, patterns: sorted(
+        (start, index)
+        for index, pattern in enumerate(patterns)
+        for start in find_all(text, pattern)
+    )
+
+
+def multi_pattern(find_all):
+    """
+    Returns a search for the (start, pattern index) of every occurrence that finds
+    all patterns at once.
+    """
+    return lambda text, patterns: sorted(find_all(text, patterns))
+
+
+ALGORITHMS = {
+    "naive": per_pattern(naive_find_all),
+    "kmp": per_pattern(kmp_find_all),
+    "rabin_karp": multi_pattern(rabin_karp_find_all),
+    "aho_corasick": multi_pattern(aho_corasick_find_all),
+}
+
+
+def run_benchmarks(megabytes, pattern_counts, pattern_length, algorithms, seed=0):
+    """
+    Times every algorithm on every number of patterns, yielding one result per run.
+
+    Half of the patterns are taken from the text, the others are random and
+    mostly do not occur in it.
+    """
+    rng = random.Random(seed)
+    text = "".join(rng.choices(ALPHABET, k=int(megabytes * 1024 * 1024)))
+
+    for pattern_count in pattern_counts:
+        patterns = []
+        for index in range(pattern_count):
+            if index % 2:
+                patterns.append("".join(rng.choices(ALPHABET, k=pattern_length)))
+            else:
+                start = rng.randrange(len(text) - pattern_length)
+                patterns.append(text[start : start + pattern_length])
+
+        expected = None
+        for name in algorithms:
+            begin = time.perf_counter()
+            occurrences = ALGORITHMS[name](text, patterns)
+            duration = time.perf_counter() - begin
+            if expected is None:
+                expected = occurrences
+            elif occurrences != expected:
+                raise AssertionError(f"{name} found different occurrences")
+            yield {
+                "algorithm": name,
+                "numpy": np is not None,
+                "megabytes": megabytes,
+                "pattern_count": pattern_count,
+                "pattern_length": pattern_length,
+                "matches": len(occurrences),
+                "seconds": duration,
+                "megabytes_per_second": megabytes / duration,
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=1)
+    parser.add_argument("--pattern-counts", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--pattern-length", type=int, default=8)
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS)
+    )
+    parser.add_argument("--output", default=None, help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for result in run_benchmarks(
+        args.megabytes, args.pattern_counts, args.pattern_length, args.algorithms
+    ):
+        print(
+            f"{result['algorithm']:<12} patterns={result['pattern_count']:<5}"
+            f" {result['seconds']:8.3f}s"
+            f" {result['megabytes_per_second']:10.2f} MB/s"
+        )
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
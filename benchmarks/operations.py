@@ -0,0 +1,58 @@
+"""
+Counts the operations of the headless searches and writes them as CSV.
+
+    python -m benchmarks.operations --text-file corpus.txt --patterns needle haystack
+
+Every algorithm searches the same text for every pattern, stopping at the first
+occurrence like the scenes do unless --find-all is passed. Files are memory-mapped
+rather than read, so texts far too long to animate can be counted.
+"""
+
+import argparse
+import mmap
+import sys
+from contextlib import ExitStack
+
+from algorithms.counters import SEARCH_TRACES, count_operations, write_counts_csv
+
+
+def count_all(text, patterns, algorithms, find_all=False):
+    """
+    Counts every algorithm on every pattern, yielding one CSV row per run.
+    """
+    for pattern in patterns:
+        for algorithm in algorithms:
+            counts = count_operations(algorithm, text, pattern, find_all)
+            yield algorithm, len(text), pattern, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--text")
+    source.add_argument("--text-file")
+    parser.add_argument("--patterns", nargs="+", required=True)
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=SEARCH_TRACES, default=list(SEARCH_TRACES)
+    )
+    parser.add_argument("--find-all", action="store_true")
+    parser.add_argument("--output", default=None, help="CSV file, stdout by default")
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        text = args.text
+        if args.text_file is not None:
+            file = stack.enter_context(open(args.text_file, "rb"))
+            text = stack.enter_context(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+        output = sys.stdout
+        if args.output:
+            output = stack.enter_context(open(args.output, "w", newline=""))
+        rows = count_all(text, args.patterns, args.algorithms, args.find_all)
+        write_counts_csv(rows, output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
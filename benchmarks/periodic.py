@@ -0,0 +1,71 @@
+"""
+Counts character comparisons of the Boyer-Moore variants on periodic inputs.
+
+    python -m benchmarks.periodic --sizes 1000 10000 --pattern-lengths 8 32
+
+Finding every occurrence of a periodic pattern in a text with the same period
+is the worst case of Boyer-Moore without the Galil rule: each occurrence is
+compared in full again after shifting by the period, so the comparisons grow
+with text length times pattern length.
+"""
+
+import argparse
+import sys
+
+from algorithms.counters import count_operations, write_counts_csv
+
+ALGORITHMS = ["naive", "kmp", "boyer_moore", "boyer_moore_galil", "horspool", "sunday"]
+
+# Repeated to build the text, and the pattern from its start
+PERIODS = ["a", "ab", "aab"]
+
+
+def periodic_case(size, pattern_length, period):
+    """
+    Returns a text and pattern repeating period, every window being a match.
+    """
+    repeats = size // len(period) + 1
+    return (period * repeats)[:size], (period * repeats)[:pattern_length]
+
+
+def run_counts(sizes, pattern_lengths, algorithms):
+    """
+    Counts every algorithm finding all occurrences, yielding one CSV row per run.
+    """
+    for period in PERIODS:
+        for size in sizes:
+            for pattern_length in pattern_lengths:
+                text, pattern = periodic_case(size, pattern_length, period)
+                for algorithm in algorithms:
+                    counts = count_operations(algorithm, text, pattern, find_all=True)
+                    yield algorithm, size, pattern, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--pattern-lengths", type=int, nargs="+", default=[8, 32])
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=ALGORITHMS, default=ALGORITHMS
+    )
+    parser.add_argument("--output", default=None, help="also write the counts as CSV")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for row in run_counts(args.sizes, args.pattern_lengths, args.algorithms):
+        algorithm, size, pattern, counts = row
+        print(
+            f"{algorithm:<18} n={size:<7} pattern={pattern[:12]:<12}"
+            f" m={len(pattern):<4} {counts.comparisons:>10} comparisons"
+            f" {counts.comparisons / size:8.2f} per character"
+        )
+        rows.append(row)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_counts_csv(rows, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Measures how the scenes scale with the size of their input.
+
+    python -m benchmarks.scenes --sizes 8 16 32 --output scene_benchmarks.json
+
+Every scene is run on generated best case, worst case and random inputs. A run
+that draws no frames measures construction time, play calls and mobject count,
+then a low quality render measures frames and render time.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+from manim import config, tempconfig
+
+from boyer_moore import BoyerMooreAlgorithm
+from create_lps_table import CreateLPSTable
+from kmp_text_search import KMPAlgorithm
+from naive_text_search import NaiveSearch
+from utils.base_visualization import SKIP_ALL_PLAYS
+from utils.text_cache import clear_text_cache
+
+SCENES = [NaiveSearch, CreateLPSTable, KMPAlgorithm, BoyerMooreAlgorithm]
+
+PATTERN_LENGTH = 4
+
+
+def best_case(size, pattern_length):
+    """
+    First compared character never matches and does not occur in the pattern.
+    """
+    return "A" * size, "B" * pattern_length
+
+
+def worst_case(size, pattern_length):
+    """
+    Every window matches all but one character, e.g. "AAAA...AB" / "AAAB".
+    """
+    return "A" * (size - 1) + "B", "A" * (pattern_length - 1) + "B"
+
+
+def random_case(size, pattern_length, seed=0):
+    """
+    Random text and pattern over a small alphabet.
+    """
+    rng = random.Random(seed + size)
+    text = "".join(rng.choice("AB") for _ in range(size))
+    pattern = "".join(rng.choice("AB") for _ in range(pattern_length))
+    return text, pattern
+
+
+CASES = {"best": best_case, "worst": worst_case, "random": random_case}
+
+
+def count_mobjects(scene):
+    """
+    Counts every mobject in the scene including all submobjects.
+    """
+    return len({id(m) for mobject in scene.mobjects for m in mobject.get_family()})
+
+
+def measure_construction(scene_class):
+    """
+    Runs the scene without drawing any frames.
+    """
+    clear_text_cache()
+    with tempconfig({"from_animation_number": SKIP_ALL_PLAYS, "write_to_movie": False}):
+        start = time.perf_counter()
+        scene = scene_class()
+        scene.render()
+        duration = time.perf_counter() - start
+    return {
+        "construct_seconds": duration,
+        "plays": scene.renderer.num_plays,
+        "mobjects": count_mobjects(scene),
+    }
+
+
+def measure_render(scene_class, media_dir):
+    """
+    Renders the scene at low quality with caching disabled, counting written frames.
+    """
+    clear_text_cache()
+    with tempconfig(
+        {"media_dir": media_dir, "quality": "low_quality", "disable_caching": True}
+    ):
+        start = time.perf_counter()
+        scene = scene_class()
+        file_writer = scene.renderer.file_writer
+        write_frame = file_writer.write_frame
+        frames = 0
+
+        def counting_write_frame(frame_or_renderer):
+            nonlocal frames
+            frames += 1
+            write_frame(frame_or_renderer)
+
+        file_writer.write_frame = counting_write_frame
+        scene.render()
+        duration = time.perf_counter() - start
+    return {"frames": frames, "render_seconds": duration}
+
+
+def run_benchmarks(
+    sizes, cases=CASES, scenes=SCENES, render=True, compact=False, coalesce=False
+):
+    """
+    Runs every scene on every case and size, yielding one result per run.
+    """
+    with tempfile.TemporaryDirectory() as media_dir:
+        for scene_class in scenes:
+            for case_name, make_case in cases.items():
+                for size in sizes:
+                    pattern_length = min(PATTERN_LENGTH, size)
+                    text, pattern = make_case(size, pattern_length)
+                    if scene_class is CreateLPSTable:
+                        # The LPS table only depends on the pattern
+                        text, pattern = "", text
+                    scene = scene_class.with_inputs(text, pattern)
+                    if compact:
+                        scene = type(scene.__name__, (scene,), {"COMPACT_ARRAYS": True})
+                    if coalesce:
+                        scene = type(
+                            scene.__name__, (scene,), {"COALESCE_ANIMATIONS": True}
+                        )
+
+                    result = {
+                        "scene": scene_class.__name__,
+                        "case": case_name,
+                        "size": size,
+                        "text_length": len(text),
+                        "pattern_length": len(pattern),
+                        "compact": compact,
+                        "coalesce": coalesce,
+                    }
+                    result.update(measure_construction(scene))
+                    if render:
+                        result.update(measure_render(scene, media_dir))
+                    yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument(
+        "--scenes",
+        nargs="+",
+        choices=[scene.__name__ for scene in SCENES],
+        default=[scene.__name__ for scene in SCENES],
+    )
+    parser.add_argument(
+        "--no-render", action="store_true", help="only measure construction"
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="draw arrays in compact mode"
+    )
+    parser.add_argument(
+        "--coalesce", action="store_true", help="coalesce consecutive color changes"
+    )
+    parser.add_argument("--output", default="scene_benchmarks.json")
+    args = parser.parse_args(argv)
+
+    config.verbosity = "WARNING"
+    results = []
+    for result in run_benchmarks(
+        args.sizes,
+        {name: CASES[name] for name in args.cases},
+        [scene for scene in SCENES if scene.__name__ in args.scenes],
+        render=not args.no_render,
+        compact=args.compact,
+        coalesce=args.coalesce,
+    ):
+        print(
+            f"{result['scene']:<20} {result['case']:<7} {result['size']:>5}"
+            f" {result['plays']:>6} plays {result.get('render_seconds', 0):8.2f}s"
+        )
+        results.append(result)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Measures search throughput of the headless algorithms against str.find.
+
+    python -m benchmarks.search --megabytes 4 --pattern-lengths 4 16 64
+
+Every algorithm finds all occurrences of patterns taken from a random text,
+on both the str and the bytes input path.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from algorithms.core import (
+    bad_character_table,
+    boyer_moore_find_all,
+    good_suffix_table,
+    kmp_find_all,
+    lps_table,
+    naive_find_all,
+)
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def builtin_find_all(text, pattern):
+    """
+    Yields every occurrence of the pattern using str.find or bytes.find.
+    """
+    i = text.find(pattern)
+    while i != -1:
+        yield i
+        i = text.find(pattern, i + 1)
+
+
+def boyer_moore_with_tables(pattern):
+    """
+    Returns a find-all function whose tables are built before it is timed.
+    """
+    bad_char = bad_character_table(pattern)
+    good_suffix = good_suffix_table(pattern)
+    return lambda text, p: boyer_moore_find_all(text, p, bad_char, good_suffix)
+
+
+def kmp_with_table(pattern):
+    """
+    Returns a find-all function whose LPS table is built before it is timed.
+    """
+    lps = lps_table(pattern)
+    return lambda text, p: kmp_find_all(text, p, lps)
+
+
+ALGORITHMS = {
+    "builtin": lambda pattern: builtin_find_all,
+    "naive": lambda pattern: naive_find_all,
+    "kmp": kmp_with_table,
+    "boyer_moore": boyer_moore_with_tables,
+}
+
+
+def run_benchmarks(megabytes, pattern_lengths, algorithms, seed=0):
+    """
+    Times every algorithm on every pattern length, yielding one result per run.
+    """
+    rng = random.Random(seed)
+    text = "".join(rng.choices(ALPHABET, k=int(megabytes * 1024 * 1024)))
+    data = text.encode()
+
+    for pattern_length in pattern_lengths:
+        start = rng.randrange(len(text) - pattern_length)
+        pattern = text[start : start + pattern_length]
+        for input_type, haystack, needle in (
+            ("str", text, pattern),
+            ("bytes", data, pattern.encode()),
+        ):
+            for name in algorithms:
+                find_all = ALGORITHMS[name](needle)
+                begin = time.perf_counter()
+                matches = sum(1 for _ in find_all(haystack, needle))
+                duration = time.perf_counter() - begin
+                yield {
+                    "algorithm": name,
+                    "input": input_type,
+                    "megabytes": megabytes,
+                    "pattern_length": pattern_length,
+                    "matches": matches,
+                    "seconds": duration,
+                    "megabytes_per_second": megabytes / duration,
+                }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4)
+    parser.add_argument("--pattern-lengths", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS)
+    )
+    parser.add_argument("--output", default=None, help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for result in run_benchmarks(args.megabytes, args.pattern_lengths, args.algorithms):
+        print(
+            f"{result['algorithm']:<12} {result['input']:<6}"
+            f" m={result['pattern_length']:<4} {result['seconds']:8.3f}s"
+            f" {result['megabytes_per_second']:10.2f} MB/s"
+        )
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Measures cold-start time of fresh processes, averaged over a few runs.
+
+    python -m benchmarks.startup --runs 5
+
+Times importing the algorithm core, listing the scenes, importing a scene module
+and a dry run of `manim -ql boyer_moore.py`, each in a new interpreter.
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import time
+
+from render_all import ROOT_DIR
+
+COMMANDS = {
+    "import algorithms.core": [sys.executable, "-c", "import algorithms.core"],
+    "render_all.py --list": [sys.executable, "render_all.py", "--list"],
+    "import boyer_moore": [sys.executable, "-c", "import boyer_moore"],
+    "manim -ql --dry_run boyer_moore.py": [
+        "manim",
+        "-ql",
+        "--dry_run",
+        "boyer_moore.py",
+        "BoyerMooreAlgorithm",
+    ],
+}
+
+
+def time_command(command, runs):
+    """
+    Returns the mean wall time of running the command in a new process.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT_DIR, check=True, capture_output=True)
+        durations.append(time.perf_counter() - start)
+    return sum(durations) / len(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, command in COMMANDS.items():
+        if shutil.which(command[0]) is None:
+            print(f"{name:<36} skipped, {command[0]} not found")
+            continue
+        try:
+            duration = time_command(command, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<36} failed with exit status {e.returncode}")
+            continue
+        print(f"{name:<36} {duration:8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
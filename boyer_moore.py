@@ -1,6 +1,31 @@
-from manim import *
+from manim import (
+    DOWN,
+    GRAY,
+    LEFT,
+    ORANGE,
+    ORIGIN,
+    RIGHT,
+    UP,
+    Create,
+    FadeIn,
+    FadeOut,
+    LaggedStart,
+    SurroundingRectangle,
+    VGroup,
+    Write,
+)
+
+from algorithms.boyer_moore import boyer_moore_search_trace
+from algorithms.core import bad_character_table, good_suffix_table
+from algorithms.text_source import TextSource
+from algorithms.trace import Found, GalilSkip, Match, Mismatch, Shift
 from utils.base_visualization import BaseVisualization
-from utils.visual_array import VisualArray
+from utils.text_cache import cached_text
+from utils.visual_array import (
+    StreamingVisualArray,
+    VisualArray,
+    WindowedVisualArray,
+)
 from utils.text_helpers import wrap_text
 
 
@@ -9,32 +34,72 @@ class BoyerMooreAlgorithm(BaseVisualization):
     A Manim animation that visualizes the Boyer-Moore text search algorithm.
     """
 
+    TEXT = "AAAZBBBAAAABABCA"
+    PATTERN = "ABCA"
+    # One of algorithms.boyer_moore.SHIFT_RULES: "boyer_moore", "horspool", "sunday"
+    SHIFT_RULE = "boyer_moore"
+    # Skip comparing characters known to match after a good suffix shift
+    GALIL_RULE = False
+    # Scene title and name of the rule shifting on a character, per shift rule
+    RULE_TITLES = {
+        "boyer_moore": "Boyer-Moore",
+        "horspool": "Boyer-Moore-Horspool",
+        "sunday": "Sunday",
+    }
+    RULE_NAMES = {
+        "boyer_moore": "Bad Character Rule",
+        "horspool": "Horspool Rule",
+        "sunday": "Sunday Rule",
+    }
+
     CELL_WIDTH = 0.5
     CELL_HEIGHT = 0.5
     TITLE_FONT_SIZE = 30
     INFO_FONT_SIZE = 22
     VISUAL_ARRAY_FONT_SIZE = 24
-
-    def __init__(self):
-        super().__init__()
+    # Number of text cells on screen, longer texts scroll through this window
+    TEXT_WINDOW_SIZE = 20
+
+    def __init__(self, shift_rule=None, galil_rule=None, **kwargs):
+        # Set before the base class computes the render key from the settings
+        if shift_rule is not None:
+            self.SHIFT_RULE = shift_rule
+        if galil_rule is not None:
+            self.GALIL_RULE = galil_rule
+        super().__init__(**kwargs)
         self.graying_out_executed = False
-        self.text = "AAAZBBBAAAABABCA"
-        self.pattern = "ABCA"
+        self.galil_explained = False
+        # One flag per text character from compared_start on, set once the
+        # character has been compared. Only the current window is kept, as earlier
+        # characters are never grayed out again
+        self.compared = bytearray()
+        self.compared_start = 0
+        self.text = self.load_text()
+        self.pattern = self.PATTERN
         self.pattern_len = len(self.pattern)
-        self.text_len = len(self.text)
-        self.bad_char_shift = self.create_bad_character_table(self.pattern)
+        if self.SHIFT_RULE == "horspool":
+            # Horspool never looks up the last pattern character
+            self.bad_char_shift = self.create_bad_character_table(self.pattern[:-1])
+        else:
+            self.bad_char_shift = self.create_bad_character_table(self.pattern)
         self.good_suffix_shift = self.create_good_suffix_table(self.pattern)
-        self.previously_matched = set()
-        self.previously_mismatched = set()
         self.pattern_pos = 0
         self.text_pos = 0
 
-    def create_labeled_array(self, title, elements, buffer=0.0, shift_val=ORIGIN):
+    def create_labeled_array(
+        self,
+        title,
+        elements,
+        buffer=0.0,
+        shift_val=ORIGIN,
+        array_class=VisualArray,
+        **array_kwargs,
+    ):
         """
         Creates a labeled array with a title and elements for visualization.
         """
         label_text = (
-            Text(
+            cached_text(
                 title,
                 font=self.FONT_NAME,
                 font_size=self.TITLE_FONT_SIZE,
@@ -44,7 +109,7 @@ class BoyerMooreAlgorithm(BaseVisualization):
             .shift(shift_val)
         )
 
-        array = VisualArray(
+        array = array_class(
             elements,
             font_name=self.FONT_NAME,
             font_size=self.VISUAL_ARRAY_FONT_SIZE,
@@ -52,6 +117,8 @@ class BoyerMooreAlgorithm(BaseVisualization):
             border_color=self.ACCENT_COLOR,
             cell_width=self.CELL_WIDTH,
             cell_height=self.CELL_HEIGHT,
+            compact=self.COMPACT_ARRAYS,
+            **array_kwargs,
         ).next_to(label_text, RIGHT, buff=buffer)
         return label_text, array
 
@@ -59,7 +126,7 @@ class BoyerMooreAlgorithm(BaseVisualization):
         """
         Changes the color of characters in the text and pattern.
         """
-        self.play(
+        self.play_color_changes(
             self.text_mobject.get_change_element_color_animation(text_idx, color=color),
             self.pattern_mobject.get_change_element_color_animation(
                 pattern_idx, color=color
@@ -82,7 +149,7 @@ class BoyerMooreAlgorithm(BaseVisualization):
         """
         Create a message below the target mobject.
         """
-        text = Text(
+        text = cached_text(
             message,
             font=self.FONT_NAME,
             font_size=self.INFO_FONT_SIZE,
@@ -98,12 +165,8 @@ class BoyerMooreAlgorithm(BaseVisualization):
         """
         Visualize the application of the Bad Character Rule during the Boyer-Moore string search algorithm.
         """
-        if 0 < shift_value < self.pattern_len:
-            shift_text = self.create_info_message(
-                f"Bad Character Rule: Shift by {shift_value}\n"
-                f'Shift pattern up to rightmost occurrence of character "{character}"',
-            )
-        elif shift_value < 0:
+        rule_name = self.RULE_NAMES[self.SHIFT_RULE]
+        if shift_value < 0:
             shift_text = self.create_info_message(
                 f"Bad Character Rule: Shift by {shift_value}\n"
                 + wrap_text(
@@ -113,9 +176,8 @@ class BoyerMooreAlgorithm(BaseVisualization):
             )
         else:
             shift_text = self.create_info_message(
-                f"Bad Character Rule: Shift by {shift_value}\n"
-                "No character in pattern matches current character in text.\n"
-                "Move pattern past current character in text.",
+                f"{rule_name}: Shift by {shift_value}\n"
+                + self.explain_bad_char_shift(shift_value, character)
             )
 
         shifted_projection = self.pattern_mobject.copy()
@@ -132,6 +194,53 @@ class BoyerMooreAlgorithm(BaseVisualization):
         self.wait(1)
         self.play(FadeOut(shift_text), FadeOut(shifted_projection))
 
+    def explain_bad_char_shift(self, shift_value, character):
+        """
+        Returns why the shift rule moves the pattern by shift_value for the text
+        character it looked up.
+        """
+        if self.SHIFT_RULE == "sunday":
+            # Sunday looks up the character just after the window
+            if shift_value == self.pattern_len + 1:
+                return (
+                    f'Character "{character}" after the window is not in pattern.\n'
+                    "Move pattern past it."
+                )
+            if shift_value == self.pattern_len:
+                return (
+                    f'Character "{character}" after the window only occurs at the\n'
+                    "start of pattern. Move pattern to start at it."
+                )
+            return (
+                "Align the rightmost occurrence in pattern with character\n"
+                f'"{character}" after the window.'
+            )
+        if self.SHIFT_RULE == "horspool":
+            # Horspool looks up the character under the last pattern character,
+            # leaving that last occurrence out
+            if shift_value < self.pattern_len:
+                return (
+                    "Shift pattern up to rightmost occurrence of character\n"
+                    f'"{character}" before its last character.'
+                )
+            if character == self.pattern[-1]:
+                return (
+                    f'Character "{character}" only occurs as the last character of\n'
+                    "pattern. Move pattern past it."
+                )
+            return (
+                f'Character "{character}" under the end of the window is not in\n'
+                "pattern. Move pattern past it."
+            )
+        if character in self.pattern:
+            return (
+                f'Shift pattern up to rightmost occurrence of character "{character}"'
+            )
+        return (
+            "No character in pattern matches current character in text.\n"
+            "Move pattern past current character in text."
+        )
+
     def show_good_suffix_shift(self, shift_value, matched_characters):
         """
         Visualize the application of the Good Suffix Rule during the Boyer-Moore string search algorithm.
@@ -148,12 +257,12 @@ class BoyerMooreAlgorithm(BaseVisualization):
         prefix_end = suffix_end - shift_value
 
         suffix_rect = SurroundingRectangle(
-            VGroup(self.pattern_mobject.element_cells[suffix_start:suffix_end]),
+            self.pattern_mobject.get_cells(suffix_start, suffix_end),
             color=self.MATCH_COLOR,
             buff=-0.1,
         )
         prefix_rect = SurroundingRectangle(
-            VGroup(self.pattern_mobject.element_cells[prefix_start:prefix_end]),
+            self.pattern_mobject.get_cells(prefix_start, prefix_end),
             color=self.MATCH_COLOR,
             buff=-0.1,
         )
@@ -177,11 +286,45 @@ class BoyerMooreAlgorithm(BaseVisualization):
             FadeOut(prefix_rect),
         )
 
+    def show_period_shift(self, shift_value):
+        """
+        Visualize the Good Suffix Rule after a full match, which aligns the longest
+        border of the pattern with the end of the occurrence.
+        """
+        shift_text = self.create_info_message(
+            f"Good Suffix Rule: Shift pattern by {shift_value}.\n"
+            "The whole pattern matched, align its longest border with the match.\n",
+        )
+        shifted_projection = self.pattern_mobject.copy()
+        shifted_projection.reset_colors()
+        shifted_projection.shift(RIGHT * shift_value * self.CELL_WIDTH).shift(DOWN)
+        border_length = self.pattern_len - shift_value
+        rects = [
+            SurroundingRectangle(
+                self.pattern_mobject.get_cells(start, start + border_length),
+                color=self.MATCH_COLOR,
+                buff=-0.1,
+            )
+            for start in ((0, shift_value) if border_length > 0 else ())
+        ]
+
+        self.play(
+            Write(shift_text),
+            Create(shifted_projection),
+            *[Create(rect) for rect in rects],
+        )
+        self.wait(1)
+        self.play(
+            FadeOut(shift_text),
+            FadeOut(shifted_projection),
+            *[FadeOut(rect) for rect in rects],
+        )
+
     def create_matching_window(self, text_pos, pattern_pos):
         rect = SurroundingRectangle(
             VGroup(
-                self.text_mobject.element_cells[text_pos],
-                self.pattern_mobject.element_cells[pattern_pos],
+                self.text_mobject.get_cell(text_pos),
+                self.pattern_mobject.get_cell(pattern_pos),
             ),
             color=ORANGE,
         )
@@ -193,17 +336,17 @@ class BoyerMooreAlgorithm(BaseVisualization):
         end,
     ):
         """
-        Grays out the characters in the text that were skipped and never matched.
+        Grays out the characters in the text that were skipped and never compared.
         """
         if start >= end:
             return
-        for i in range(start, end):
-            if i in self.previously_matched or i in self.previously_mismatched:
-                continue
-            self.play(
-                self.text_mobject.get_change_element_color_animation(i, color=GRAY),
-                run_time=0.2,
-            )
+        # Characters compared in an earlier, overlapping window were not skipped
+        self.play_color_changes(
+            self.text_mobject.get_set_colors_animation(
+                {i: GRAY for i in range(start, end) if not self.was_compared(i)}
+            ),
+            run_time=0.2,
+        )
         # show info message the first time graying out gets executed
         if not self.graying_out_executed:
             explanation_text = self.create_info_message(
@@ -217,68 +360,103 @@ class BoyerMooreAlgorithm(BaseVisualization):
 
     def create_bad_character_table(self, pattern):
         """
-        Creates a bad character shift table as a dictionary
+        Creates a bad character table with the rightmost index of each character code.
         """
-        bad_char_shift = {}
-        for index, c in enumerate(pattern):
-            bad_char_shift[c] = index
-
-        return bad_char_shift
+        return bad_character_table(pattern)
 
     def create_good_suffix_table(self, pattern):
         """
         Creates the good suffix shift table.
         """
-        m = len(pattern)
-        goodSuffixShift = [0] * (m + 1)
-        borderPos = [0] * (m + 1)
-        i = m
-        j = m + 1
-        borderPos[i] = j
-
-        while i > 0:
-            while j <= m and pattern[i - 1] != pattern[j - 1]:
-                if goodSuffixShift[j] == 0:
-                    goodSuffixShift[j] = j - i
-                j = borderPos[j]
-            i = i - 1
-            j = j - 1
-            borderPos[i] = j
-
-        for k in range(m + 1):
-            if goodSuffixShift[k] == 0:
-                goodSuffixShift[k] = j
-            if k == j:
-                j = borderPos[j]
-
-        return goodSuffixShift
+        return good_suffix_table(pattern)
+
+    def mark_compared(self, text_idx):
+        offset = text_idx - self.compared_start
+        if offset >= len(self.compared):
+            self.compared.extend(bytes(offset + 1 - len(self.compared)))
+        self.compared[offset] = 1
+
+    def was_compared(self, text_idx):
+        offset = text_idx - self.compared_start
+        return 0 <= offset < len(self.compared) and self.compared[offset] == 1
+
+    def forget_compared_before(self, text_idx):
+        """
+        Drops the flags of characters left behind by the window.
+        """
+        del self.compared[: max(0, text_idx - self.compared_start)]
+        self.compared_start = max(self.compared_start, text_idx)
 
     def handle_matched_characters(self, text_idx, pattern_idx):
+        self.mark_compared(text_idx)
         self.change_char_colors(text_idx, pattern_idx, self.MATCH_COLOR)
-        self.previously_matched.add(text_idx)
         if pattern_idx - 1 >= 0:
             self.play(self.matching_window.animate.shift(LEFT * 0.5))
         else:
             self.play(FadeOut(self.matching_window))
 
+    def handle_galil_skip(self, skip):
+        """
+        Marks the characters the Galil rule skips as matched without comparing them,
+        moving the matching window past them.
+        """
+        text_end = skip.text_index + skip.length
+        pattern_end = skip.pattern_index + skip.length
+        self.play_color_changes(
+            self.text_mobject.get_set_colors_animation(
+                {k: self.MATCH_COLOR for k in range(skip.text_index, text_end)}
+            ),
+            self.pattern_mobject.get_set_colors_animation(
+                {k: self.MATCH_COLOR for k in range(skip.pattern_index, pattern_end)}
+            ),
+        )
+        skipped_rect = SurroundingRectangle(
+            self.pattern_mobject.get_cells(skip.pattern_index, pattern_end),
+            color=self.MATCH_COLOR,
+            buff=-0.1,
+        )
+        self.play(Create(skipped_rect))
+        # Explain the rule the first time it is applied
+        if not self.galil_explained:
+            explanation_text = self.create_info_message(
+                f"Galil Rule: {skip.length} characters are known to match from the\n"
+                "previous alignment, so they are not compared again",
+            )
+            self.play(FadeIn(explanation_text))
+            self.wait(2)
+            self.play(FadeOut(explanation_text))
+            self.galil_explained = True
+
+        if skip.pattern_index > 0:
+            self.play(
+                FadeOut(skipped_rect),
+                self.matching_window.animate.shift(
+                    LEFT * skip.length * self.CELL_WIDTH
+                ),
+            )
+        else:
+            self.play(FadeOut(skipped_rect), FadeOut(self.matching_window))
+
     def handle_mismatch(
         self,
         text_idx,
         pattern_idx,
     ):
+        self.mark_compared(text_idx)
         self.change_char_colors(text_idx, pattern_idx, self.MISMATCH_COLOR)
-        self.previously_mismatched.add(text_idx)
 
     def unhighlight_matched_and_mismatched(self, range_start, range_end):
-        to_unhighlight = []
-        for i in range(range_start, range_end):
-            if i in self.previously_matched or i in self.previously_mismatched:
-                to_unhighlight.append(i)
-        if len(to_unhighlight) > 0:
-            self.play(
-                self.text_mobject.get_change_element_color_animation(k, self.TEXT_COLOR)
-                for k in to_unhighlight
+        # Grayed out characters stay gray, only highlighted ones are animated
+        self.play_color_changes(
+            self.text_mobject.get_set_colors_animation(
+                {
+                    k: self.TEXT_COLOR
+                    for k in range(range_start, range_end)
+                    if not self.text_mobject.has_color(k, GRAY)
+                }
             )
+        )
+        self.flush_color_changes()
         self.pattern_mobject.reset_colors()
 
     def handle_shift(self, shift_value, matched_characters):
@@ -293,60 +471,153 @@ class BoyerMooreAlgorithm(BaseVisualization):
         self.wait(1)
         self.play(FadeOut(shift_text))
 
+    def describe_shift(self, shift):
+        """
+        Describes a shift and the rules that suggested it.
+        """
+        description = f"Shift by {shift.value} to text index {shift.position}"
+        rules = []
+        if shift.bad_character is not None:
+            rule_name = self.RULE_NAMES[self.SHIFT_RULE].lower().replace(" rule", "")
+            rules.append(f"{rule_name} {shift.bad_character}")
+        if shift.good_suffix is not None:
+            rules.append(f"good suffix {shift.good_suffix}")
+        return f"{description} ({', '.join(rules)})"
+
+    def summarize_skipped_steps(self, start, end):
+        """
+        Grays out the text the pattern was shifted over while skipping.
+        """
+        end = self.text_mobject.element_count() if end is None else end
+        animations = self.text_mobject.get_change_range_color_animations(
+            start, end, GRAY
+        )
+        if not animations:
+            return []
+        return [LaggedStart(*animations, lag_ratio=0.1)]
+
+    def scroll_text_window(self, position):
+        """
+        Scrolls the text so the pattern aligned at position is visible, moving the
+        pattern and matching window along with it.
+        """
+        self.flush_color_changes()
+        scrolled = self.text_mobject.ensure_visible(
+            position, position + self.pattern_len
+        )
+        if scrolled:
+            offset = LEFT * scrolled * self.CELL_WIDTH
+            self.pattern_mobject.shift(offset)
+            self.matching_window.shift(offset)
+            self.match_overlay.update_markers()
+
+    def shift_character_index(self, position, mismatch_index):
+        """
+        Returns the index of the text character the shift rule looks up.
+        """
+        if self.SHIFT_RULE == "sunday":
+            return position + self.pattern_len
+        if self.SHIFT_RULE == "horspool":
+            return position + self.pattern_len - 1
+        return position + mismatch_index
+
     def perform_boyer_moore_search(
         self,
     ):
         """
-        Executes the Boyer-Moore search algorithm on the given text and pattern.
+        Animates the Boyer-Moore search by replaying its trace.
         """
         i = 0
+        j = self.pattern_len - 1
+        matched_characters = 0
 
+        self.describe_step("Align pattern at text index 0")
         self.play(Create(self.matching_window))
-        while i <= self.text_len - self.pattern_len:
-            j = self.pattern_len - 1  # Start matching pattern from the end
-
-            matched_characters = 0
-
-            while j >= 0 and self.pattern[j] == self.text[i + j]:  # Matching
-                self.handle_matched_characters(i + j, j)
-                j -= 1
+        trace = boyer_moore_search_trace(
+            self.text,
+            self.pattern,
+            self.bad_char_shift,
+            self.good_suffix_shift,
+            rule=self.SHIFT_RULE,
+            galil=self.GALIL_RULE,
+            find_all=self.FIND_ALL,
+        )
+        for event in self.plan_fast_forward(trace, Shift):
+            if isinstance(event, Match):
+                self.handle_matched_characters(event.text_index, event.pattern_index)
                 matched_characters += 1
-
-            if j < 0:  # Fully matched
-                self.show_match_found()
-                return
-            else:  # Mismatch
-
-                bad_char_shift_value = j - self.bad_char_shift.get(self.text[i + j], -1)
-                good_suffix_shift_value = self.good_suffix_shift[j + 1]
-                self.handle_mismatch(i + j, j)
-                self.show_bad_char_shift(bad_char_shift_value, self.text[i + j])
-
-                if matched_characters > 0:
+            elif isinstance(event, GalilSkip):
+                self.handle_galil_skip(event)
+                matched_characters += event.length
+            elif isinstance(event, Found):  # Fully matched
+                self.describe_step(f"Match found at text index {event.position}")
+                if not self.FIND_ALL:
+                    self.show_match_found()
+                    return
+                self.play(
+                    self.match_overlay.get_add_marker_animation(event.position),
+                    run_time=0.3,
+                )
+                # The window faded out on the last match, bring it back at the
+                # start of the pattern for the shift to move it along
+                j = -1
+                self.matching_window = self.create_matching_window(i, 0)
+            elif isinstance(event, Mismatch):
+                j = event.pattern_index
+                self.handle_mismatch(event.text_index, j)
+            elif isinstance(event, Shift):
+                self.mark_step(event.position, self.describe_shift(event))
+                if event.bad_character is not None:
+                    character = self.text[self.shift_character_index(i, j)]
+                    if isinstance(self.text, TextSource):
+                        character = chr(character)
+                    self.show_bad_char_shift(event.bad_character, character)
+
+                if matched_characters == self.pattern_len:
+                    if event.good_suffix is not None:
+                        self.show_period_shift(event.good_suffix)
+                elif matched_characters > 0 and event.good_suffix is not None:
                     self.show_good_suffix_shift(
-                        good_suffix_shift_value,
+                        event.good_suffix,
                         matched_characters,
                     )
 
-                shift_value = max(1, max(bad_char_shift_value, good_suffix_shift_value))
-                self.gray_out_skipped_characters(i, min(i + j, i + shift_value))
+                self.gray_out_skipped_characters(i, min(i + j, i + event.value))
                 self.unhighlight_matched_and_mismatched(i, i + self.pattern_len)
-                self.handle_shift(shift_value, matched_characters)
+                # After a match the window sits on the first pattern character
+                self.handle_shift(
+                    event.value, matched_characters if j >= 0 else self.pattern_len - 1
+                )
 
-                i += shift_value
+                i = event.position
                 matched_characters = 0
+                self.forget_compared_before(i)
+                self.scroll_text_window(i)
 
     def construct(self):
-        self.setup_scene("Boyer-Moore Search Algorithm")
+        title = f"{self.RULE_TITLES[self.SHIFT_RULE]} Search Algorithm"
+        if self.GALIL_RULE:
+            title += " (Galil Rule)"
+        self.setup_scene(title)
 
         text_title, self.text_mobject = self.create_labeled_array(
-            "Text:", list(self.text), 1.5, UP * 2
+            "Text:",
+            self.text,
+            1.5,
+            UP * 2,
+            array_class=(
+                StreamingVisualArray
+                if isinstance(self.text, TextSource)
+                else WindowedVisualArray
+            ),
+            window_size=self.TEXT_WINDOW_SIZE,
+            margin=0,
         )
         pattern_title, self.pattern_mobject = self.create_labeled_array(
             "Pattern:", list(self.pattern), 1, UP * 1
         )
 
-        shift_title = Text(
+        shift_title = cached_text(
             "Shift: ",
             font=self.FONT_NAME,
             font_size=self.TITLE_FONT_SIZE,
@@ -364,6 +635,7 @@ class BoyerMooreAlgorithm(BaseVisualization):
             0 + self.pattern_len - 1,
             self.pattern_len - 1,
         )
+        self.match_overlay = self.create_match_overlay(self.text_mobject.get_span, UP)
         self.perform_boyer_moore_search()
 
         self.wait(2)
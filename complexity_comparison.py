@@ -0,0 +1,224 @@
+from manim import (
+    DOWN,
+    LEFT,
+    RIGHT,
+    UP,
+    Create,
+    FadeIn,
+    GrowFromEdge,
+    LaggedStart,
+    Rectangle,
+    ReplacementTransform,
+    VGroup,
+)
+
+from algorithms.counters import SEARCH_TRACES, OperationCounter
+from algorithms.trace import Compare, Found, Match, Mismatch
+from utils.base_visualization import BaseVisualization
+from utils.text_cache import cached_text
+from utils.visual_array import WindowedVisualArray
+
+
+class SearchLane:
+    """
+    The state of one search replayed in the comparison: its trace, operation
+    counter and the mobjects showing its progress.
+    """
+
+    def __init__(
+        self, algorithm, label, trace, counter, array, window, count_text, overlay
+    ):
+        self.algorithm = algorithm
+        self.label = label
+        self.trace = iter(trace)
+        self.counter = counter
+        self.array = array
+        self.window = window
+        self.count_text = count_text
+        self.overlay = overlay
+        # Text index compared in the previous round, recolored in the next one
+        self.last_compared = None
+        self.finished = False
+
+
+class ComplexityComparison(BaseVisualization):
+    """
+    A Manim animation that runs the naive, KMP and Boyer-Moore searches side by
+    side on the same input, counting their character comparisons as they go.
+    """
+
+    TEXT = "HERE IS A SIMPLE EXAMPLE"
+    PATTERN = "EXAMPLE"
+    # (search in SEARCH_TRACES, label) of each compared search, top to bottom
+    ALGORITHMS = [("naive", "Naive"), ("kmp", "KMP"), ("boyer_moore", "Boyer-Moore")]
+    # Number of text cells on screen per search, longer texts scroll
+    TEXT_WINDOW_SIZE = 24
+    CELL_SIZE = 0.35
+    # Width of the longest bar of the final chart
+    BAR_MAX_WIDTH = 6.0
+
+    def create_lane(self, algorithm, label, shift_val):
+        """
+        Creates the label, text array, pattern window and counter of a search.
+        """
+        label_text = (
+            cached_text(label, font=self.FONT_NAME, font_size=24, color=self.TEXT_COLOR)
+            .to_edge(LEFT, buff=0.5)
+            .shift(shift_val)
+        )
+        array = WindowedVisualArray(
+            self.TEXT,
+            font_name=self.FONT_NAME,
+            font_size=18,
+            element_color=self.TEXT_COLOR,
+            border_color=self.ACCENT_COLOR,
+            cell_width=self.CELL_SIZE,
+            cell_height=self.CELL_SIZE,
+            compact=self.COMPACT_ARRAYS,
+            window_size=self.TEXT_WINDOW_SIZE,
+            margin=min(len(self.PATTERN), self.TEXT_WINDOW_SIZE // 2),
+        )
+        array.to_edge(LEFT, buff=2.5).set_y(label_text.get_y())
+        window = Rectangle(
+            width=self.CELL_SIZE * len(self.PATTERN),
+            height=self.CELL_SIZE + 0.1,
+            color=self.HIGHLIGHT_COLOR,
+        ).move_to(array.get_cells(0, len(self.PATTERN)))
+        count_text = self.create_count_text(0).set_y(label_text.get_y())
+
+        self.add(label_text, array)
+        lane = SearchLane(
+            algorithm,
+            label,
+            SEARCH_TRACES[algorithm](self.TEXT, self.PATTERN, find_all=self.FIND_ALL),
+            OperationCounter(len(self.PATTERN), self.FIND_ALL),
+            array,
+            window,
+            count_text,
+            self.create_match_overlay(array.get_span, DOWN, buff=0.05),
+        )
+        return lane
+
+    def create_count_text(self, count):
+        return cached_text(
+            str(count), font=self.FONT_NAME, font_size=24, color=self.TEXT_COLOR
+        ).to_edge(RIGHT, buff=0.75)
+
+    def advance_lane(self, lane):
+        """
+        Replays a search up to the result of its next comparison, returning the
+        animations showing it.
+        """
+        compared = None
+        animations = []
+        for event in lane.trace:
+            lane.counter.update(event)
+            if isinstance(event, Compare):
+                compared = event
+            elif isinstance(event, Match):
+                color = self.MATCH_COLOR
+                break
+            elif isinstance(event, Mismatch):
+                color = self.MISMATCH_COLOR
+                break
+            elif isinstance(event, Found):
+                if lane.counter.finished:
+                    break
+                # In find-all mode the search goes on to its next comparison
+                animations.append(lane.overlay.get_add_marker_animation(event.position))
+        else:
+            lane.finished = True
+
+        if lane.counter.finished:
+            lane.finished = True
+            return [lane.window.animate.set_color(self.MATCH_COLOR)]
+        if compared is None:
+            return animations
+
+        start = compared.text_index - compared.pattern_index
+        if lane.array.ensure_visible(start, start + len(self.PATTERN)):
+            lane.overlay.update_markers()
+        colors = {compared.text_index: color}
+        if lane.last_compared is not None and lane.last_compared != compared.text_index:
+            # Compared characters stay marked, so the skipped ones stand out
+            colors = {lane.last_compared: self.ACCENT_COLOR, **colors}
+        lane.last_compared = compared.text_index
+        animation = lane.array.get_set_colors_animation(colors)
+        if animation is not None:
+            animations.append(animation)
+        target = lane.array.get_cells(start, start + len(self.PATTERN)).get_center()
+        if (lane.window.get_center() != target).any():
+            animations.append(lane.window.animate.move_to(target))
+
+        count_text = self.create_count_text(lane.counter.comparisons).set_y(
+            lane.count_text.get_y()
+        )
+        animations.append(ReplacementTransform(lane.count_text, count_text))
+        lane.count_text = count_text
+        return animations
+
+    def show_bar_chart(self, lanes):
+        """
+        Grows a bar per search, proportional to its number of comparisons.
+        """
+        comparisons = [lane.counter.comparisons for lane in lanes]
+        longest = max(max(comparisons), 1)
+        bars = VGroup()
+        labels = VGroup()
+        for row, (lane, count) in enumerate(zip(lanes, comparisons)):
+            label = (
+                cached_text(
+                    lane.label, font=self.FONT_NAME, font_size=24, color=self.TEXT_COLOR
+                )
+                .to_edge(LEFT, buff=0.5)
+                .shift(DOWN * (0.6 + row * 0.8))
+            )
+            bar = Rectangle(
+                width=max(self.BAR_MAX_WIDTH * count / longest, 0.01),
+                height=0.5,
+                color=self.ACCENT_COLOR,
+                fill_opacity=0.8,
+            )
+            bar.next_to(label, RIGHT, buff=0).to_edge(LEFT, buff=2.5)
+            value = cached_text(
+                str(count), font=self.FONT_NAME, font_size=24, color=self.TEXT_COLOR
+            ).next_to(bar, RIGHT, buff=0.2)
+            bars.add(bar)
+            labels.add(VGroup(label, value))
+
+        # Always animate the chart, like the steps finding a match when fast-forwarding
+        self.match_steps.add(len(self.step_boundaries) + 1)
+        self.mark_step(description="Comparisons per search")
+        self.play(*[FadeIn(label[0]) for label in labels])
+        self.play(
+            LaggedStart(*[GrowFromEdge(bar, LEFT) for bar in bars], lag_ratio=0.2)
+        )
+        self.play(*[FadeIn(label[1]) for label in labels])
+        self.wait(2)
+
+    def construct(self):
+        self.setup_scene("Comparing Search Algorithms", title_font_size=40)
+
+        header = cached_text(
+            "Comparisons", font=self.FONT_NAME, font_size=20, color=self.TEXT_COLOR
+        ).to_edge(RIGHT, buff=0.75)
+        lanes = [
+            self.create_lane(algorithm, label, UP * (2.2 - row * 0.8))
+            for row, (algorithm, label) in enumerate(self.ALGORITHMS)
+        ]
+        header.set_y(lanes[0].count_text.get_y() + 0.5)
+        self.add(header, *[lane.count_text for lane in lanes])
+        self.play(*[Create(lane.window) for lane in lanes])
+
+        round_number = 0
+        while not all(lane.finished for lane in lanes):
+            round_number += 1
+            self.mark_step(description=f"Comparison round {round_number}")
+            animations = []
+            for lane in lanes:
+                if not lane.finished:
+                    animations.extend(self.advance_lane(lane))
+            if animations:
+                self.play(*animations, run_time=0.3)
+
+        self.show_bar_chart(lanes)
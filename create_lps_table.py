@@ -1,6 +1,9 @@
-from manim import *
+from manim import DOWN, LEFT, ORIGIN, RIGHT, UP
 
+from algorithms.kmp import lps_table_trace
+from algorithms.trace import Backtrack, Compare, Match, TableWrite
 from utils.base_visualization import BaseVisualization
+from utils.text_cache import cached_text
 from utils.visual_array import VisualArray
 
 
@@ -9,6 +12,8 @@ class CreateLPSTable(BaseVisualization):
     A Manim animation that visualizes creation of the LPS table.
     """
 
+    PATTERN = "ABABCABAB"
+
     def create_labeled_array(
         self, elements, label_text, position, shift_val=ORIGIN, buff=0
     ):
@@ -21,8 +26,9 @@ class CreateLPSTable(BaseVisualization):
             font_size=48,
             element_color=self.TEXT_COLOR,
             border_color=self.ACCENT_COLOR,
+            compact=self.COMPACT_ARRAYS,
         )
-        label = Text(
+        label = cached_text(
             label_text, font=self.FONT_NAME, font_size=36, color=self.TEXT_COLOR
         )
         array.to_edge(position, buff=buff).shift(shift_val)
@@ -35,12 +41,12 @@ class CreateLPSTable(BaseVisualization):
         Highlights the prefix and suffix in the pattern array as part of the LPS computation.
         """
         for k in range(prefix_len):
-            self.play(
+            self.play_color_changes(
                 array.get_change_element_color_animation(k, color=self.MATCH_COLOR),
                 run_time=0.1,
             )
         for k in range(current_idx - prefix_len + 1, current_idx + 1):
-            self.play(
+            self.play_color_changes(
                 array.get_change_element_color_animation(k, color=self.ACCENT_COLOR),
                 run_time=0.1,
             )
@@ -48,7 +54,7 @@ class CreateLPSTable(BaseVisualization):
     def construct(self):
         self.setup_scene("Creation of the LPS Table")
 
-        pattern = "ABABCABAB"
+        pattern = self.PATTERN
         pattern_array, pattern_label = self.create_labeled_array(
             pattern, "Pattern:", position=UP, buff=2.5, shift_val=RIGHT
         )
@@ -57,39 +63,38 @@ class CreateLPSTable(BaseVisualization):
             lps, "LPS Table:", position=DOWN, buff=2.5, shift_val=RIGHT
         )
 
-        i, j = 1, 0  # Start from the second character in the pattern
-
-        while i < len(pattern):
-            pattern_array.reset_colors()
-            lps_array.reset_colors()
-
-            self.play(
-                pattern_array.get_change_element_color_animation(
-                    i, color=self.HIGHLIGHT_COLOR
+        for event in lps_table_trace(pattern):
+            if isinstance(event, Compare):
+                self.mark_step(
+                    event.text_index,
+                    f"Compare pattern[{event.text_index}] "
+                    f"with pattern[{event.pattern_index}]",
                 )
-            )
-            self.wait(0.3)
-
-            if pattern[i] == pattern[j]:
-                j += 1
-                self.highlight_prefix_suffix(pattern_array, j, i)
+                pattern_array.reset_colors()
+                lps_array.reset_colors()
 
-                # Update LPS table
                 self.play(
-                    lps_array.get_update_element_animation(
-                        i, j, color=self.ACCENT_COLOR
+                    pattern_array.get_change_element_color_animation(
+                        event.text_index, color=self.HIGHLIGHT_COLOR
                     )
                 )
-                i += 1
-            else:
-                if j != 0:
-                    j = lps[j - 1]
-                else:
-                    self.play(
-                        lps_array.get_update_element_animation(
-                            i, 0, color=self.MISMATCH_COLOR
-                        )
+                self.wait(0.3)
+            elif isinstance(event, Match):
+                self.highlight_prefix_suffix(
+                    pattern_array, event.pattern_index + 1, event.text_index
+                )
+            elif isinstance(event, Backtrack):
+                self.describe_step(
+                    f"Mismatch, j = lps[{event.from_index - 1}] = {event.to_index}"
+                )
+            elif isinstance(event, TableWrite):
+                self.describe_step(f"lps[{event.index}] = {event.value}")
+                # Update LPS table, zero is only written after a mismatch
+                color = self.ACCENT_COLOR if event.value else self.MISMATCH_COLOR
+                self.play(
+                    lps_array.get_update_element_animation(
+                        event.index, event.value, color=color
                     )
-                    i += 1
+                )
 
         self.wait(2)  # Pause to display the completed LPS table
@@ -1,7 +1,26 @@
-from manim import *
+from manim import (
+    DOWN,
+    GRAY,
+    LEFT,
+    ORIGIN,
+    RIGHT,
+    UP,
+    FadeOut,
+    LaggedStart,
+    Write,
+)
 
+from algorithms.core import lps_table
+from algorithms.kmp import kmp_search_trace
+from algorithms.text_source import TextSource
+from algorithms.trace import Backtrack, Compare, Found, Match, Mismatch, Shift
 from utils.base_visualization import BaseVisualization
-from utils.visual_array import VisualArray
+from utils.text_cache import cached_text
+from utils.visual_array import (
+    StreamingVisualArray,
+    VisualArray,
+    WindowedVisualArray,
+)
 
 
 class KMPAlgorithm(BaseVisualization):
@@ -9,17 +28,30 @@ class KMPAlgorithm(BaseVisualization):
     A Manim animation that visualizes the KMP text search algorithm.
     """
 
-    def create_labeled_array(self, title, elements, buffer=0.0, shift_val=ORIGIN):
+    TEXT = "ABADABACDABABCABAB"
+    PATTERN = "ABABCABAB"
+    # Number of text cells on screen, longer texts scroll through this window
+    TEXT_WINDOW_SIZE = 20
+
+    def create_labeled_array(
+        self,
+        title,
+        elements,
+        buffer=0.0,
+        shift_val=ORIGIN,
+        array_class=VisualArray,
+        **array_kwargs,
+    ):
         """
         Creates a labeled array with a title and elements for visualization.
         """
         label_text = (
-            Text(title, font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR)
+            cached_text(title, font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR)
             .to_edge(LEFT, buff=0.75)
             .shift(shift_val)
         )
 
-        array = VisualArray(
+        array = array_class(
             elements,
             font_name=self.FONT_NAME,
             font_size=24,
@@ -27,6 +59,8 @@ class KMPAlgorithm(BaseVisualization):
             border_color=self.ACCENT_COLOR,
             cell_width=0.5,
             cell_height=0.5,
+            compact=self.COMPACT_ARRAYS,
+            **array_kwargs,
         ).next_to(label_text, RIGHT, buff=buffer)
         return label_text, array
 
@@ -34,7 +68,7 @@ class KMPAlgorithm(BaseVisualization):
         """
         Highlights the current characters in the text and pattern during comparison
         """
-        self.play(
+        self.play_color_changes(
             text_mobject.get_change_element_color_animation(i, color=color),
             pattern_mobject.get_change_element_color_animation(j, color=color),
         )
@@ -43,9 +77,9 @@ class KMPAlgorithm(BaseVisualization):
         """
         Displays a message indicating a successful pattern match.
         """
-        match_text = Text("Match Found!", font=self.FONT_NAME, font_size=30).next_to(
-            pattern_mobject, RIGHT, buff=1
-        )
+        match_text = cached_text(
+            "Match Found!", font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR
+        ).next_to(pattern_mobject, RIGHT, buff=1)
         self.play(Write(match_text))
         self.wait(1)
         self.play(FadeOut(match_text))
@@ -62,64 +96,128 @@ class KMPAlgorithm(BaseVisualization):
         )
         new_j = lps[j - 1]
         # Unhighlight previously matched text characters that dont match after backtracking
-        self.play(
-            text_mobject.get_change_element_color_animation(k, color=self.TEXT_COLOR)
-            for k in range(i - j, i - j + (j - new_j))
+        self.play_color_changes(
+            text_mobject.get_set_colors_animation(
+                {k: self.TEXT_COLOR for k in range(i - j, i - j + (j - new_j))}
+            )
         )
-        self.play(
-            pattern_mobject.get_change_element_color_animation(k, self.TEXT_COLOR)
-            for k in range(new_j, j + 1)
+        self.play_color_changes(
+            pattern_mobject.get_set_colors_animation(
+                {k: self.TEXT_COLOR for k in range(new_j, j + 1)}
+            )
         )
+        self.flush_color_changes()
         lps_mobject.reset_colors()
 
         return new_j
 
+    def summarize_skipped_steps(self, start, end):
+        """
+        Grays out the text scanned while skipping.
+        """
+        end = self.text_mobject.element_count() if end is None else end
+        animations = self.text_mobject.get_change_range_color_animations(
+            start, end, GRAY
+        )
+        if not animations:
+            return []
+        return [LaggedStart(*animations, lag_ratio=0.1)]
+
     def perform_kmp_search(
         self, text, pattern, lps, text_mobject, pattern_mobject, lps_mobject
     ):
         """
-        Executes the KMP search algorithm on the given text and pattern.
+        Animates the KMP search on the given text and pattern by replaying its trace.
         """
-        i, j = 0, 0
-        while i < len(text):
-            self.highlight_current_characters(
-                i, j, text_mobject, pattern_mobject, self.HIGHLIGHT_COLOR
-            )
-            if text[i] == pattern[j]:
+        self.describe_step("Start matching at text index 0")
+        trace = kmp_search_trace(text, pattern, lps, find_all=self.FIND_ALL)
+        for event in self.plan_fast_forward(trace, (Backtrack, Shift)):
+            if isinstance(event, Compare):
+                # Scroll before anything is queued on the cells being recycled
+                self.flush_color_changes()
+                if text_mobject.ensure_visible(event.text_index):
+                    self.match_overlay.update_markers()
                 self.highlight_current_characters(
-                    i, j, text_mobject, pattern_mobject, self.MATCH_COLOR
+                    event.text_index,
+                    event.pattern_index,
+                    text_mobject,
+                    pattern_mobject,
+                    self.HIGHLIGHT_COLOR,
                 )
-                i += 1
-                j += 1
-                if j == len(pattern):
-                    self.show_match_found(pattern_mobject)
-                    break
-            else:
+            elif isinstance(event, Match):
                 self.highlight_current_characters(
-                    i, j, text_mobject, pattern_mobject, self.MISMATCH_COLOR
+                    event.text_index,
+                    event.pattern_index,
+                    text_mobject,
+                    pattern_mobject,
+                    self.MATCH_COLOR,
                 )
-                # j = self.handle_mismatch(i, j, lps)
-                if j != 0:
-                    j = self.backtrack(
-                        i, j, lps, lps_mobject, text_mobject, pattern_mobject
+            elif isinstance(event, Found):
+                self.describe_step(f"Match found at text index {event.position}")
+                if self.FIND_ALL:
+                    self.play(
+                        self.match_overlay.get_add_marker_animation(event.position),
+                        run_time=0.3,
                     )
                 else:
-                    # if no more backtracking can be made start matching from next character in text
-                    text_mobject.reset_colors()
-                    i += 1
+                    self.show_match_found(pattern_mobject)
+            elif isinstance(event, Mismatch):
+                self.highlight_current_characters(
+                    event.text_index,
+                    event.pattern_index,
+                    text_mobject,
+                    pattern_mobject,
+                    self.MISMATCH_COLOR,
+                )
+            elif isinstance(event, Backtrack):
+                if event.from_index == len(pattern):
+                    # After a match the search continues from its longest border
+                    reason = "Continue after the match"
+                else:
+                    reason = f"Mismatch at text index {event.text_index}"
+                self.mark_step(
+                    event.text_index,
+                    f"{reason}, j = lps[{event.from_index - 1}] = {event.to_index}",
+                )
+                self.backtrack(
+                    event.text_index,
+                    event.from_index,
+                    lps,
+                    lps_mobject,
+                    text_mobject,
+                    pattern_mobject,
+                )
+            elif isinstance(event, Shift):
+                # if no more backtracking can be made start matching from next character in text
+                self.mark_step(
+                    event.position,
+                    f"Mismatch with j = 0, continue at text index {event.position}",
+                )
+                text_mobject.reset_colors()
 
     def construct(self):
         # Set background color
         self.setup_scene("KMP Search Algorithm")
 
-        # Example text and pattern
-        text = "ABADABACDABABCABAB"
-        pattern = "ABABCABAB"
-        lps = [0, 0, 1, 2, 0, 1, 2, 3, 4]
+        text = self.load_text()
+        pattern = self.PATTERN
+        lps = lps_table(pattern)
 
         text_title, text_mobject = self.create_labeled_array(
-            "Text:", list(text), 1.5, UP
+            "Text:",
+            text,
+            1.5,
+            UP,
+            array_class=(
+                StreamingVisualArray
+                if isinstance(text, TextSource)
+                else WindowedVisualArray
+            ),
+            window_size=self.TEXT_WINDOW_SIZE,
+            # Keep the characters matched so far visible after scrolling
+            margin=min(len(pattern), self.TEXT_WINDOW_SIZE // 2),
         )
+        self.text_mobject = text_mobject
         pattern_title, pattern_mobject = self.create_labeled_array(
             "Pattern:", list(pattern), 1
         )
@@ -133,6 +231,7 @@ class KMPAlgorithm(BaseVisualization):
             lps_title,
             lps_mobject,
         )
+        self.match_overlay = self.create_match_overlay(text_mobject.get_span, UP)
 
         self.perform_kmp_search(
             text, pattern, lps, text_mobject, pattern_mobject, lps_mobject
@@ -1,6 +1,24 @@
-from manim import *
+from manim import (
+    BLUE,
+    DEFAULT_FONT_SIZE,
+    DOWN,
+    GRAY,
+    LEFT,
+    RIGHT,
+    UP,
+    WHITE,
+    Create,
+    FadeOut,
+    LaggedStart,
+    SurroundingRectangle,
+    VGroup,
+    Write,
+)
 
+from algorithms.naive import naive_search_trace
+from algorithms.trace import Compare, Found, Match, Mismatch, Shift
 from utils.base_visualization import BaseVisualization
+from utils.text_cache import cached_text
 
 
 class NaiveSearch(BaseVisualization):
@@ -8,18 +26,23 @@ class NaiveSearch(BaseVisualization):
     A Manim animation that visualizes the Naive Search Algorithm.
     """
 
+    TEXT = "ABABABC"
+    PATTERN = "ABC"
+
     def display_labeled_text(self, label, content, position, font_size=36, buff=0.5):
         """
         Utility to create and display labeled text
         """
         label_mobject = (
-            Text(label, font=self.FONT_NAME, font_size=font_size, color=self.TEXT_COLOR)
+            cached_text(
+                label, font=self.FONT_NAME, font_size=font_size, color=self.TEXT_COLOR
+            )
             .to_edge(LEFT, buff=buff)
             .shift(position)
         )
         content_mobject = VGroup(
             *[
-                Text(
+                cached_text(
                     char,
                     font=self.FONT_NAME,
                     font_size=font_size + 12,
@@ -39,7 +62,7 @@ class NaiveSearch(BaseVisualization):
         Animates the comparison of a character between text and pattern.
         """
         color = self.MATCH_COLOR if match else self.MISMATCH_COLOR
-        self.play(
+        self.play_color_changes(
             text_mobject[index_text].animate.set_color(color),
             pattern_mobject[index_pattern].animate.set_color(color),
             run_time=0.3,
@@ -51,55 +74,139 @@ class NaiveSearch(BaseVisualization):
             text_mobject[start_idx + j].set_color(WHITE)
             pattern_mobject[j].set_color(WHITE)
 
+    def open_window(self, text_mobject, start_idx, pattern_len):
+        """
+        Highlights the current window of comparison in the text.
+        """
+        window_highlight = SurroundingRectangle(
+            text_mobject[start_idx : start_idx + pattern_len],
+            color=BLUE,
+            buff=0.2,
+            stroke_width=2.5,
+        )
+        self.play(Create(window_highlight))
+        return window_highlight
+
+    def close_window(
+        self, text_mobject, pattern_mobject, window_highlight, start_idx, matched
+    ):
+        """
+        Announces a match if the window matched and clears it for the next one.
+        """
+        self.wait(0.5)
+
+        if matched and self.FIND_ALL:
+            self.play(
+                self.match_overlay.get_add_marker_animation(start_idx), run_time=0.3
+            )
+        elif matched:
+            # Display match found if the entire pattern matches
+            match_text = (
+                cached_text(
+                    "Match Found!",
+                    font=self.FONT_NAME,
+                    font_size=DEFAULT_FONT_SIZE,
+                    color=self.TEXT_COLOR,
+                )
+                .scale(0.75)
+                .next_to(text_mobject, RIGHT * 2)
+            )
+            self.play(Write(match_text))
+            self.wait(1)
+            self.play(FadeOut(match_text))
+
+        # Reset colors for the next window
+        self.reset_colors(
+            text_mobject, pattern_mobject, start_idx, len(pattern_mobject)
+        )
+
+        self.play(FadeOut(window_highlight))
+
+    def locate_occurrence(self, start, end, direction):
+        """
+        Returns the ends of the edge of the text characters from start up to end.
+        """
+        characters = self.text_mobject[start:end]
+        return (
+            characters.get_corner(direction + LEFT),
+            characters.get_corner(direction + RIGHT),
+        )
+
+    def summarize_skipped_steps(self, start, end):
+        """
+        Grays out the text of the skipped windows in a single sweep.
+        """
+        end = len(self.TEXT) if end is None else end
+        if start >= end:
+            return []
+        skipped = self.text_mobject[start:end]
+        return [
+            LaggedStart(
+                *[char.animate.set_color(GRAY) for char in skipped], lag_ratio=0.1
+            )
+        ]
+
     def construct(self):
         self.setup_scene("Naive Search Algorithm")
 
-        text = "ABABABC"
-        pattern = "ABC"
+        text = self.TEXT
+        pattern = self.PATTERN
         pattern_len = len(pattern)
         text_mobject = self.display_labeled_text("Text:", text, UP * 1)
+        self.text_mobject = text_mobject
         pattern_mobject = self.display_labeled_text("Pattern:", pattern, DOWN * 2)
+        # Clear of the window highlight around the text
+        self.match_overlay = self.create_match_overlay(
+            self.locate_occurrence, DOWN, buff=0.3
+        )
 
-        # Perform the Naive Search
-        for i in range(len(text) - pattern_len + 1):
-            # Highlight the current window of comparison in the text
-            window_highlight = SurroundingRectangle(
-                text_mobject[i : i + pattern_len],
-                color=BLUE,
-                buff=0.2,
-                stroke_width=2.5,
-            )
-            self.play(Create(window_highlight))
-
-            # Compare each letter of the pattern with the current window in the text
-            matched = True
-            for j in range(pattern_len):
-                if text[i + j] != pattern[j]:
-                    self.animate_match_or_mismatch(
-                        text_mobject, pattern_mobject, i + j, j, match=False
-                    )
-                    self.wait(0.5)
-                    matched = False
-                    break
-
+        # Replay the Naive Search trace
+        window_start = 0
+        window_highlight = None
+        matched = False
+        self.describe_step("Window at text index 0")
+        # The naive search always scans the whole text, FIND_ALL only changes how
+        # the matches are shown
+        trace = naive_search_trace(text, pattern)
+        for event in self.plan_fast_forward(trace, Shift):
+            if isinstance(event, Compare) and window_highlight is None:
+                window_highlight = self.open_window(
+                    text_mobject, window_start, pattern_len
+                )
+            elif isinstance(event, Match):
                 self.animate_match_or_mismatch(
-                    text_mobject, pattern_mobject, i + j, j, match=True
+                    text_mobject,
+                    pattern_mobject,
+                    event.text_index,
+                    event.pattern_index,
+                    match=True,
                 )
-
-            self.wait(0.5)
-
-            if matched:
-                # Display match found if the entire pattern matches
-                match_text = (
-                    Text("Match Found!", font=self.FONT_NAME, color=self.TEXT_COLOR)
-                    .scale(0.75)
-                    .next_to(text_mobject, RIGHT * 2)
+            elif isinstance(event, Mismatch):
+                self.animate_match_or_mismatch(
+                    text_mobject,
+                    pattern_mobject,
+                    event.text_index,
+                    event.pattern_index,
+                    match=False,
                 )
-                self.play(Write(match_text))
-                self.wait(1)
-                self.play(FadeOut(match_text))
-
-            # Reset colors for the next window
-            self.reset_colors(text_mobject, pattern_mobject, i, pattern_len)
+                self.wait(0.5)
+            elif isinstance(event, Found):
+                matched = True
+                self.describe_step(f"Match found at text index {event.position}")
+            elif isinstance(event, Shift):
+                self.close_window(
+                    text_mobject,
+                    pattern_mobject,
+                    window_highlight,
+                    window_start,
+                    matched,
+                )
+                self.mark_step(event.position, f"Window at text index {event.position}")
+                window_start = event.position
+                window_highlight = None
+                matched = False
 
-            self.play(FadeOut(window_highlight))
+        if window_highlight is not None:
+            self.close_window(
+                text_mobject, pattern_mobject, window_highlight, window_start, matched
+            )
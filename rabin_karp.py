@@ -0,0 +1,345 @@
+from manim import (
+    DOWN,
+    GRAY,
+    LEFT,
+    ORIGIN,
+    RIGHT,
+    UP,
+    Create,
+    FadeIn,
+    FadeOut,
+    LaggedStart,
+    ReplacementTransform,
+    SurroundingRectangle,
+    Write,
+)
+
+from algorithms.core import polynomial_hash, to_codes
+from algorithms.rabin_karp import rabin_karp_search_trace
+from algorithms.text_source import TextSource
+from algorithms.trace import Compare, Found, Match, Mismatch, Shift, WindowHash
+from utils.base_visualization import BaseVisualization
+from utils.text_cache import cached_text
+from utils.visual_array import (
+    StreamingVisualArray,
+    VisualArray,
+    WindowedVisualArray,
+)
+
+
+class RabinKarp(BaseVisualization):
+    """
+    A Manim animation that visualizes the Rabin-Karp text search algorithm.
+    """
+
+    TEXT = "35906739923141526"
+    PATTERN = "31415"
+    # A small modulus makes different windows share hashes, so the spurious hits
+    # that have to be verified character by character show up in short texts
+    HASH_BASE = 10
+    HASH_MODULUS = 13
+    # Number of text cells on screen, longer texts scroll through this window
+    TEXT_WINDOW_SIZE = 20
+    CELL_WIDTH = 0.5
+    INFO_FONT_SIZE = 22
+
+    def __init__(self, hash_base=None, hash_modulus=None, **kwargs):
+        if hash_base is not None:
+            self.HASH_BASE = hash_base
+        if hash_modulus is not None:
+            self.HASH_MODULUS = hash_modulus
+        super().__init__(**kwargs)
+        self.roll_explained = False
+
+    def create_labeled_array(
+        self,
+        title,
+        elements,
+        buffer=0.0,
+        shift_val=ORIGIN,
+        array_class=VisualArray,
+        **array_kwargs,
+    ):
+        """
+        Creates a labeled array with a title and elements for visualization.
+        """
+        label_text = (
+            cached_text(title, font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR)
+            .to_edge(LEFT, buff=0.75)
+            .shift(shift_val)
+        )
+
+        array = array_class(
+            elements,
+            font_name=self.FONT_NAME,
+            font_size=24,
+            element_color=self.TEXT_COLOR,
+            border_color=self.ACCENT_COLOR,
+            cell_width=self.CELL_WIDTH,
+            cell_height=self.CELL_WIDTH,
+            compact=self.COMPACT_ARRAYS,
+            **array_kwargs,
+        ).next_to(label_text, RIGHT, buff=buffer)
+        return label_text, array
+
+    def create_hash_text(self, label, value, color=None):
+        return cached_text(
+            f"{label}: {value}",
+            font=self.FONT_NAME,
+            font_size=26,
+            color=self.TEXT_COLOR if color is None else color,
+        )
+
+    def create_info_message(self, message):
+        """
+        Creates a message below the hashes.
+        """
+        return cached_text(
+            message,
+            font=self.FONT_NAME,
+            font_size=self.INFO_FONT_SIZE,
+            color=self.TEXT_COLOR,
+        ).next_to(self.text_mobject, DOWN, buff=2.5)
+
+    def character(self, index):
+        """
+        Returns the text character at index, also when the text is streamed.
+        """
+        if isinstance(self.text, TextSource):
+            return chr(self.text[index])
+        return self.text[index]
+
+    def hashed(self, data):
+        """
+        Returns the text or pattern the way it is hashed, digits by their values.
+        """
+        if self.digits:
+            return bytes(int(digit) for digit in data)
+        return data
+
+    def hash_term(self, index):
+        """
+        Returns how the text character at index enters the hash in the messages.
+        """
+        if self.digits:
+            return self.character(index)
+        return f"'{self.character(index)}'"
+
+    def show_window_hash(self, event):
+        """
+        Shows the hash of the window at the event's position, and how it was rolled
+        from the hash of the previous window.
+        """
+        matches = event.value == self.pattern_hash
+        hash_text = self.create_hash_text(
+            "Window hash",
+            event.value,
+            self.HIGHLIGHT_COLOR if matches else None,
+        ).move_to(self.window_hash_text)
+        animations = [ReplacementTransform(self.window_hash_text, hash_text)]
+        self.window_hash_text = hash_text
+
+        roll_text = None
+        if event.position > 0:
+            position = event.position
+            removed = self.hash_term(position - 1)
+            added = self.hash_term(position + self.pattern_len - 1)
+            message = (
+                f"(({self.window_hash} - {removed} * {self.high_power}) "
+                f"* {self.HASH_BASE} + {added}) mod {self.HASH_MODULUS} "
+                f"= {event.value}"
+            )
+            # Explain the formula the first time the hash is rolled
+            if not self.roll_explained:
+                terms = "digits stand for their values"
+                if not self.digits:
+                    terms = "characters stand for their codes"
+                message += (
+                    "\nRemove the first character of the window and add the next one,"
+                    f"\n{terms}, {self.HASH_BASE}^"
+                    f"{self.pattern_len - 1} mod {self.HASH_MODULUS} "
+                    f"= {self.high_power}"
+                )
+                self.roll_explained = True
+            roll_text = self.create_info_message(message)
+            animations.append(FadeIn(roll_text))
+        self.window_hash = event.value
+
+        if matches:
+            animations.append(self.window_rect.animate.set_color(self.HIGHLIGHT_COLOR))
+        self.play(*animations, run_time=0.5)
+        if roll_text is not None:
+            self.wait(0.5)
+            self.play(FadeOut(roll_text), run_time=0.3)
+
+    def highlight_current_characters(self, text_idx, pattern_idx, color):
+        self.play_color_changes(
+            self.text_mobject.get_change_element_color_animation(text_idx, color),
+            self.pattern_mobject.get_change_element_color_animation(pattern_idx, color),
+            run_time=0.3,
+        )
+
+    def show_spurious_hit(self, position):
+        """
+        Explains that the window had the hash of the pattern without matching it.
+        """
+        message = self.create_info_message(
+            f"Spurious hit: the window at text index {position} has the hash of the\n"
+            "pattern, but its characters differ"
+        )
+        self.play(FadeIn(message))
+        self.wait(1)
+        self.play(FadeOut(message))
+
+    def show_match_found(self, position):
+        if self.FIND_ALL:
+            self.play(
+                self.match_overlay.get_add_marker_animation(position), run_time=0.3
+            )
+            return
+        match_text = cached_text(
+            "Match Found!", font=self.FONT_NAME, font_size=30, color=self.TEXT_COLOR
+        ).next_to(self.pattern_mobject, RIGHT, buff=1)
+        self.play(Write(match_text))
+        self.wait(1)
+        self.play(FadeOut(match_text))
+
+    def move_window(self, position):
+        """
+        Moves the window and the pattern to the text at position, scrolling the text
+        if needed.
+        """
+        self.flush_color_changes()
+        self.text_mobject.reset_colors()
+        self.pattern_mobject.reset_colors()
+        scrolled = self.text_mobject.ensure_visible(
+            position, position + self.pattern_len
+        )
+        if scrolled:
+            offset = LEFT * scrolled * self.CELL_WIDTH
+            self.window_rect.shift(offset)
+            self.pattern_mobject.shift(offset)
+            self.match_overlay.update_markers()
+        self.play(
+            self.window_rect.animate.shift(RIGHT * self.CELL_WIDTH).set_color(
+                self.ACCENT_COLOR
+            ),
+            self.pattern_mobject.animate.shift(RIGHT * self.CELL_WIDTH),
+            run_time=0.3,
+        )
+
+    def summarize_skipped_steps(self, start, end):
+        """
+        Grays out the text the window rolled over while skipping.
+        """
+        end = self.text_mobject.element_count() if end is None else end
+        animations = self.text_mobject.get_change_range_color_animations(
+            start, end, GRAY
+        )
+        if not animations:
+            return []
+        return [LaggedStart(*animations, lag_ratio=0.1)]
+
+    def perform_rabin_karp_search(self):
+        """
+        Animates the Rabin-Karp search by replaying its trace.
+        """
+        self.describe_step("Hash the window at text index 0")
+        trace = rabin_karp_search_trace(
+            self.hashed(self.text),
+            self.hashed(self.pattern),
+            self.HASH_BASE,
+            self.HASH_MODULUS,
+            find_all=self.FIND_ALL,
+        )
+        verified = None
+        for event in self.plan_fast_forward(trace, Shift):
+            if isinstance(event, WindowHash):
+                self.show_window_hash(event)
+                if event.value == self.pattern_hash:
+                    verified = event.position
+                    self.describe_step(
+                        f"Hash matches at text index {event.position}, verify it"
+                    )
+            elif isinstance(event, Compare):
+                self.highlight_current_characters(
+                    event.text_index, event.pattern_index, self.HIGHLIGHT_COLOR
+                )
+            elif isinstance(event, Match):
+                self.highlight_current_characters(
+                    event.text_index, event.pattern_index, self.MATCH_COLOR
+                )
+            elif isinstance(event, Mismatch):
+                self.highlight_current_characters(
+                    event.text_index, event.pattern_index, self.MISMATCH_COLOR
+                )
+                self.describe_step(f"Spurious hit at text index {verified}")
+                self.show_spurious_hit(verified)
+            elif isinstance(event, Found):
+                self.describe_step(f"Match found at text index {event.position}")
+                self.show_match_found(event.position)
+            elif isinstance(event, Shift):
+                self.mark_step(
+                    event.position, f"Roll the hash to text index {event.position}"
+                )
+                self.move_window(event.position)
+
+    def construct(self):
+        self.setup_scene("Rabin-Karp Search Algorithm")
+
+        self.text = self.load_text()
+        self.pattern = self.PATTERN
+        self.pattern_len = len(self.pattern)
+        # Digits are hashed as their values, so that with base 10 a hash is the
+        # number the window spells, modulo HASH_MODULUS
+        self.digits = isinstance(self.text, str) and all(
+            data.isascii() and data.isdigit() for data in (self.text, self.pattern)
+        )
+        self.pattern_hash = polynomial_hash(
+            to_codes(self.hashed(self.pattern)), self.HASH_BASE, self.HASH_MODULUS
+        )
+        self.high_power = pow(self.HASH_BASE, self.pattern_len - 1, self.HASH_MODULUS)
+        # Set by the first WindowHash event of the trace
+        self.window_hash = None
+
+        text_title, self.text_mobject = self.create_labeled_array(
+            "Text:",
+            self.text,
+            1.5,
+            UP * 1.5,
+            array_class=(
+                StreamingVisualArray
+                if isinstance(self.text, TextSource)
+                else WindowedVisualArray
+            ),
+            window_size=self.TEXT_WINDOW_SIZE,
+            margin=0,
+        )
+        pattern_title, self.pattern_mobject = self.create_labeled_array(
+            "Pattern:", list(self.pattern), 1, UP * 0.5
+        )
+        self.pattern_mobject.align_to(self.text_mobject, LEFT)
+        pattern_hash_text = self.create_hash_text(
+            "Pattern hash", self.pattern_hash
+        ).next_to(pattern_title, DOWN, buff=0.5, aligned_edge=LEFT)
+        self.window_hash_text = self.create_hash_text("Window hash", "-").next_to(
+            pattern_hash_text, RIGHT, buff=1
+        )
+        self.window_rect = SurroundingRectangle(
+            self.text_mobject.get_cells(0, self.pattern_len),
+            color=self.ACCENT_COLOR,
+            buff=0.05,
+        )
+
+        self.add(
+            text_title,
+            self.text_mobject,
+            pattern_title,
+            self.pattern_mobject,
+            pattern_hash_text,
+        )
+        self.match_overlay = self.create_match_overlay(self.text_mobject.get_span, UP)
+        self.play(Create(self.window_rect), FadeIn(self.window_hash_text))
+        self.perform_rabin_karp_search()
+
+        self.wait(2)
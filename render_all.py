@@ -0,0 +1,168 @@
+"""
+Renders every visualization in the repository concurrently, one scene per worker.
+
+    python render_all.py -q l
+    python render_all.py -q h -j 2 KMPAlgorithm BoyerMooreAlgorithm
+"""
+
+import argparse
+import ast
+import importlib
+import os
+import shutil
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+RenderResult = namedtuple(
+    "RenderResult", ["scene_name", "success", "duration", "output", "error"]
+)
+
+
+def find_scenes(root_dir=ROOT_DIR):
+    """
+    Returns (module name, scene name) pairs of every BaseVisualization subclass
+    defined in the top-level modules of the repository.
+
+    Modules are parsed rather than imported, so listing scenes does not load manim.
+    """
+    bases = {}
+    for path in sorted(root_dir.glob("*.py")):
+        tree = ast.parse(path.read_text(), filename=str(path))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                bases[(path.stem, node.name)] = [
+                    base.id for base in node.bases if isinstance(base, ast.Name)
+                ]
+
+    def is_scene(class_name, module_name):
+        for base in bases.get((module_name, class_name), []):
+            if base == "BaseVisualization":
+                return True
+            # Scenes deriving from another scene of a (possibly different) module
+            if any(
+                is_scene(base, other_module)
+                for other_module, name in bases
+                if name == base
+            ):
+                return True
+        return False
+
+    return [
+        (module_name, class_name)
+        for module_name, class_name in bases
+        if is_scene(class_name, module_name)
+    ]
+
+
+def render_scene(module_name, scene_name, quality, media_dir):
+    """
+    Renders a single scene in the current process.
+
+    Each worker process writes to its own media directory so partial movie files
+    never collide, and the finished movie is copied into the shared media directory.
+    """
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+        worker_dir = Path(media_dir) / "workers" / f"worker_{os.getpid()}"
+        with tempconfig(
+            {
+                "media_dir": str(worker_dir),
+                "input_file": module.__file__,
+                "quality": quality,
+            }
+        ):
+            scene = getattr(module, scene_name)()
+            scene.render()
+            movie = Path(scene.renderer.file_writer.movie_file_path)
+
+        output = Path(media_dir) / movie.relative_to(worker_dir)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(movie, output)
+        return RenderResult(
+            scene_name, True, time.perf_counter() - start, str(output), None
+        )
+    except Exception:
+        return RenderResult(
+            scene_name,
+            False,
+            time.perf_counter() - start,
+            None,
+            traceback.format_exc(),
+        )
+
+
+def render_all(scenes, quality, workers=None, media_dir=None):
+    """
+    Renders scenes in a pool of worker processes, yielding results as they finish.
+    """
+    from manim import config
+
+    media_dir = str(Path(media_dir or config.media_dir).resolve())
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(render_scene, module_name, scene_name, quality, media_dir)
+            for module_name, scene_name in scenes
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help="scene names, all when omitted")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="defaults to CPU count"
+    )
+    parser.add_argument("--media_dir", default=None)
+    parser.add_argument(
+        "--list", action="store_true", help="only list the scenes that would render"
+    )
+    args = parser.parse_args(argv)
+
+    scenes = find_scenes()
+    if args.scenes:
+        unknown = set(args.scenes) - {scene_name for _, scene_name in scenes}
+        if unknown:
+            parser.error(f"unknown scenes: {', '.join(sorted(unknown))}")
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    if args.list:
+        for module_name, scene_name in scenes:
+            print(f"{module_name}.py {scene_name}")
+        return 0
+
+    start = time.perf_counter()
+    failed = []
+    for result in render_all(
+        scenes, QUALITIES[args.quality], args.workers, args.media_dir
+    ):
+        status = "ok" if result.success else "FAILED"
+        print(f"{result.scene_name:<24} {result.duration:8.2f}s  {status}")
+        if not result.success:
+            failed.append(result)
+
+    print(f"Rendered {len(scenes)} scenes in {time.perf_counter() - start:.2f}s")
+    for result in failed:
+        print(f"\n{result.scene_name} failed:\n{result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Renders the jobs of a JSONL manifest, skipping jobs that were already rendered.
+
+    python render_batch.py jobs.jsonl -j 4
+
+Every line of the manifest is a job such as
+
+    {"scene": "KMPAlgorithm", "text": "ABABDABACDABABCABAB", "pattern": "ABABCABAB",
+     "quality": "l"}
+
+where text, pattern and quality are optional. Outputs are named after a digest of
+the scene's source code, inputs and quality, so running a manifest again only
+renders the jobs whose scene or inputs changed.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from render_all import QUALITIES, RenderResult, find_scenes
+
+Job = namedtuple("Job", ["module_name", "scene_name", "text", "pattern", "quality"])
+
+
+def read_manifest(path, scenes):
+    """
+    Parses the jobs of a manifest, resolving each scene name to its module.
+    """
+    modules = {scene_name: module_name for module_name, scene_name in scenes}
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            scene_name = entry["scene"]
+            if scene_name not in modules:
+                raise ValueError(f"{path}:{line_number}: unknown scene {scene_name}")
+            quality = entry.get("quality", "l")
+            if quality not in QUALITIES:
+                raise ValueError(f"{path}:{line_number}: unknown quality {quality}")
+            jobs.append(
+                Job(
+                    modules[scene_name],
+                    scene_name,
+                    entry.get("text"),
+                    entry.get("pattern"),
+                    QUALITIES[quality],
+                )
+            )
+    return jobs
+
+
+def job_scene_class(job):
+    module = importlib.import_module(job.module_name)
+    return module, getattr(module, job.scene_name).with_inputs(job.text, job.pattern)
+
+
+def job_output(job, media_dir):
+    """
+    Returns the content-addressed path of the movie of a job.
+    """
+    from manim import config, tempconfig
+
+    _, scene_class = job_scene_class(job)
+    with tempconfig({"quality": job.quality}):
+        render_key = scene_class.render_key()
+        extension = config.movie_file_extension
+    return Path(media_dir) / "batch" / f"{job.scene_name}_{render_key}{extension}"
+
+
+def render_job(job, output, media_dir):
+    """
+    Renders a job in the current process and moves its movie to output.
+    """
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    try:
+        module, scene_class = job_scene_class(job)
+        worker_dir = Path(media_dir) / "workers" / f"worker_{os.getpid()}"
+        with tempconfig(
+            {
+                "media_dir": str(worker_dir),
+                "input_file": module.__file__,
+                "quality": job.quality,
+            }
+        ):
+            scene = scene_class()
+            scene.render()
+            movie = Path(scene.renderer.file_writer.movie_file_path)
+
+        # Only complete movies ever appear under their final name
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        temporary = output.with_name(f"{output.stem}.{os.getpid()}.tmp{output.suffix}")
+        shutil.copyfile(movie, temporary)
+        os.replace(temporary, output)
+        return RenderResult(
+            job.scene_name, True, time.perf_counter() - start, str(output), None
+        )
+    except Exception:
+        return RenderResult(
+            job.scene_name,
+            False,
+            time.perf_counter() - start,
+            None,
+            traceback.format_exc(),
+        )
+
+
+def render_batch(jobs, workers=None, media_dir=None):
+    """
+    Renders the jobs without an existing output in a pool of worker processes.
+
+    Yields (job, result) as jobs finish, with a None result for skipped jobs.
+    """
+    from manim import config
+
+    media_dir = str(Path(media_dir or config.media_dir).resolve())
+    outputs = {}
+    for job in jobs:
+        output = job_output(job, media_dir)
+        if output.exists() or output in outputs.values():
+            yield job, None
+        else:
+            outputs[job] = output
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(render_job, job, output, media_dir): job
+            for job, output in outputs.items()
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("manifest", help="JSONL file with one job per line")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="defaults to CPU count"
+    )
+    parser.add_argument("--media_dir", default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = read_manifest(args.manifest, find_scenes())
+    except (ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    failed = []
+    rendered = 0
+    for job, result in render_batch(jobs, args.workers, args.media_dir):
+        if result is None:
+            print(f"{job.scene_name:<24} {'':>9}  skipped, already rendered")
+            continue
+        status = "ok" if result.success else "FAILED"
+        print(f"{job.scene_name:<24} {result.duration:8.2f}s  {status}")
+        rendered += 1
+        if not result.success:
+            failed.append(result)
+
+    print(
+        f"Rendered {rendered} of {len(jobs)} jobs "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    for result in failed:
+        print(f"\n{result.scene_name} failed:\n{result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,485 @@
+"""
+Serves renders of the visualizations over HTTP, for use without a shell.
+
+    python render_service.py serve --port 8765 -j 2
+    python render_service.py submit KMPAlgorithm --text ABABDABACDABABCABAB \\
+        --pattern ABABCABAB --wait --output kmp.mp4
+    python render_service.py metrics
+
+The service only uses the standard library and listens on localhost by default.
+Requests are queued and rendered by a bounded pool of worker processes. A
+request identical to one still queued or rendering joins it instead of being
+rendered again, and movies already rendered are served from media_dir/batch,
+named like the outputs of render_batch.py.
+
+    POST /render            {"scene": ..., "text": ..., "pattern": ..., "quality": "l"}
+    GET  /jobs/<id>?wait=30 status of a job, waiting up to 30s for it to finish
+    GET  /movies/<name>     movie of a finished job
+    GET  /metrics           queue depth, job counts and latency summaries
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from render_all import QUALITIES, find_scenes
+from render_batch import Job, job_output, render_job
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+# Longer inputs take too long to render for a request made from a browser form
+MAX_INPUT_LENGTH = 200
+MAX_BODY_BYTES = 64 * 1024
+# Number of recent jobs the latency summaries are computed over
+LATENCY_WINDOW = 1000
+
+STATUS_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class ServiceError(Exception):
+    """
+    An error answered with the given HTTP status and a JSON error message.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class JobState:
+    """
+    A job submitted to the service, shared by all identical requests.
+    """
+
+    def __init__(self, job, output):
+        self.job = job
+        self.output = output
+        self.status = "queued"
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = asyncio.Event()
+
+    @property
+    def id(self):
+        return self.output.name
+
+    def to_dict(self):
+        state = {
+            "id": self.id,
+            "scene": self.job.scene_name,
+            "status": self.status,
+        }
+        if self.status == "done":
+            state["url"] = f"/movies/{self.id}"
+        if self.error is not None:
+            state["error"] = self.error
+        return state
+
+
+def summarize(values):
+    """
+    Returns the count, mean, median, 95th percentile and maximum of the values.
+    """
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class RenderService:
+    """
+    Queues render jobs and runs them on a pool of worker processes.
+    """
+
+    def __init__(self, media_dir=None, workers=2, queue_size=64, scenes=None):
+        if media_dir is None:
+            # Where render_batch.py writes its outputs too
+            from manim import config
+
+            media_dir = config.media_dir
+        self.media_dir = str(Path(media_dir).resolve())
+        self.workers = workers
+        scenes = find_scenes() if scenes is None else scenes
+        self.modules = {scene_name: module_name for module_name, scene_name in scenes}
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        # Jobs by id, kept after they finish so their status can be looked up
+        self.jobs = {}
+        # Workers are spawned, forking a process running an event loop is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        # Render keys read the global manim config, so compute them one at a time
+        self.key_executor = ThreadPoolExecutor(max_workers=1)
+        self.counts = dict.fromkeys(
+            [
+                "submitted",
+                "deduplicated",
+                "cache_hits",
+                "rejected",
+                "completed",
+                "failed",
+            ],
+            0,
+        )
+        self.render_seconds = deque(maxlen=LATENCY_WINDOW)
+        self.wait_seconds = deque(maxlen=LATENCY_WINDOW)
+        self.worker_tasks = []
+        # Port the service listens on once it is serving, e.g. when started on 0
+        self.port = None
+
+    def parse_job(self, body):
+        """
+        Validates the JSON body of a render request and returns its Job.
+        """
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise ServiceError(400, "request body is not valid JSON")
+        if not isinstance(request, dict):
+            raise ServiceError(400, "request body must be a JSON object")
+        scene_name = request.get("scene")
+        if scene_name not in self.modules:
+            raise ServiceError(400, f"unknown scene {scene_name!r}")
+        for name in ("text", "pattern"):
+            value = request.get(name)
+            if value is not None and not isinstance(value, str):
+                raise ServiceError(400, f"{name} must be a string")
+            if value is not None and not 0 < len(value) <= MAX_INPUT_LENGTH:
+                raise ServiceError(
+                    400, f"{name} must be 1 to {MAX_INPUT_LENGTH} characters long"
+                )
+        quality = request.get("quality", "l")
+        if quality not in QUALITIES:
+            raise ServiceError(400, f"unknown quality {quality!r}")
+        return Job(
+            self.modules[scene_name],
+            scene_name,
+            request.get("text"),
+            request.get("pattern"),
+            QUALITIES[quality],
+        )
+
+    async def submit(self, job):
+        """
+        Returns the state of a job, queueing it unless it is already known.
+        """
+        loop = asyncio.get_running_loop()
+        output = await loop.run_in_executor(
+            self.key_executor, job_output, job, self.media_dir
+        )
+        self.counts["submitted"] += 1
+        state = self.jobs.get(output.name)
+        if state is not None and state.status in ("queued", "rendering"):
+            self.counts["deduplicated"] += 1
+            return state
+        if output.exists():
+            self.counts["cache_hits"] += 1
+            if state is None or state.status != "done":
+                state = JobState(job, output)
+                state.status = "done"
+                state.finished.set()
+                self.jobs[state.id] = state
+            return state
+
+        # New jobs and failed ones, which are retried
+        state = JobState(job, output)
+        try:
+            self.queue.put_nowait(state)
+        except asyncio.QueueFull:
+            self.counts["rejected"] += 1
+            raise ServiceError(503, "render queue is full, try again later")
+        self.jobs[state.id] = state
+        return state
+
+    async def worker(self):
+        """
+        Renders queued jobs one at a time in the process pool.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            state = await self.queue.get()
+            state.status = "rendering"
+            state.started = time.monotonic()
+            self.wait_seconds.append(state.started - state.submitted)
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, render_job, state.job, state.output, self.media_dir
+                )
+                success, error = result.success, result.error
+            except Exception as e:
+                # E.g. a worker process that crashed and broke the pool
+                success, error = False, f"{type(e).__name__}: {e}"
+            self.render_seconds.append(time.monotonic() - state.started)
+            state.status = "done" if success else "failed"
+            state.error = error
+            self.counts["completed" if success else "failed"] += 1
+            state.finished.set()
+            self.queue.task_done()
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "rendering": sum(
+                1 for state in self.jobs.values() if state.status == "rendering"
+            ),
+            "workers": self.workers,
+            **self.counts,
+            "render_seconds": summarize(self.render_seconds),
+            "wait_seconds": summarize(self.wait_seconds),
+        }
+
+    async def job_status(self, job_id, query):
+        state = self.jobs.get(job_id)
+        if state is None:
+            raise ServiceError(404, f"unknown job {job_id!r}")
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            raise ServiceError(400, "wait must be a number of seconds")
+        if wait > 0:
+            try:
+                await asyncio.wait_for(state.finished.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+        return state.to_dict()
+
+    async def movie(self, name):
+        path = Path(self.media_dir) / "batch" / name
+        if Path(name).name != name or not path.is_file():
+            raise ServiceError(404, f"unknown movie {name!r}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, path.read_bytes)
+
+    async def route(self, method, target, body):
+        """
+        Handles a request, returning its status, content type and body.
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+        expected = "POST" if parts == ["render"] else "GET"
+        if method != expected:
+            raise ServiceError(405, f"{url.path} only accepts {expected}")
+
+        if parts == ["render"]:
+            state = await self.submit(self.parse_job(body))
+            status = 200 if state.status == "done" else 202
+            return status, "application/json", state.to_dict()
+        if parts == ["metrics"]:
+            return 200, "application/json", self.metrics()
+        if len(parts) == 2 and parts[0] == "jobs":
+            return 200, "application/json", await self.job_status(parts[1], query)
+        if len(parts) == 2 and parts[0] == "movies":
+            return 200, "video/mp4", await self.movie(parts[1])
+        raise ServiceError(404, f"unknown path {url.path}")
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answers a single HTTP/1.1 request, then closes the connection.
+        """
+        try:
+            try:
+                request_line = await reader.readline()
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    raise ServiceError(413, "request body is too large")
+                body = await reader.readexactly(length) if length else b""
+                status, content_type, payload = await self.route(method, target, body)
+            except ServiceError as e:
+                status, content_type, payload = (
+                    e.status,
+                    "application/json",
+                    {"error": str(e)},
+                )
+            except (ValueError, asyncio.IncompleteReadError):
+                status, content_type, payload = (
+                    400,
+                    "application/json",
+                    {"error": "malformed HTTP request"},
+                )
+            except Exception as e:
+                # E.g. a scene module that fails to import when computing its key
+                status, content_type, payload = (
+                    500,
+                    "application/json",
+                    {"error": f"{type(e).__name__}: {e}"},
+                )
+
+            if content_type == "application/json":
+                payload = json.dumps(payload).encode()
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """
+        Starts the workers and answers requests until cancelled.
+        """
+        self.worker_tasks = [
+            asyncio.create_task(self.worker()) for _ in range(self.workers)
+        ]
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in self.worker_tasks:
+                task.cancel()
+            self.executor.shutdown(cancel_futures=True)
+            self.key_executor.shutdown()
+
+
+class RenderClient:
+    """
+    A client of the render service, e.g. for exercising it from a test script.
+    """
+
+    def __init__(self, url=DEFAULT_URL, timeout=60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, payload=None):
+        """
+        Makes a request, returning the HTTP status and the decoded JSON response.
+        """
+        data = None if payload is None else json.dumps(payload).encode()
+        request = urllib.request.Request(
+            self.url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            with e:
+                return e.code, json.load(e)
+
+    def submit(self, scene, text=None, pattern=None, quality="l"):
+        payload = {"scene": scene, "quality": quality}
+        if text is not None:
+            payload["text"] = text
+        if pattern is not None:
+            payload["pattern"] = pattern
+        return self.request("POST", "/render", payload)
+
+    def status(self, job_id, wait=0):
+        return self.request("GET", f"/jobs/{job_id}?wait={wait}")
+
+    def wait(self, job_id, timeout=600):
+        """
+        Waits for a job to finish, returning its final state.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            _, state = self.status(job_id, wait=max(0, min(30, remaining)))
+            if state.get("status") not in ("queued", "rendering") or remaining <= 0:
+                return state
+
+    def download(self, state, path):
+        """
+        Saves the movie of a finished job to path.
+        """
+        url = self.url + state["url"]
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            Path(path).write_bytes(response.read())
+
+    def metrics(self):
+        return self.request("GET", "/metrics")[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("-j", "--workers", type=int, default=2)
+    serve.add_argument("--queue-size", type=int, default=64)
+    serve.add_argument("--media_dir", default=None, help="manim's media_dir by default")
+
+    submit = commands.add_parser("submit", help="request a render")
+    submit.add_argument("scene")
+    submit.add_argument("--text", default=None)
+    submit.add_argument("--pattern", default=None)
+    submit.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    submit.add_argument("--wait", action="store_true", help="wait for the movie")
+    submit.add_argument("--output", default=None, help="save the movie, with --wait")
+    submit.add_argument("--url", default=DEFAULT_URL)
+
+    metrics = commands.add_parser("metrics", help="print the service metrics")
+    metrics.add_argument("--url", default=DEFAULT_URL)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        service = RenderService(args.media_dir, args.workers, args.queue_size)
+        print(f"Serving renders on http://{args.host}:{args.port}")
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    client = RenderClient(args.url)
+    if args.command == "metrics":
+        print(json.dumps(client.metrics(), indent=2))
+        return 0
+
+    status, state = client.submit(args.scene, args.text, args.pattern, args.quality)
+    if args.wait and "id" in state:
+        state = client.wait(state["id"])
+    print(json.dumps(state, indent=2))
+    if args.output and state.get("status") == "done":
+        client.download(state, args.output)
+    return 0 if status < 400 and state.get("status") != "failed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
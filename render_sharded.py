@@ -0,0 +1,179 @@
+"""
+Renders a single long visualization by splitting it into shards at algorithm steps.
+
+    python render_sharded.py boyer_moore BoyerMooreAlgorithm -q l -j 8
+
+Every shard re-runs the scene up to its first play call without drawing any
+frames, which rebuilds the algorithm state at that point, then renders only its
+own range of play calls. The shard movies are joined without re-encoding.
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+
+from render_all import QUALITIES
+from utils.base_visualization import SKIP_ALL_PLAYS
+
+
+def find_step_boundaries(module_name, scene_name, quality):
+    """
+    Runs the scene without rendering any frames.
+
+    Returns the play call index at which each algorithm step starts and the total
+    number of play calls in the scene.
+    """
+    module = importlib.import_module(module_name)
+    with tempconfig(
+        {
+            "input_file": module.__file__,
+            "quality": quality,
+            "from_animation_number": SKIP_ALL_PLAYS,
+            "write_to_movie": False,
+        }
+    ):
+        scene = getattr(module, scene_name)()
+        scene.render()
+    return scene.step_boundaries, scene.renderer.num_plays
+
+
+def plan_shards(step_boundaries, total_plays, shard_count):
+    """
+    Splits the play calls into at most shard_count contiguous (start, end) ranges.
+
+    Ranges are only cut where an algorithm step starts and hold roughly the same
+    number of play calls each.
+    """
+    # manim treats an animation number of 0 as unset, so never end a shard at play 0
+    cuts = sorted({b for b in step_boundaries if 1 < b < total_plays})
+    target = total_plays / shard_count
+
+    shards = []
+    start = 0
+    for cut in cuts:
+        if cut - start >= target and len(shards) < shard_count - 1:
+            shards.append((start, cut))
+            start = cut
+    shards.append((start, total_plays))
+    return shards
+
+
+def render_shard(module_name, scene_name, quality, media_dir, index, start, end):
+    """
+    Renders play calls start up to end (exclusive) of the scene into its own movie.
+    """
+    module = importlib.import_module(module_name)
+    shard_dir = Path(media_dir) / "shards" / scene_name / f"shard_{index:03}"
+    overrides = {
+        "media_dir": str(shard_dir),
+        "input_file": module.__file__,
+        "quality": quality,
+        "from_animation_number": start,
+    }
+    if end is not None:
+        overrides["upto_animation_number"] = end - 1
+
+    with tempconfig(overrides):
+        scene = getattr(module, scene_name)()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_movies(movies, output):
+    """
+    Joins movies encoded with the same settings into one, without re-encoding them.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".txt")
+    file_list.write_text("".join(f"file '{Path(m).as_posix()}'\n" for m in movies))
+    subprocess.run(
+        [
+            config.ffmpeg_executable,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(file_list),
+            "-c",
+            "copy",
+            str(output),
+        ],
+        check=True,
+    )
+    file_list.unlink()
+    return output
+
+
+def render_sharded(module_name, scene_name, quality, workers=None, media_dir=None):
+    """
+    Renders the scene in shards across worker processes and joins the result.
+    """
+    media_dir = Path(media_dir or config.media_dir).resolve()
+    workers = workers or os.cpu_count()
+
+    step_boundaries, total_plays = find_step_boundaries(
+        module_name, scene_name, quality
+    )
+    shards = plan_shards(step_boundaries, total_plays, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                render_shard,
+                module_name,
+                scene_name,
+                quality,
+                media_dir,
+                index,
+                start,
+                # The last shard also renders anything played after the final step
+                end if index < len(shards) - 1 else None,
+            )
+            for index, (start, end) in enumerate(shards)
+        ]
+        movies = [future.result() for future in futures]
+
+    output = media_dir / "videos" / module_name / "sharded" / f"{scene_name}.mp4"
+    return concat_movies(movies, output), shards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", help="module of the scene, e.g. boyer_moore")
+    parser.add_argument("scene", help="scene name, e.g. BoyerMooreAlgorithm")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="defaults to CPU count"
+    )
+    parser.add_argument("--media_dir", default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    output, shards = render_sharded(
+        Path(args.module).stem,
+        args.scene,
+        QUALITIES[args.quality],
+        args.workers,
+        args.media_dir,
+    )
+    print(
+        f"Rendered {args.scene} in {len(shards)} shards "
+        f"in {time.perf_counter() - start:.2f}s: {output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
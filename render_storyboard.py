@@ -0,0 +1,67 @@
+"""
+Renders a storyboard of a visualization: one still per algorithm step.
+
+    python render_storyboard.py boyer_moore BoyerMooreAlgorithm -q l
+    python render_storyboard.py kmp_text_search KMPAlgorithm --text ABABDABACDABABCABAB
+
+No animation is interpolated and no movie is written. The last frame of every
+step is saved as a PNG into media/storyboards/<SceneName>, next to an index.html
+contact sheet describing each step.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+from manim import tempconfig
+
+from render_all import QUALITIES
+
+
+def render_storyboard(
+    module_name, scene_name, quality, media_dir=None, text=None, pattern=None
+):
+    """
+    Renders the storyboard of a scene, returning the path of its contact sheet.
+    """
+    module = importlib.import_module(module_name)
+    overrides = {
+        "input_file": module.__file__,
+        "quality": quality,
+        "write_to_movie": False,
+    }
+    if media_dir is not None:
+        overrides["media_dir"] = media_dir
+    with tempconfig(overrides):
+        scene_class = getattr(module, scene_name).with_inputs(text, pattern)
+        scene = scene_class(storyboard=True)
+        scene.render()
+    return scene.storyboard.index_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", help="module of the scene, e.g. boyer_moore")
+    parser.add_argument("scene", help="scene class name, e.g. BoyerMooreAlgorithm")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--media_dir", default=None)
+    parser.add_argument("--text", default=None, help="overrides the scene's text")
+    parser.add_argument("--pattern", default=None, help="overrides the scene's pattern")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index_path = render_storyboard(
+        args.module,
+        args.scene,
+        QUALITIES[args.quality],
+        args.media_dir,
+        args.text,
+        args.pattern,
+    )
+    print(f"Wrote {index_path} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
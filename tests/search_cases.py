@@ -0,0 +1,30 @@
+"""
+Inputs and brute-force results shared by the search tests.
+"""
+
+import random
+
+
+def occurrences(text, pattern):
+    """
+    Returns the start of every occurrence of the pattern, found with str.find.
+    """
+    found = []
+    start = text.find(pattern)
+    while start != -1:
+        found.append(start)
+        start = text.find(pattern, start + 1)
+    return found
+
+
+def random_cases(count, seed=0):
+    """
+    Yields random texts and patterns over small alphabets, so that they share
+    many partial matches.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.choice(["ab", "abc", "abcd"])
+        text = "".join(rng.choices(alphabet, k=rng.randrange(0, 40)))
+        pattern = "".join(rng.choices(alphabet, k=rng.randrange(1, 6)))
+        yield text, pattern
@@ -0,0 +1,127 @@
+import io
+import random
+
+import pytest
+
+from algorithms.aho_corasick import (
+    ROOT,
+    AhoCorasickAutomaton,
+    aho_corasick_build_trace,
+    aho_corasick_find_all,
+    aho_corasick_search_trace,
+)
+from algorithms.core import naive_find_all
+from algorithms.text_source import TextSource
+from algorithms.trace import Found, TableWrite
+
+
+def expected_occurrences(text, patterns):
+    """
+    Returns (start, pattern index) of every occurrence found with one naive search
+    per pattern, ordered by end, longest first, like the automaton reports them.
+    """
+    found = [
+        (start, index)
+        for index, pattern in enumerate(patterns)
+        for start in naive_find_all(text, pattern)
+    ]
+    return sorted(found, key=lambda o: (o[0] + len(patterns[o[1]]), o[0], o[1]))
+
+
+def random_patterns(count, seed=0):
+    """
+    Yields random texts with random sets of patterns, some of them repeated.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.choice(["ab", "abc", "abcd"])
+        text = "".join(rng.choices(alphabet, k=rng.randrange(0, 40)))
+        patterns = [
+            "".join(rng.choices(alphabet, k=rng.randrange(1, 5)))
+            for _ in range(rng.randrange(1, 6))
+        ]
+        yield text, patterns
+
+
+def spelled(automaton, state):
+    codes = []
+    while state != ROOT:
+        codes.append(automaton.character[state])
+        state = automaton.parent[state]
+    return bytes(reversed(codes))
+
+
+def test_finds_every_occurrence():
+    for text, patterns in random_patterns(500):
+        found = list(aho_corasick_find_all(text, patterns))
+        assert found == expected_occurrences(text, patterns), (text, patterns)
+
+
+def test_scan_across_chunk_boundaries():
+    rng = random.Random(1)
+    for text, patterns in random_patterns(300, seed=2):
+        automaton = AhoCorasickAutomaton(patterns)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(3, len(text) + 1)))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert list(automaton.scan(chunks)) == list(automaton.find_all(text))
+
+
+def test_duplicate_and_empty_patterns():
+    patterns = ["ab", "", "ab", "b"]
+    found = list(aho_corasick_find_all("abab", patterns))
+    assert found == expected_occurrences("abab", patterns)
+    assert (0, 0) in found and (0, 2) in found
+    assert [start for start, index in found if index == 1] == [0, 1, 2, 3, 4]
+
+
+def test_bytes_and_no_patterns():
+    assert list(aho_corasick_find_all(b"abcbc", [b"bc"])) == [(1, 0), (3, 0)]
+    assert list(aho_corasick_find_all("abc", [])) == []
+
+
+def test_failure_links_are_longest_proper_suffixes():
+    for _, patterns in random_patterns(200, seed=3):
+        automaton = AhoCorasickAutomaton(patterns)
+        for state in range(1, automaton.state_count):
+            string = spelled(automaton, state)
+            # Longest proper suffix that is also a prefix of some pattern
+            for start in range(1, len(string) + 1):
+                target = automaton.state_of(string[start:])
+                if target != -1:
+                    break
+            assert automaton.fail[state] == target
+
+
+def test_build_trace_writes_the_failure_links():
+    for _, patterns in random_patterns(200, seed=4):
+        automaton = AhoCorasickAutomaton(patterns)
+        writes = [
+            event
+            for event in aho_corasick_build_trace(automaton)
+            if isinstance(event, TableWrite)
+        ]
+        assert sorted(writes) == [
+            TableWrite(state, automaton.fail[state])
+            for state in range(1, automaton.state_count)
+        ]
+
+
+@pytest.mark.parametrize("source", [False, True])
+def test_search_trace_finds_every_occurrence(source):
+    for text, patterns in random_patterns(300, seed=5):
+        automaton = AhoCorasickAutomaton(patterns)
+        searched = (
+            TextSource(io.BytesIO(text.encode()), chunk_size=4) if source else text
+        )
+        found = [
+            (event.position, event.pattern)
+            for event in aho_corasick_search_trace(searched, automaton)
+            if isinstance(event, Found)
+        ]
+        assert found == list(automaton.find_all(text)), (text, patterns)
+
+
+def test_search_trace_stops_at_first_occurrence():
+    automaton = AhoCorasickAutomaton(["he", "she", "his", "hers"])
+    trace = aho_corasick_search_trace("ahishers", automaton, find_all=False)
+    assert [event for event in trace if isinstance(event, Found)] == [Found(1, 2)]
@@ -0,0 +1,148 @@
+import pytest
+
+from algorithms.boyer_moore import SHIFT_RULES, boyer_moore_search_trace
+from algorithms.core import bad_character_table, last_occurrence
+from algorithms.counters import count_operations
+from algorithms.trace import Compare, Found, GalilSkip, Match, Mismatch, Shift
+from benchmarks.periodic import periodic_case
+from tests.search_cases import occurrences, random_cases
+
+VARIANTS = [(rule, False) for rule in SHIFT_RULES] + [("boyer_moore", True)]
+
+
+def found_positions(trace):
+    return [event.position for event in trace if isinstance(event, Found)]
+
+
+def replay(text, pattern, rule, galil):
+    """
+    Replays a find-all trace the way the scene does, checking every event against
+    the window it belongs to, and returns the shifts with the window they left.
+    """
+    m = len(pattern)
+    i = 0
+    # Pattern index the scene expects next, matching goes from the end
+    j = m - 1
+    shifts = []
+    trace = boyer_moore_search_trace(
+        text, pattern, rule=rule, galil=galil, find_all=True
+    )
+    for event in trace:
+        if isinstance(event, Compare):
+            assert event.text_index - event.pattern_index == i
+            assert event.pattern_index == j
+        elif isinstance(event, Match):
+            assert (event.text_index - i, event.pattern_index) == (j, j)
+            assert text[event.text_index] == pattern[j]
+            j -= 1
+        elif isinstance(event, Mismatch):
+            assert (event.text_index - i, event.pattern_index) == (j, j)
+            assert text[event.text_index] != pattern[j]
+        elif isinstance(event, GalilSkip):
+            assert galil
+            assert event.text_index - event.pattern_index == i
+            assert event.pattern_index + event.length - 1 == j
+            # The skipped pattern characters are known to match the text
+            known = pattern[event.pattern_index : j + 1]
+            assert text[event.text_index : event.text_index + event.length] == known
+            j = event.pattern_index - 1
+        elif isinstance(event, Found):
+            assert event.position == i and j == -1
+        elif isinstance(event, Shift):
+            assert event.value >= 1
+            assert event.position == i + event.value
+            shifts.append((i, event))
+            i, j = event.position, m - 1
+    return shifts
+
+
+@pytest.mark.parametrize("rule, galil", VARIANTS)
+def test_finds_every_occurrence(rule, galil):
+    for text, pattern in random_cases(500):
+        trace = boyer_moore_search_trace(
+            text, pattern, rule=rule, galil=galil, find_all=True
+        )
+        assert found_positions(trace) == occurrences(text, pattern), (text, pattern)
+
+
+@pytest.mark.parametrize("rule, galil", VARIANTS)
+def test_stops_at_first_occurrence(rule, galil):
+    for text, pattern in random_cases(500, seed=1):
+        trace = boyer_moore_search_trace(text, pattern, rule=rule, galil=galil)
+        found = found_positions(trace)
+        assert found == occurrences(text, pattern)[:1], (text, pattern)
+
+
+@pytest.mark.parametrize("rule, galil", VARIANTS)
+def test_trace_events_follow_the_window(rule, galil):
+    for text, pattern in random_cases(500, seed=6):
+        replay(text, pattern, rule, galil)
+
+
+def test_horspool_shifts():
+    for text, pattern in random_cases(500, seed=7):
+        m = len(pattern)
+        table = bad_character_table(pattern[:-1])
+        for start, shift in replay(text, pattern, "horspool", False):
+            # Looked up on the text character under the end of the window, leaving
+            # the last pattern character out of the table
+            code = ord(text[start + m - 1])
+            assert shift.bad_character == m - 1 - last_occurrence(table, code)
+            assert shift.value == shift.bad_character
+            assert shift.good_suffix is None
+
+
+def test_sunday_shifts():
+    for text, pattern in random_cases(500, seed=8):
+        m = len(pattern)
+        table = bad_character_table(pattern)
+        for start, shift in replay(text, pattern, "sunday", False):
+            # Looked up on the text character just after the window
+            code = ord(text[start + m])
+            assert shift.bad_character == m - last_occurrence(table, code)
+            assert shift.value == shift.bad_character
+            assert shift.good_suffix is None
+            if text[start + m] not in pattern:
+                assert shift.value == m + 1
+
+
+def test_galil_skips_only_matched_text():
+    skips = 0
+    for text, pattern in random_cases(500, seed=9):
+        trace = list(boyer_moore_search_trace(text, pattern, galil=True, find_all=True))
+        skips += sum(isinstance(event, GalilSkip) for event in trace)
+        plain = boyer_moore_search_trace(text, pattern, find_all=True)
+        # The rule only changes what is compared, never where the pattern goes
+        assert [e for e in trace if isinstance(e, Shift)] == [
+            e for e in plain if isinstance(e, Shift)
+        ]
+    assert skips > 0
+
+
+def test_unknown_rule():
+    with pytest.raises(ValueError):
+        list(boyer_moore_search_trace("abc", "b", rule="unknown"))
+
+
+@pytest.mark.parametrize(
+    "algorithm, comparisons",
+    [
+        ("boyer_moore", 319008),
+        ("horspool", 319008),
+        ("sunday", 319008),
+        ("boyer_moore_galil", 10000),
+    ],
+)
+def test_periodic_comparisons(algorithm, comparisons):
+    text, pattern = periodic_case(10000, 32, "a")
+    counts = count_operations(algorithm, text, pattern, find_all=True)
+    assert counts.matches == len(text) - len(pattern) + 1
+    assert counts.comparisons == comparisons
+
+
+@pytest.mark.parametrize("period", ["a", "ab", "aab"])
+def test_galil_rule_is_linear(period):
+    for size in (1000, 10000):
+        text, pattern = periodic_case(size, 32, period)
+        counts = count_operations("boyer_moore_galil", text, pattern, find_all=True)
+        assert counts.comparisons <= 2 * size
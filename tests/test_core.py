@@ -0,0 +1,65 @@
+import pytest
+
+from algorithms.core import (
+    bad_character_table,
+    bad_character_tables,
+    boyer_moore_find_all,
+    find,
+    good_suffix_table,
+    kmp_find_all,
+    lps_table,
+    naive_find_all,
+)
+from tests.search_cases import occurrences, random_cases
+
+FIND_ALLS = [naive_find_all, kmp_find_all, boyer_moore_find_all]
+
+
+@pytest.mark.parametrize("find_all", FIND_ALLS)
+def test_finds_every_occurrence(find_all):
+    for text, pattern in random_cases(500, seed=2):
+        assert list(find_all(text, pattern)) == occurrences(text, pattern)
+
+
+@pytest.mark.parametrize("find_all", FIND_ALLS)
+def test_finds_in_bytes_and_wide_characters(find_all):
+    assert list(find_all(b"abcabc", b"bc")) == [1, 4]
+    assert list(find_all(bytearray(b"aaa"), "aa")) == [0, 1]
+    assert list(find_all(memoryview(b"abab"), b"ab")) == [0, 2]
+    assert list(find_all("x☃y☃", "☃")) == [1, 3]
+
+
+@pytest.mark.parametrize("find_all", [kmp_find_all, boyer_moore_find_all])
+def test_empty_pattern(find_all):
+    assert list(find_all("abc", "")) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("find_all", FIND_ALLS)
+def test_find_matches_str_find(find_all):
+    for text, pattern in random_cases(200, seed=3):
+        assert find(text, pattern, find_all) == text.find(pattern)
+
+
+def test_lps_table():
+    assert list(lps_table("ABABCABAB")) == [0, 0, 1, 2, 0, 1, 2, 3, 4]
+    assert list(lps_table("aaaa")) == [0, 1, 2, 3]
+
+
+def test_bad_character_table():
+    table = bad_character_table("abca")
+    assert table[ord("a")] == 3
+    assert table[ord("c")] == 2
+    assert table[ord("d")] == -1
+
+
+def test_bad_character_tables():
+    patterns = ["abca", "bb", "c"]
+    tables = bad_character_tables(patterns)
+    for pattern, table in zip(patterns, tables):
+        assert list(table) == list(bad_character_table(pattern, len(table)))
+
+
+def test_good_suffix_table():
+    # Shifting by the period of a periodic pattern keeps its matched suffix aligned
+    assert good_suffix_table("abab")[0] == 2
+    assert good_suffix_table("abcd")[0] == 4
@@ -0,0 +1,41 @@
+import pytest
+
+from algorithms.counters import SEARCH_TRACES, OperationCounter, count_operations
+from algorithms.trace import Compare, WindowHash
+from tests.search_cases import random_cases
+
+
+def read_indices(trace, pattern_length):
+    """
+    Returns every text index the trace reads, with the counter's rules.
+    """
+    read = set()
+    for event in trace:
+        if isinstance(event, Compare):
+            read.add(event.text_index)
+        elif isinstance(event, WindowHash):
+            end = event.position + pattern_length
+            read.update(range(0 if event.position == 0 else end - 1, end))
+    return read
+
+
+@pytest.mark.parametrize("algorithm", sorted(SEARCH_TRACES))
+def test_skipped_counts_unread_characters(algorithm):
+    for text, pattern in random_cases(200):
+        trace = SEARCH_TRACES[algorithm](text, pattern, find_all=True)
+        skipped = len(text) - len(read_indices(trace, len(pattern)))
+        counts = count_operations(algorithm, text, pattern, find_all=True)
+        assert counts.skipped == skipped, (text, pattern)
+
+
+@pytest.mark.parametrize("algorithm", sorted(SEARCH_TRACES))
+def test_reads_stay_bounded(algorithm):
+    text = "ab" * 5000
+    pattern = "abba"
+    counter = OperationCounter(len(pattern), find_all=True)
+    for event in SEARCH_TRACES[algorithm](text, pattern, find_all=True):
+        counter.update(event)
+        assert len(counter.recent_reads) <= 2 * len(pattern)
+    trace = SEARCH_TRACES[algorithm](text, pattern, find_all=True)
+    read = read_indices(trace, len(pattern))
+    assert counter.counts(len(text)).skipped == len(text) - len(read)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from algorithms import core
+from algorithms.core import (
+    HASH_BASE,
+    HASH_MODULUS,
+    modular_powers,
+    polynomial_hash,
+    rabin_karp_find_all,
+    roll_hash,
+    window_hashes,
+)
+from algorithms.rabin_karp import rabin_karp_search_trace
+from algorithms.trace import Compare, Found, Mismatch, Shift, WindowHash
+from tests.search_cases import occurrences, random_cases
+
+
+def test_roll_hash():
+    text = b"35906739923141526"
+    high_power = pow(10, 4, 13)
+    value = polynomial_hash(text[:5], 10, 13)
+    for i in range(1, len(text) - 4):
+        value = roll_hash(value, text[i - 1], text[i + 4], high_power, 10, 13)
+        assert value == polynomial_hash(text[i : i + 5], 10, 13)
+
+
+def test_modular_powers():
+    powers = modular_powers(7, 50, 101)
+    assert list(powers) == [pow(7, k, 101) for k in range(50)]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_window_hashes(monkeypatch, use_numpy):
+    if use_numpy and core.np is None:
+        pytest.skip("NumPy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(core, "np", None)
+    text = "".join(random.Random(4).choices("abc\xff", k=300))
+    for length in (0, 1, 5, 300, 301):
+        hashes = window_hashes(text, length)
+        expected = [
+            polynomial_hash(text[i : i + length].encode("latin-1"))
+            for i in range(len(text) - length + 1)
+        ]
+        assert list(hashes) == expected
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_find_all(monkeypatch, use_numpy):
+    if use_numpy and core.np is None:
+        pytest.skip("NumPy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(core, "np", None)
+    rng = random.Random(5)
+    text = "".join(rng.choices("ab", k=200))
+    patterns = ["abab", "bbbb", "aabb", "abab"]
+    # A tiny modulus makes most windows collide with the patterns
+    found = list(rabin_karp_find_all(text, patterns, base=10, modulus=7))
+    expected = sorted(
+        (start, index)
+        for index, pattern in enumerate(patterns)
+        for start in occurrences(text, pattern)
+    )
+    assert found == expected
+
+
+def test_find_all_pattern_lengths():
+    with pytest.raises(ValueError):
+        list(rabin_karp_find_all("abc", ["a", "ab"]))
+
+
+def test_trace_finds_every_occurrence():
+    for text, pattern in random_cases(500, seed=10):
+        trace = rabin_karp_search_trace(text, pattern, 10, 13, find_all=True)
+        found = [event.position for event in trace if isinstance(event, Found)]
+        assert found == occurrences(text, pattern), (text, pattern)
+
+
+def test_trace_hashes_every_window():
+    for text, pattern in random_cases(500, seed=11):
+        pattern_hash = polynomial_hash(pattern.encode(), 10, 13)
+        position = 0
+        verified = None
+        for event in rabin_karp_search_trace(text, pattern, 10, 13, find_all=True):
+            if isinstance(event, WindowHash):
+                assert event.position == position
+                window = text[position : position + len(pattern)].encode()
+                assert event.value == polynomial_hash(window, 10, 13)
+                verified = position if event.value == pattern_hash else None
+            elif isinstance(event, (Compare, Mismatch, Found)):
+                # Only windows with the hash of the pattern are compared
+                assert verified == position
+            elif isinstance(event, Shift):
+                assert (event.position, event.value) == (position + 1, 1)
+                position = event.position
+
+
+def test_trace_default_hash():
+    trace = rabin_karp_search_trace("abcab", "ab", HASH_BASE, HASH_MODULUS)
+    assert [event for event in trace if isinstance(event, Found)] == [Found(0)]
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import render_service
+from render_all import RenderResult
+from render_service import RenderClient, RenderService
+
+SCENES = [("kmp_text_search", "KMPAlgorithm")]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """
+    Serves on an ephemeral port, with renders that write a fake movie once the
+    test releases them.
+    """
+    release = threading.Event()
+
+    def job_output(job, media_dir):
+        return Path(media_dir) / "batch" / f"{job.scene_name}_{job.text}.mp4"
+
+    def render_job(job, output, media_dir):
+        release.wait(timeout=10)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(f"{job.text}/{job.pattern}".encode())
+        return RenderResult(job.scene_name, True, 0.0, str(output), None)
+
+    monkeypatch.setattr(render_service, "job_output", job_output)
+    monkeypatch.setattr(render_service, "render_job", render_job)
+    service = RenderService(tmp_path, workers=1, scenes=SCENES)
+    # Worker processes would import the real render_job
+    service.executor.shutdown()
+    service.executor = ThreadPoolExecutor(max_workers=1)
+    service.release = release
+
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(service.serve("127.0.0.1", 0))
+
+    def serve():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    try:
+        while service.port is None:
+            assert thread.is_alive()
+            threading.Event().wait(0.01)
+        service.client = RenderClient(f"http://127.0.0.1:{service.port}", timeout=10)
+        yield service
+    finally:
+        release.set()
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join()
+        loop.close()
+
+
+def test_deduplicates_jobs_in_flight(service):
+    client = service.client
+    status, first = client.submit("KMPAlgorithm", "ABAB", "AB")
+    assert status == 202 and first["status"] in ("queued", "rendering")
+    status, second = client.submit("KMPAlgorithm", "ABAB", "AB")
+    assert status == 202 and second["id"] == first["id"]
+
+    service.release.set()
+    state = client.wait(first["id"], timeout=10)
+    assert state["status"] == "done"
+    metrics = client.metrics()
+    assert metrics["submitted"] == 2
+    assert metrics["deduplicated"] == 1
+    assert metrics["completed"] == 1
+    assert metrics["render_seconds"]["count"] == 1
+
+
+def test_serves_rendered_movies_from_cache(service, tmp_path):
+    client = service.client
+    service.release.set()
+    _, state = client.submit("KMPAlgorithm", "ABAB", "AB")
+    state = client.wait(state["id"], timeout=10)
+
+    status, cached = client.submit("KMPAlgorithm", "ABAB", "AB")
+    assert status == 200
+    assert cached == state
+    movie = tmp_path / "movie.mp4"
+    client.download(cached, movie)
+    assert movie.read_bytes() == b"ABAB/AB"
+
+    metrics = client.metrics()
+    assert metrics["cache_hits"] == 1
+    assert metrics["completed"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_rejects_invalid_requests(service):
+    client = service.client
+    status, response = client.submit("NoSuchScene")
+    assert status == 400 and "unknown scene" in response["error"]
+    status, response = client.submit("KMPAlgorithm", quality="z")
+    assert status == 400
+    status, response = client.request("GET", "/jobs/missing")
+    assert status == 404
+    assert client.metrics()["submitted"] == 0
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from algorithms.boyer_moore import boyer_moore_search_trace
+from algorithms.kmp import kmp_search_trace
+from algorithms.text_source import TextSource, code_at, has_index
+from algorithms.trace import Found
+from tests.search_cases import occurrences
+
+TEXT = b"abracadabra" * 50
+
+
+def small_source(text=TEXT):
+    return TextSource(io.BytesIO(text), chunk_size=16, lookbehind=32)
+
+
+def test_reads_incrementally():
+    source = small_source()
+    assert source[0] == ord("a")
+    assert source.end == 16
+    assert source.length is None
+    assert source.chars(4, 11) == "cadabra"
+
+
+def test_length_known_at_end():
+    source = small_source()
+    assert has_index(source, len(TEXT) - 1)
+    assert not has_index(source, len(TEXT))
+    assert source.length == len(TEXT)
+    with pytest.raises(IndexError):
+        source[len(TEXT)]
+
+
+def test_discards_behind_lookbehind():
+    source = small_source()
+    assert source[400] == TEXT[400]
+    assert source[400 - 32] == TEXT[400 - 32]
+    assert source.start > 0
+    with pytest.raises(IndexError):
+        source[0]
+
+
+def test_code_at():
+    assert code_at("abc", 1) == ord("b")
+    assert code_at(b"abc", 1) == ord("b")
+    assert code_at(small_source(), 1) == ord("b")
+
+
+@pytest.mark.parametrize(
+    "search",
+    [
+        kmp_search_trace,
+        boyer_moore_search_trace,
+        lambda text, pattern, find_all: boyer_moore_search_trace(
+            text, pattern, rule="sunday", galil=False, find_all=find_all
+        ),
+    ],
+)
+def test_traces_match_in_memory(search):
+    for pattern in ("abra", "cad", "xyz", "a"):
+        trace = search(small_source(), pattern, find_all=True)
+        found = [event.position for event in trace if isinstance(event, Found)]
+        assert found == occurrences(TEXT.decode(), pattern)
+
+
+def test_buffer_stays_bounded():
+    source = small_source()
+    trace = kmp_search_trace(source, "abra", find_all=True)
+    for _ in trace:
+        assert len(source.buffer) <= source.lookbehind + 2 * source.chunk_size
+    assert source.length == len(TEXT)
@@ -1,4 +1,40 @@
-from manim import *
+import hashlib
+import inspect
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+from manim import (
+    BLUE,
+    DOWN,
+    GREEN,
+    RED,
+    UP,
+    WHITE,
+    YELLOW,
+    AnimationGroup,
+    LaggedStart,
+    Scene,
+    config,
+    logger,
+)
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.exceptions import EndSceneEarlyException
+
+from algorithms.text_source import TextSource
+from algorithms.trace import Found
+from utils.fonts import register_font_once
+from utils.match_overlay import MatchOverlay
+from utils.memory_profiler import StepMemoryProfiler
+from utils.play_profiler import PlayProfiler
+from utils.storyboard import Storyboard
+from utils.streaming_writer import StreamingFileWriter
+from utils.text_cache import cached_text, configure_text_disk_cache
+
+# Any play call index below this is skipped, so nothing gets rendered at all
+SKIP_ALL_PLAYS = sys.maxsize
 
 
 class BaseVisualization(Scene):
@@ -13,19 +49,457 @@ class BaseVisualization(Scene):
     MISMATCH_COLOR = RED
     ACCENT_COLOR = BLUE
 
-    def __init__(self, **kwargs):
+    # Inputs of the visualized algorithm, set by each scene
+    TEXT = ""
+    PATTERN = ""
+    # File searched instead of TEXT by scenes that can stream their text
+    TEXT_FILE = None
+    # Keep searching after a match, marking every occurrence in one overlay
+    FIND_ALL = False
+
+    # Draw the borders of each VisualArray as one path, with one mobject per cell
+    COMPACT_ARRAYS = False
+    # Merge consecutive independent color changes into a single play call
+    COALESCE_ANIMATIONS = False
+    # Fraction of a color change's run time to wait before starting the next one
+    COALESCE_LAG_RATIO = 0.25
+    # Record every play call and write a Chrome trace to media_dir/profiles
+    PROFILE_PLAYS = False
+    # Record memory use and mobject counts after every step to media_dir/profiles
+    PROFILE_MEMORY = False
+    # Laid-out text shared by all render processes, None disables the cache
+    TEXT_CACHE_DIR = (
+        Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        / "manim-algorithm-visualizations"
+        / "text"
+    )
+    TEXT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    # Only animate the first steps and the steps that find a match, summarizing
+    # the others, so long inputs stay within a budget of rendered frames
+    FAST_FORWARD = False
+    FAST_FORWARD_STEPS = 3
+    FAST_FORWARD_MAX_FRAMES = 1800
+    FAST_FORWARD_SUMMARY_TIME = 1.0
+    # Skip every animation and save the last frame of each step to
+    # media_dir/storyboards instead of rendering a movie
+    STORYBOARD = False
+    # Stream all frames into one encoder process instead of a movie file per
+    # play call, cutting the stream only every STREAM_CHECKPOINT_STEPS steps
+    STREAM_MOVIE = False
+    STREAM_CHECKPOINT_STEPS = None
+    # Streamed chunks of the least recently rendered scenes are deleted past this
+    STREAM_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+    def __init__(
+        self,
+        text=None,
+        pattern=None,
+        find_all=None,
+        coalesce_animations=None,
+        profile_plays=None,
+        profile_memory=None,
+        fast_forward=None,
+        storyboard=None,
+        stream_movie=None,
+        **kwargs,
+    ):
+        if stream_movie is not None:
+            self.STREAM_MOVIE = stream_movie
+        if self.STREAM_MOVIE and kwargs.get("renderer") is None:
+            kwargs["renderer"] = CairoRenderer(
+                file_writer_class=StreamingFileWriter,
+                skip_animations=kwargs.get("skip_animations", False),
+            )
         super().__init__(**kwargs)
-        register_font(self.FONT_PATH)  # Register font in the constructor
+        if text is not None:
+            self.TEXT = text
+        if pattern is not None:
+            self.PATTERN = pattern
+        if find_all is not None:
+            self.FIND_ALL = find_all
+        register_font_once(self.FONT_PATH)  # Registered once per process
+        configure_text_disk_cache(self.TEXT_CACHE_DIR, self.TEXT_CACHE_MAX_BYTES)
+        if coalesce_animations is not None:
+            self.COALESCE_ANIMATIONS = coalesce_animations
+        if profile_plays is not None:
+            self.PROFILE_PLAYS = profile_plays
+        if fast_forward is not None:
+            self.FAST_FORWARD = fast_forward
+        if storyboard is not None:
+            self.STORYBOARD = storyboard
+        self.profiler = None
+        if self.PROFILE_PLAYS:
+            self.profiler = PlayProfiler()
+            self.profiler.attach(self)
+        if profile_memory is not None:
+            self.PROFILE_MEMORY = profile_memory
+        self.memory_profiler = StepMemoryProfiler() if self.PROFILE_MEMORY else None
+        self.pending_color_changes = []
+        self.pending_targets = set()
+        # Play call index at which each algorithm step starts
+        self.step_boundaries = []
+        # Frames written by the play calls so far
+        self.frames_played = 0
+        # Fast-forward state, see mark_step
+        self.match_steps = set()
+        self.fast_forwarding = False
+        self.skipped_from = None
+        self.step_start_frames = 0
+        self.max_step_frames = 0
+        # Text position of the current step, where skipping starts if it is cut off
+        self.step_position = 0
+        # Set while a summary of skipped steps plays, which has frames reserved
+        self.summarizing = False
+        self.storyboard = None
+        if self.STORYBOARD:
+            self.storyboard = Storyboard(
+                Path(config.media_dir) / "storyboards" / type(self).__name__,
+                type(self).__name__,
+            )
+        self.step_description = "Start"
+        # Source opened by load_text, closed when the scene is torn down
+        self.text_source = None
+        # Whether the play calls of the current stream chunk were already rendered
+        self.reusing_chunk = False
+        if self.STREAM_MOVIE:
+            # Includes settings passed to the constructor rather than set on the class
+            overrides = {
+                name: value for name, value in vars(self).items() if name.isupper()
+            }
+            scene_class = type(type(self).__name__, (type(self),), overrides)
+            render_key = scene_class.render_key()
+            self.reusing_chunk = self.renderer.file_writer.start_stream(
+                render_key, self.STREAM_CACHE_MAX_BYTES
+            )
+
+    @classmethod
+    def with_inputs(cls, text=None, pattern=None):
+        """
+        Returns a subclass of the scene that visualizes the given text and pattern.
+        """
+        inputs = {}
+        if text is not None:
+            inputs["TEXT"] = text
+        if pattern is not None:
+            inputs["PATTERN"] = pattern
+        return type(cls.__name__, (cls,), inputs)
+
+    @classmethod
+    def render_key(cls):
+        """
+        Returns a digest of the scene's source code, settings and output quality,
+        which changes whenever the rendered movie would.
+        """
+        utils_dir = Path(__file__).resolve().parent
+        sources = {
+            Path(inspect.getsourcefile(klass)).resolve()
+            for klass in cls.__mro__
+            if issubclass(klass, BaseVisualization)
+        }
+        sources.update(utils_dir.glob("*.py"))
+        sources.update((utils_dir.parent / "algorithms").glob("*.py"))
+
+        digest = hashlib.sha256()
+        for source in sorted(sources):
+            digest.update(source.read_bytes())
+        settings = {
+            name: repr(getattr(cls, name)) for name in dir(cls) if name.isupper()
+        }
+        for name in [
+            "pixel_width",
+            "pixel_height",
+            "frame_rate",
+            "from_animation_number",
+            "upto_animation_number",
+        ]:
+            settings[name] = config[name]
+        if cls.TEXT_FILE is not None:
+            # Hashing a text too large for memory would take long, stat it instead
+            stat = Path(cls.TEXT_FILE).stat()
+            settings["text_file"] = [stat.st_size, stat.st_mtime_ns]
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
 
     def setup_scene(self, title_text, title_font_size=48):
         """
         Sets up the scene with a title and a background color.
         """
         self.camera.background_color = self.BG_COLOR
-        title = Text(
+        title = cached_text(
             title_text,
             font=self.FONT_NAME,
             font_size=title_font_size,
             color=self.TEXT_COLOR,
         ).to_edge(UP, buff=0.5)
         self.add(title)
+
+    def create_match_overlay(
+        self, locate, direction=DOWN, buff=0.1, pattern_length=None
+    ):
+        """
+        Adds the overlay marking every occurrence found in find-all mode, see
+        MatchOverlay for locate.
+        """
+        if pattern_length is None:
+            pattern_length = len(self.PATTERN)
+        overlay = MatchOverlay(
+            locate, pattern_length, self.MATCH_COLOR, direction, buff
+        )
+        self.add(overlay)
+        return overlay
+
+    def load_text(self):
+        """
+        Returns the text to search, or a TextSource reading TEXT_FILE when it is set.
+        """
+        if self.TEXT_FILE is None:
+            return self.TEXT
+        self.text_source = TextSource.open(self.TEXT_FILE)
+        return self.text_source
+
+    def plan_fast_forward(self, trace, step_types):
+        """
+        Returns the trace as a list, remembering which of its steps find a match.
+
+        Steps start at the events of the given types, where the scene calls mark_step,
+        and are numbered after the steps the scene already marked. Without
+        fast-forwarding the trace is returned as is, so it stays lazy.
+        """
+        if not self.FAST_FORWARD:
+            return trace
+        trace = list(trace)
+        step = len(self.step_boundaries)
+        for event in trace:
+            if isinstance(event, step_types):
+                step += 1
+            elif isinstance(event, Found):
+                self.match_steps.add(step)
+        return trace
+
+    def mark_step(self, position=None, description=None):
+        """
+        Records that a new algorithm step starts with the next play call.
+
+        When fast-forwarding, also decides whether the step is animated. The position
+        in the text where the step starts is passed to summarize_skipped_steps, and
+        the description labels the step in storyboards.
+        """
+        self.flush_color_changes()
+        if self.storyboard is not None:
+            self.capture_step()
+        if self.memory_profiler is not None:
+            self.memory_profiler.record(self, self.step_description)
+        self.step_boundaries.append(self.renderer.num_plays)
+        self.step_description = description or f"Step {len(self.step_boundaries)}"
+        if (
+            self.STREAM_MOVIE
+            and self.STREAM_CHECKPOINT_STEPS
+            and len(self.step_boundaries) % self.STREAM_CHECKPOINT_STEPS == 0
+        ):
+            self.reusing_chunk = self.renderer.file_writer.next_chunk()
+        if not self.FAST_FORWARD:
+            return
+
+        step = len(self.step_boundaries)
+        if not self.fast_forwarding:
+            self.max_step_frames = max(
+                self.max_step_frames, self.frames_played - self.step_start_frames
+            )
+        # Leave room for this step and a summary of the steps skipped after it,
+        # either when animating resumes or when the scene is torn down
+        animate = (step < self.FAST_FORWARD_STEPS or step in self.match_steps) and (
+            self.frames_played + self.max_step_frames + self.summary_frames()
+            <= self.FAST_FORWARD_MAX_FRAMES
+        )
+        if animate and self.fast_forwarding:
+            self.end_fast_forward(position)
+        elif not animate and not self.fast_forwarding:
+            self.start_fast_forward(position)
+        self.step_position = position
+        self.step_start_frames = self.frames_played
+
+    def summary_frames(self):
+        return math.ceil(self.FAST_FORWARD_SUMMARY_TIME * config.frame_rate)
+
+    def start_fast_forward(self, position):
+        """
+        Stops animating, the steps skipped from position on being summarized later.
+        """
+        self.fast_forwarding = True
+        self.skipped_from = position
+
+    def describe_step(self, description):
+        """
+        Replaces the description of the current step, e.g. once its outcome is known.
+        """
+        self.step_description = description
+
+    def capture_step(self):
+        """
+        Adds the current frame to the storyboard as the still of the current step.
+        """
+        # Draw every mobject, not on top of the static frame of the last play
+        self.renderer.static_image = None
+        self.renderer.update_frame(self, ignore_skipping=True)
+        self.storyboard.add(self.renderer.get_frame(), self.step_description)
+
+    def end_fast_forward(self, position):
+        """
+        Resumes animating, playing a summary of the steps skipped up to position.
+        """
+        animations = self.summarize_skipped_steps(self.skipped_from, position)
+        run_time = min(
+            self.FAST_FORWARD_SUMMARY_TIME,
+            (self.FAST_FORWARD_MAX_FRAMES - self.frames_played) / config.frame_rate,
+        )
+        # Without room for a single frame the summary is only applied
+        self.fast_forwarding = run_time * config.frame_rate < 1
+        self.summarizing = True
+        try:
+            if animations:
+                self.play(*animations, run_time=max(run_time, 1 / config.frame_rate))
+        finally:
+            self.summarizing = False
+        self.fast_forwarding = False
+
+    def summarize_skipped_steps(self, start, end):
+        """
+        Returns animations summarizing the steps skipped between the text positions
+        start and end, which is None when the scene ended while skipping.
+        """
+        return []
+
+    def play_color_changes(self, *animations, run_time=None):
+        """
+        Plays color change animations, or queues them when coalescing is enabled.
+
+        Queued changes are played together once something else is played, or when
+        a change targets a mobject that is already waiting to be recolored. None
+        stands for a change with nothing to recolor and is ignored.
+        """
+        animations = [animation for animation in animations if animation is not None]
+        if not animations:
+            return
+        play_kwargs = {} if run_time is None else {"run_time": run_time}
+        if not self.COALESCE_ANIMATIONS:
+            self.play(*animations, **play_kwargs)
+            return
+
+        targets = {
+            id(mobject)
+            for animation in animations
+            for mobject in animation.mobject.get_family()
+        }
+        if targets & self.pending_targets:
+            self.flush_color_changes()
+        self.pending_color_changes.append((animations, play_kwargs))
+        self.pending_targets |= targets
+
+    def flush_color_changes(self):
+        """
+        Plays all queued color changes as one staggered animation.
+        """
+        if not self.pending_color_changes:
+            return
+        pending = self.pending_color_changes
+        self.pending_color_changes = []
+        self.pending_targets = set()
+
+        if len(pending) == 1:
+            animations, play_kwargs = pending[0]
+            self.play_now(*animations, **play_kwargs)
+        else:
+            self.play_now(
+                LaggedStart(
+                    *[
+                        AnimationGroup(*animations, **play_kwargs)
+                        for animations, play_kwargs in pending
+                    ],
+                    lag_ratio=self.COALESCE_LAG_RATIO,
+                )
+            )
+
+    def play_now(self, *args, **kwargs):
+        """
+        Plays animations right away, profiling the call if profiling is enabled.
+        """
+        if self.profiler is None:
+            self.render_play(*args, **kwargs)
+        else:
+            with self.profiler.profile_play(self):
+                self.render_play(*args, **kwargs)
+
+    def render_play(self, *args, **kwargs):
+        """
+        Plays animations, only applying their end state while fast-forwarding.
+        """
+        skip = self.fast_forwarding or self.storyboard is not None or self.reusing_chunk
+        if not skip:
+            super().play(*args, **kwargs)
+        else:
+            # Skipped the same way as the plays before from_animation_number, which
+            # every renderer supports, so no partial movie file is written
+            first_rendered = config.from_animation_number
+            config.from_animation_number = max(
+                first_rendered, self.renderer.num_plays + 1
+            )
+            try:
+                super().play(*args, **kwargs)
+            finally:
+                config.from_animation_number = first_rendered
+        # Every play of the movie counts, whether it was rendered, cached, reused or
+        # skipped before from_animation_number, so shards and planning runs decide
+        # the same as a full render
+        if not self.fast_forwarding:
+            self.frames_played += round(self.duration * config.frame_rate)
+
+    def compile_animation_data(self, *args, **kwargs):
+        compiled = super().compile_animation_data(*args, **kwargs)
+        # A step longer than the ones before it is cut off before it can use the
+        # frames kept for the summary, so the budget holds whatever it plays
+        if self.FAST_FORWARD and not self.fast_forwarding and not self.summarizing:
+            frames = round(self.duration * config.frame_rate)
+            if (
+                self.frames_played + frames + self.summary_frames()
+                > self.FAST_FORWARD_MAX_FRAMES
+            ):
+                self.start_fast_forward(self.step_position)
+                self.renderer.skip_animations = True
+        return compiled
+
+    def play(self, *args, **kwargs):
+        # Queued color changes happened before anything played after them
+        self.flush_color_changes()
+        self.play_now(*args, **kwargs)
+
+    def tear_down(self):
+        try:
+            self.flush_color_changes()
+            if self.fast_forwarding:
+                self.end_fast_forward(None)
+        except EndSceneEarlyException:
+            # Rendering stopped at upto_animation_number
+            pass
+        if self.storyboard is not None:
+            self.capture_step()
+            self.storyboard.write_index()
+        if self.profiler is not None:
+            self.profiler.write_chrome_trace(
+                Path(config.media_dir) / "profiles" / f"{type(self).__name__}.json"
+            )
+        if self.memory_profiler is not None:
+            self.memory_profiler.record(self, self.step_description)
+            path = self.memory_profiler.write_report(
+                Path(config.media_dir)
+                / "profiles"
+                / f"{type(self).__name__}_memory.json"
+            )
+            if self.memory_profiler.suspected_leaks:
+                logger.warning(
+                    "Mobject counts kept growing up to steps %s, see %s",
+                    self.memory_profiler.suspected_leaks,
+                    path,
+                )
+        if self.text_source is not None:
+            self.text_source.close()
+        super().tear_down()
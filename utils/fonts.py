@@ -0,0 +1,37 @@
+import hashlib
+from pathlib import Path
+
+import manimpango
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# SHA-256 digests of the font files already registered in this process, by path
+_registered_fonts = {}
+
+
+def register_font_once(font_path):
+    """
+    Registers a font file with Pango for the rest of the process.
+
+    Relative paths are looked up in the working directory first, then in the
+    repository root. Registering the same file again is a no-op, so scenes
+    rendered one after another in a worker process share the registration.
+    """
+    path = Path(font_path)
+    if not path.is_absolute() and not path.exists():
+        path = ROOT_DIR / path
+    path = str(path.resolve())
+    if path in _registered_fonts:
+        return
+    if not manimpango.register_font(path):
+        raise RuntimeError(f"Could not register font {path}")
+    _registered_fonts[path] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def registered_fonts_digest():
+    """
+    Returns a digest of the contents of every font file registered in this process.
+    """
+    return hashlib.sha256(
+        "".join(sorted(_registered_fonts.values())).encode()
+    ).hexdigest()
@@ -0,0 +1,59 @@
+from manim import DOWN, ORIGIN, RIGHT, Create, Line, VGroup
+
+# Overlapping occurrences are drawn on up to this many rows of markers
+MAX_ROWS = 4
+ROW_SPACING = 0.08
+
+
+class MatchOverlay(VGroup):
+    """
+    A persistent group of markers, one along every occurrence found in a text.
+
+    Marking an occurrence only creates a line, so texts with many occurrences
+    stay cheap to render. locate(start, end, direction) returns the ends of the
+    edge of the text from start up to end on the side of direction, or None when
+    that part of the text is not on screen. Occurrences are pattern_length long
+    unless marked with a length of their own.
+    """
+
+    def __init__(
+        self, locate, pattern_length, color, direction=DOWN, buff=0.1, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.locate = locate
+        self.pattern_length = pattern_length
+        self.marker_color = color
+        self.direction = direction
+        self.buff = buff
+        self.rows = max(1, min(pattern_length, MAX_ROWS))
+        # (position, length) of every marked occurrence
+        self.occurrences = []
+
+    def place_marker(self, marker, position, length):
+        span = self.locate(position, position + length, self.direction)
+        if span is None:
+            marker.set_stroke(opacity=0)
+            return
+        # Occurrences closer than the pattern length overlap, so alternate rows
+        offset = self.direction * (self.buff + ROW_SPACING * (position % self.rows))
+        left, right = span
+        marker.put_start_and_end_on(left + offset, right + offset)
+        marker.set_stroke(opacity=1)
+
+    def get_add_marker_animation(self, position, length=None):
+        """
+        Returns an animation drawing the marker of the occurrence at position.
+        """
+        length = self.pattern_length if length is None else length
+        marker = Line(ORIGIN, RIGHT, color=self.marker_color, stroke_width=5)
+        self.place_marker(marker, position, length)
+        self.occurrences.append((position, length))
+        self.add(marker)
+        return Create(marker)
+
+    def update_markers(self):
+        """
+        Moves the markers along with the text, e.g. after its window scrolled.
+        """
+        for marker, (position, length) in zip(self.submobjects, self.occurrences):
+            self.place_marker(marker, position, length)
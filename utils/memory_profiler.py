@@ -0,0 +1,125 @@
+import gc
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from manim import Mobject
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Number of steps in a row that must each set a new maximum before a count is
+# reported as growing without bound
+LEAK_STEPS = 5
+
+
+def current_rss():
+    """
+    Returns the resident set size of the process in bytes, or None if unknown.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the process in bytes, or None if unknown.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def live_mobject_types():
+    """
+    Counts the mobjects alive in the process by type name, after a full collection.
+    """
+    gc.collect()
+    return Counter(
+        type(obj).__name__ for obj in gc.get_objects() if isinstance(obj, Mobject)
+    )
+
+
+class StepMemoryProfiler:
+    """
+    Records memory use and mobject counts after every algorithm step, flagging the
+    steps where the number of mobjects keeps growing.
+
+    Live mobjects counts every mobject the process still references, including
+    ones no longer in the scene, while the family size only counts those in it.
+    """
+
+    def __init__(self, leak_steps=LEAK_STEPS):
+        self.leak_steps = leak_steps
+        self.steps = []
+        self.types = Counter()
+        # Per count, its maximum so far and for how many steps in a row it grew
+        self.maxima = {}
+        self.growth_runs = {}
+
+    def is_growing(self, name, value):
+        """
+        Checks whether a count has set a new maximum for leak_steps steps in a row.
+        """
+        if name in self.maxima and value > self.maxima[name]:
+            self.growth_runs[name] += 1
+        else:
+            self.growth_runs[name] = 0
+        self.maxima[name] = max(value, self.maxima.get(name, value))
+        return self.growth_runs[name] >= self.leak_steps
+
+    def record(self, scene, description):
+        """
+        Records the state of the scene at the end of the step with the description.
+        """
+        types = live_mobject_types()
+        step = {
+            "step": len(self.steps),
+            "description": description,
+            "plays": scene.renderer.num_plays,
+            "rss_bytes": current_rss(),
+            "peak_rss_bytes": peak_rss(),
+            "live_mobjects": sum(types.values()),
+            "scene_family_size": len(scene.get_mobject_family_members()),
+            # Mobject types with the most new instances during the step
+            "top_growth": dict((types - self.types).most_common(5)),
+        }
+        step["growing"] = [
+            name
+            for name in ("live_mobjects", "scene_family_size")
+            if self.is_growing(name, step[name])
+        ]
+        self.types = types
+        self.steps.append(step)
+        return step
+
+    @property
+    def suspected_leaks(self):
+        return [step["step"] for step in self.steps if step["growing"]]
+
+    def write_report(self, path):
+        """
+        Writes the recorded steps and the steps suspected of leaking as JSON.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "leak_steps": self.leak_steps,
+                    "suspected_leaks": self.suspected_leaks,
+                    "steps": self.steps,
+                },
+                f,
+                indent=1,
+            )
+        return path
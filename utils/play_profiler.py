@@ -0,0 +1,138 @@
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import manim
+
+# Frames from these files are skipped when looking for the scene helper that played
+_INTERNAL_PATHS = (
+    str(Path(manim.__file__).parent),
+    str(Path(__file__).parent),
+    contextlib.__file__,
+)
+
+
+class PlayProfiler:
+    """
+    Records every play call of a scene with its wall time split into interpolation,
+    Cairo rasterization and file writing, and exports it as a Chrome trace.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.plays = []
+        self.events = []
+        self.phase_durations = {}
+        self.frames = 0
+
+    def attach(self, scene):
+        """
+        Wraps the methods of the scene, its renderer and file writer that do the work
+        of each frame, so the time spent in them is recorded.
+        """
+        scene.update_to_time = self.timed("interpolation", scene.update_to_time)
+        renderer = scene.renderer
+        renderer.update_frame = self.timed("rasterization", renderer.update_frame)
+        file_writer = renderer.file_writer
+        write_frame = self.timed("file_writing", file_writer.write_frame)
+
+        def counting_write_frame(*args, **kwargs):
+            self.frames += 1
+            return write_frame(*args, **kwargs)
+
+        file_writer.write_frame = counting_write_frame
+
+    def timestamp(self):
+        """
+        Returns microseconds since the profiler was created.
+        """
+        return (time.perf_counter() - self.start) * 1e6
+
+    def timed(self, phase, func):
+        """
+        Wraps func so that each call is recorded as a trace event of the given phase.
+        """
+
+        def wrapper(*args, **kwargs):
+            start = self.timestamp()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = self.timestamp() - start
+                self.phase_durations[phase] = (
+                    self.phase_durations.get(phase, 0) + duration
+                )
+                self.events.append(self.trace_event(phase, "phase", start, duration))
+
+        return wrapper
+
+    def trace_event(self, name, category, start, duration, args=None):
+        """
+        Creates a complete ("X") event of the Chrome trace event format.
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": duration,
+            "pid": os.getpid(),
+            "tid": 0,
+        }
+        if args:
+            event["args"] = args
+        return event
+
+    @staticmethod
+    def find_caller():
+        """
+        Returns the name of the scene method that started the current play call.
+        """
+        frame = sys._getframe(1)
+        while frame is not None:
+            if not frame.f_code.co_filename.startswith(_INTERNAL_PATHS):
+                return frame.f_code.co_name
+            frame = frame.f_back
+        return "unknown"
+
+    @contextlib.contextmanager
+    def profile_play(self, scene):
+        """
+        Records the play call made inside the with block.
+        """
+        caller = self.find_caller()
+        phase_durations = dict(self.phase_durations)
+        frames = self.frames
+        start = self.timestamp()
+        yield
+        duration = self.timestamp() - start
+
+        play = {
+            "caller": caller,
+            "animations": len(scene.animations or []),
+            "family_size": sum(
+                len(animation.mobject.get_family())
+                for animation in scene.animations or []
+            ),
+            "frames": self.frames - frames,
+            "wall_ms": duration / 1000,
+        }
+        for phase, total in self.phase_durations.items():
+            play[f"{phase}_ms"] = (total - phase_durations.get(phase, 0)) / 1000
+        self.plays.append(play)
+        self.events.append(self.trace_event(caller, "play", start, duration, play))
+
+    def write_chrome_trace(self, path):
+        """
+        Writes the recorded events as a Chrome trace, which speedscope can also open.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {"traceEvents": self.events, "displayTimeUnit": "ms"}, f, indent=1
+            )
+        return path
@@ -0,0 +1,66 @@
+import html
+from pathlib import Path
+
+from PIL import Image
+
+
+class Storyboard:
+    """
+    Saves a still of each algorithm step and an HTML contact sheet indexing them.
+    """
+
+    def __init__(self, directory, title):
+        self.directory = Path(directory)
+        self.title = title
+        # (file name, description) of every saved step
+        self.steps = []
+
+    @property
+    def index_path(self):
+        return self.directory / "index.html"
+
+    def add(self, frame, description):
+        """
+        Saves a frame, given as an RGBA pixel array, as the still of the next step.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"step_{len(self.steps):04}.png"
+        # Stills are for review, favour encoding speed over file size
+        Image.fromarray(frame).save(self.directory / name, compress_level=1)
+        self.steps.append((name, description))
+
+    def write_index(self):
+        """
+        Writes the contact sheet showing every step with its description.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        figures = "\n".join(
+            f'<figure><img src="{name}" loading="lazy">'
+            f"<figcaption>{index}. {html.escape(description)}</figcaption></figure>"
+            for index, (name, description) in enumerate(self.steps)
+        )
+        self.index_path.write_text(
+            f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(self.title)}</title>
+<style>
+body {{ font-family: sans-serif; background: #1f2937; color: #f9fafb; }}
+main {{ display: grid; gap: 16px;
+        grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); }}
+figure {{ margin: 0; }}
+img {{ width: 100%; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(self.title)}</h1>
+<main>
+{figures}
+</main>
+</body>
+</html>
+""",
+            encoding="utf-8",
+        )
+        return self.index_path
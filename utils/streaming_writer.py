@@ -0,0 +1,126 @@
+import os
+import shutil
+from pathlib import Path
+
+from manim import config
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import write_to_movie
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """
+    A scene file writer that streams the frames of consecutive play calls into
+    one encoder process, instead of writing a partial movie file per play call.
+
+    The stream is only cut into chunks at checkpoints. A finished chunk is renamed
+    into place, so a later render of the same scene (same render key) reuses it
+    instead of rendering its play calls again. The least recently rendered keys
+    are deleted once the streamed chunks outgrow max_bytes.
+
+    Until a stream is started, it writes partial movie files like manim does.
+    """
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.chunk_directory = None
+        self.chunk_files = []
+        self.chunk_open = False
+        self.max_bytes = None
+
+    def start_stream(self, render_key, max_bytes=None):
+        """
+        Starts the first chunk of a scene, returning True if it can be reused.
+        """
+        if not hasattr(self, "partial_movie_directory") or not write_to_movie():
+            return False
+        # Outside the partial movie directory, which manim prunes file by file
+        self.chunk_directory = Path(config.media_dir) / "streamed" / render_key
+        self.max_bytes = max_bytes
+        self.chunk_directory.mkdir(parents=True, exist_ok=True)
+        return self.next_chunk()
+
+    def next_chunk(self):
+        """
+        Finishes the chunk being written and starts the next one.
+
+        Returns True if the next chunk was written by an earlier render, in which
+        case its play calls do not need to be rendered.
+        """
+        if self.chunk_directory is None:
+            return False
+        self.close_movie_pipe()
+        path = self.chunk_directory / (
+            f"chunk_{len(self.chunk_files):05}{config.movie_file_extension}"
+        )
+        self.chunk_files.append(path)
+        return path.exists()
+
+    def chunk_temp_path(self, path):
+        # Keeps the extension so ffmpeg still picks the container from it
+        return path.with_name(f"{path.stem}.tmp{path.suffix}")
+
+    def is_already_cached(self, hash_invocation):
+        if self.chunk_directory is None:
+            return super().is_already_cached(hash_invocation)
+        # A partial movie from a normal render would make the renderer skip the
+        # play call, leaving its frames out of the stream, so never report one
+        return False
+
+    def add_partial_movie_file(self, hash_animation):
+        # While streaming, frames go to the current chunk instead
+        if self.chunk_directory is None:
+            super().add_partial_movie_file(hash_animation)
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if self.chunk_directory is None:
+            super().begin_animation(allow_write, file_path)
+        elif write_to_movie() and allow_write and not self.chunk_open:
+            self.open_movie_pipe(file_path=self.chunk_temp_path(self.chunk_files[-1]))
+            self.chunk_open = True
+
+    def end_animation(self, allow_write=False):
+        # While streaming, the encoder keeps running until the next checkpoint
+        if self.chunk_directory is None:
+            super().end_animation(allow_write)
+
+    def close_movie_pipe(self):
+        if not self.chunk_open:
+            return
+        self.writing_process.stdin.close()
+        self.writing_process.wait()
+        self.chunk_open = False
+        os.replace(self.partial_movie_file_path, self.chunk_files[-1])
+
+    def evict_streams(self):
+        """
+        Deletes the chunks of the least recently rendered keys until all streamed
+        chunks fit in max_bytes. The chunks of this render are always kept.
+        """
+        if self.max_bytes is None:
+            return
+        # Reusing chunks does not touch the directory, so mark it as recent here
+        os.utime(self.chunk_directory)
+        streams = []
+        total_bytes = 0
+        for directory in self.chunk_directory.parent.iterdir():
+            if not directory.is_dir():
+                continue
+            size = sum(path.stat().st_size for path in directory.iterdir())
+            streams.append((directory.stat().st_mtime, size, directory))
+            total_bytes += size
+        for _, size, directory in sorted(streams):
+            if total_bytes <= self.max_bytes:
+                break
+            if directory != self.chunk_directory:
+                shutil.rmtree(directory, ignore_errors=True)
+                total_bytes -= size
+
+    def finish(self):
+        if self.chunk_directory is None:
+            super().finish()
+            return
+        self.close_movie_pipe()
+        self.partial_movie_files = [path for path in self.chunk_files if path.exists()]
+        super().finish()
+        # Only once the movie is combined, as its chunks may be among those deleted
+        self.evict_streams()
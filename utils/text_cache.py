@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from manim import ManimColor, Text
+
+from utils.text_disk_cache import TextDiskCache
+
+# Prototype Text mobjects keyed by (text, font, font size, color, line spacing)
+_text_prototypes = {}
+
+# Laid-out glyphs shared between processes, see configure_text_disk_cache
+_disk_cache = None
+
+
+def configure_text_disk_cache(directory, max_bytes):
+    """
+    Sets the directory of the on-disk glyph cache, or disables it when None.
+    """
+    global _disk_cache
+    if directory is None:
+        _disk_cache = None
+    elif _disk_cache is None or _disk_cache.directory != Path(directory):
+        _disk_cache = TextDiskCache(directory, max_bytes)
+    else:
+        _disk_cache.max_bytes = max_bytes
+
+
+def layout_text(text, font, font_size, color, line_spacing=-1):
+    """
+    Lays out a text, reusing glyphs from the on-disk cache when possible.
+    """
+    if _disk_cache is None:
+        return Text(
+            text,
+            font=font,
+            font_size=font_size,
+            color=color,
+            line_spacing=line_spacing,
+        )
+
+    key = _disk_cache.key(text, font, font_size, line_spacing)
+    mobject = _disk_cache.load(key)
+    if mobject is not None:
+        return mobject.set_color(color)
+
+    mobject = Text(
+        text, font=font, font_size=font_size, color=color, line_spacing=line_spacing
+    )
+    _disk_cache.store(key, mobject)
+    return mobject
+
+
+def cached_text(text, font, font_size, color, line_spacing=-1):
+    """
+    Returns a copy of a cached Text mobject, so each distinct text is laid out only once.
+    """
+    text = str(text)
+    key = (text, font, font_size, ManimColor(color).to_hex(), line_spacing)
+    prototype = _text_prototypes.get(key)
+    if prototype is None:
+        prototype = layout_text(text, font, font_size, color, line_spacing)
+        _text_prototypes[key] = prototype
+    return prototype.copy()
+
+
+def clear_text_cache():
+    """
+    Drops all cached prototypes, e.g. after registering a different font.
+    """
+    _text_prototypes.clear()
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import manim
+import numpy as np
+from manim import Text, VMobject
+
+from utils.fonts import registered_fonts_digest
+
+ENTRY_SUFFIX = ".npz"
+# Entries of earlier versions, which were pickled and are never loaded
+LEGACY_SUFFIX = ".glyphs"
+
+
+def json_attributes(mobject):
+    """
+    Returns the attributes of a mobject that are plain JSON values, such as the
+    text, font and font size of a Text.
+    """
+    attributes = {}
+    for name, value in vars(mobject).items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        attributes[name] = value
+    return attributes
+
+
+def text_from_glyphs(glyphs, attributes):
+    """
+    Returns a Text made of laid-out glyphs, with the attributes of the Text they
+    were taken from.
+    """
+    # Text.__init__ would lay the text out again, so only initialize the mobject
+    text = Text.__new__(Text)
+    VMobject.__init__(text, fill_opacity=1.0, stroke_width=0)
+    text.add(*glyphs)
+    vars(text).update(attributes)
+    text.chars = text.get_group_class()(*glyphs)
+    return text
+
+
+class TextDiskCache:
+    """
+    A content-addressed cache of laid-out text glyphs shared by all processes.
+
+    Entries are keyed by the text, font, font size, line spacing and the contents of
+    every registered font file, so editing a font invalidates them. Entries are
+    written to a temporary file and renamed into place, so concurrent readers only
+    ever see complete entries. They only hold NumPy arrays, loaded without
+    pickle, so a shared directory cannot be used to run code. Reading an entry refreshes its modification time and
+    the least recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Bytes written since the last eviction pass
+        self.bytes_written = 0
+        for path in self.directory.glob("*" + LEGACY_SUFFIX):
+            path.unlink(missing_ok=True)
+        self.evict()
+
+    def key(self, text, font, font_size, line_spacing):
+        """
+        Returns the content address of a text laid out with the given settings.
+        """
+        settings = [
+            text,
+            font,
+            font_size,
+            line_spacing,
+            registered_fonts_digest(),
+            manim.__version__,
+        ]
+        return hashlib.sha256(json.dumps(settings).encode()).hexdigest()
+
+    def path(self, key):
+        return self.directory / (key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """
+        Returns the cached text as a Text, or None if it is not cached.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+            os.utime(path)
+            attributes = json.loads(arrays.pop("attributes").tobytes())
+        except FileNotFoundError:
+            # Never written, or evicted by another process in the meantime
+            return None
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            path.unlink(missing_ok=True)
+            return None
+
+        glyphs = []
+        for index in range(len(arrays["stroke_width"])):
+            glyph = VMobject()
+            glyph.set_points(self.slice(arrays, "points", index))
+            glyph.fill_rgbas = self.slice(arrays, "fill_rgbas", index)
+            glyph.stroke_rgbas = self.slice(arrays, "stroke_rgbas", index)
+            glyph.stroke_width = float(arrays["stroke_width"][index])
+            glyphs.append(glyph)
+        return text_from_glyphs(glyphs, attributes)
+
+    @staticmethod
+    def slice(arrays, name, index):
+        """
+        Returns the rows of a glyph in one of the concatenated arrays of an entry.
+        """
+        offsets = arrays[name + "_offsets"]
+        return arrays[name][offsets[index] : offsets[index + 1]]
+
+    def store(self, key, mobject):
+        """
+        Writes the glyphs and attributes of a laid-out Text to the cache.
+        """
+        glyphs = mobject.family_members_with_points()
+        arrays = {
+            "stroke_width": np.array(
+                [glyph.stroke_width for glyph in glyphs], dtype=float
+            ),
+            "attributes": np.frombuffer(
+                json.dumps(json_attributes(mobject)).encode(), dtype=np.uint8
+            ),
+        }
+        # Every glyph has its own number of rows, so they are concatenated and
+        # the start of each glyph is kept alongside
+        for name, columns in [("points", 3), ("fill_rgbas", 4), ("stroke_rgbas", 4)]:
+            rows = [
+                np.asarray(getattr(glyph, name)).reshape(-1, columns)
+                for glyph in glyphs
+            ]
+            arrays[name] = np.concatenate(rows) if rows else np.zeros((0, columns))
+            arrays[name + "_offsets"] = np.cumsum([0] + [len(r) for r in rows])
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            try:
+                np.savez(f, **arrays)
+                size = f.tell()
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self.path(key))
+
+        self.bytes_written += size
+        if self.bytes_written > self.max_bytes // 16:
+            self.evict()
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the cache fits in max_bytes.
+        """
+        self.bytes_written = 0
+        entries = []
+        total = 0
+        for path in self.directory.glob("*" + ENTRY_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
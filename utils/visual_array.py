@@ -1,9 +1,36 @@
-from manim import *
+import numpy as np
+from manim import (
+    DOWN,
+    LEFT,
+    RIGHT,
+    UP,
+    AnimationGroup,
+    ManimColor,
+    Rectangle,
+    ReplacementTransform,
+    VGroup,
+    VMobject,
+)
+
+from utils.text_cache import cached_text
+
+
+def object_array(items):
+    """
+    Returns a one-dimensional NumPy array holding the given items as objects.
+    """
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
 
 
 class VisualArray(VGroup):
     """
     A Manim-based array that allows updating and highlighting elements.
+
+    Values and colors of the elements are kept in NumPy arrays. In compact mode the
+    borders of all cells are drawn as a single path and cell positions are computed
+    from their index, so the array only adds a text mobject per cell.
     """
 
     def __init__(
@@ -15,18 +42,43 @@ class VisualArray(VGroup):
         border_color,
         cell_width=1.0,
         cell_height=1.0,
-        **kwargs
+        compact=False,
+        slot_count=None,
+        **kwargs,
     ):
         super().__init__(**kwargs)
 
-        self.element_cells = VGroup()
+        self.default_color = element_color
+        self.font_name = font_name
+        self.font_size = font_size
+        self.compact = compact
+        self.values = object_array(list(elements))
+        self.colors = object_array(
+            [ManimColor(element_color).to_hex()] * len(self.values)
+        )
+        # Number of cells on screen, subclasses may show fewer than all elements
+        self.slot_count = len(self.values) if slot_count is None else slot_count
+        # Index of the element stored first in values and colors
+        self.storage_start = 0
+        # Index of the element shown in the first slot
+        self.window_start = 0
 
-        for e in elements:
-            # Create text for the element
-            text = Text(
-                str(e), font=font_name, font_size=font_size, color=element_color
-            )
+        texts = [
+            self.create_text(self.values[slot], element_color)
+            for slot in range(self.slot_count)
+        ]
 
+        if compact:
+            self.grid = self.create_grid(cell_width, cell_height, border_color)
+            self.texts = VGroup(*texts)
+            self.add(self.grid, self.texts)
+            for slot, text in enumerate(texts):
+                text.move_to(self.slot_center(slot))
+            return
+
+        self.element_cells = VGroup()
+
+        for text in texts:
             # Create a cell (rectangle) around the text with fixed width and height
             cell = Rectangle(width=cell_width, height=cell_height, color=border_color)
             text.move_to(cell.get_center())
@@ -39,30 +91,356 @@ class VisualArray(VGroup):
         self.element_cells.arrange(RIGHT, buff=0)
         self.add(self.element_cells)
 
-        self.default_color = element_color
+    def create_text(self, value, color):
+        return cached_text(
+            value, font=self.font_name, font_size=self.font_size, color=color
+        )
+
+    def create_grid(self, cell_width, cell_height, border_color):
+        """
+        Creates the borders of all cells as one path centered on the origin.
+
+        The path starts with the outline, clockwise from the top left corner, which
+        slot_center relies on, followed by the line between each pair of cells.
+        """
+        width = cell_width * self.slot_count
+        top_left = LEFT * width / 2 + UP * cell_height / 2
+        grid = VMobject(color=border_color)
+        grid.set_points_as_corners(
+            [
+                top_left,
+                top_left + RIGHT * width,
+                top_left + RIGHT * width + DOWN * cell_height,
+                top_left + DOWN * cell_height,
+                top_left,
+            ]
+        )
+        for slot in range(1, self.slot_count):
+            top = top_left + RIGHT * cell_width * slot
+            grid.start_new_path(top)
+            grid.add_line_to(top + DOWN * cell_height)
+        return grid
+
+    def element_count(self):
+        """
+        Returns the number of elements, or of elements known so far when streaming.
+        """
+        return self.storage_start + len(self.values)
+
+    def is_visible(self, index):
+        """
+        Checks whether the element at the specified index has a cell on screen.
+        """
+        return 0 <= index < len(self.values)
+
+    def slot_of(self, index):
+        """
+        Returns the slot, i.e. the cell on screen, showing the element at index.
+        """
+        return index
+
+    def slot_center(self, slot):
+        if not self.compact:
+            return self.element_cells[slot][0].get_center()
+        top_left, top_right, bottom_right = self.grid.points[[0, 3, 7]]
+        return (
+            top_left
+            + (top_right - top_left) * (slot + 0.5) / self.slot_count
+            + (bottom_right - top_right) / 2
+        )
+
+    def slot_text(self, slot):
+        if self.compact:
+            return self.texts[slot]
+        return self.element_cells[slot][1]
+
+    def set_slot_text(self, slot, text):
+        """
+        Shows a text mobject in a slot in place of its current one.
+        """
+        text.move_to(self.slot_center(slot))
+        if self.compact:
+            self.texts.submobjects[slot] = text
+        else:
+            self.element_cells[slot].submobjects[1] = text
+
+    def get_cell(self, index):
+        """
+        Returns the cell (rectangle and text) of the element at the specified index.
+        """
+        slot = self.slot_of(index)
+        if not self.compact:
+            return self.element_cells[slot]
+
+        # Compact arrays have no rectangle per cell, so make an invisible stand-in
+        top_left, top_right, bottom_right = self.grid.points[[0, 3, 7]]
+        border = Rectangle(
+            width=np.linalg.norm(top_right - top_left) / self.slot_count,
+            height=np.linalg.norm(bottom_right - top_right),
+            stroke_opacity=0,
+        ).move_to(self.slot_center(slot))
+        return VGroup(border, self.slot_text(slot))
+
+    def get_cells(self, start, end):
+        """
+        Returns the cells of the elements from start up to end (exclusive).
+        """
+        return VGroup(*[self.get_cell(index) for index in range(max(start, 0), end)])
+
+    def get_span(self, start, end, direction=DOWN):
+        """
+        Returns the left and right ends of the edge, on the side of direction, of
+        the visible cells from start up to end, or None if none of them is visible.
+
+        Unlike get_cells this never scrolls.
+        """
+        first = max(start, self.window_start)
+        last = min(end, self.window_start + self.slot_count)
+        if first >= last:
+            return None
+        cell_width = self.width / self.slot_count
+        left = self.get_corner(direction + LEFT) + RIGHT * cell_width * (
+            first - self.window_start
+        )
+        return left, left + RIGHT * cell_width * (last - first)
 
     def get_update_element_animation(self, index, value, color):
         """
         Returns an animation that updates the element at the specified index with a new value and color.
         """
-        new_text = Text(
-            str(value),
-            font=self.element_cells[index][1].font,
-            font_size=self.element_cells[index][1].font_size,
-            color=color,
-        )
-        new_text.move_to(self.element_cells[index][0].get_center())
-        return ReplacementTransform(self.element_cells[index][1], new_text)
+        slot = self.slot_of(index)
+        self.values[index - self.storage_start] = value
+        self.colors[index - self.storage_start] = ManimColor(color).to_hex()
+        new_text = self.create_text(value, color).move_to(self.slot_center(slot))
+        return ReplacementTransform(self.slot_text(slot), new_text)
 
     def get_change_element_color_animation(self, index, color):
         """
         Returns an animation to change color of an element at the specified index.
         """
-        return self.element_cells[index][1].animate.set_color(color)
+        slot = self.slot_of(index)
+        self.colors[index - self.storage_start] = ManimColor(color).to_hex()
+        return self.slot_text(slot).animate.set_color(color)
+
+    def get_change_range_color_animations(self, start, end, color):
+        """
+        Returns animations changing the color of the elements from start up to end.
+        """
+        return [
+            self.get_change_element_color_animation(index, color)
+            for index in range(start, end)
+        ]
+
+    def has_color(self, index, color):
+        """
+        Checks whether the element at the specified index currently has the color.
+        """
+        return self.colors[index - self.storage_start] == ManimColor(color).to_hex()
+
+    def get_set_colors_animation(self, colors, default=None):
+        """
+        Returns one animation bringing the elements to a target color state, or None
+        when they are already in it.
+
+        colors maps element indices to their target color. When default is given all
+        other elements are set to it, otherwise they keep their color. Only elements
+        whose color changes are animated.
+        """
+        target = self.colors.copy()
+        if default is not None:
+            target[:] = ManimColor(default).to_hex()
+        for index, color in colors.items():
+            position = index - self.storage_start
+            # Streamed elements that scrolled out of the window are not stored
+            if 0 <= position < len(target):
+                target[position] = ManimColor(color).to_hex()
+
+        animations = []
+        for position in np.flatnonzero(target != self.colors).tolist():
+            index = self.storage_start + position
+            if self.is_visible(index):
+                animations.append(
+                    self.get_change_element_color_animation(index, target[position])
+                )
+            else:
+                # Picked up when the element is scrolled into view
+                self.colors[position] = target[position]
+        if not animations:
+            return None
+        return AnimationGroup(*animations)
 
     def reset_colors(self):
         """
         Resets the color of all elements in the array to their default color.
         """
-        for elem_cell in self.element_cells:
-            elem_cell[1].set_color(self.default_color)
+        default = ManimColor(self.default_color).to_hex()
+        for position in np.flatnonzero(self.colors != default).tolist():
+            index = self.storage_start + position
+            if self.is_visible(index):
+                self.slot_text(self.slot_of(index)).set_color(self.default_color)
+        self.colors[:] = default
+
+
+class WindowedVisualArray(VisualArray):
+    """
+    A VisualArray that only creates cells for a window of its elements.
+
+    Values and colors of all elements are kept in arrays, and the window scrolls
+    by recycling its cells when an element outside of it is accessed, so the
+    number of mobjects stays constant however long the array is.
+    """
+
+    def __init__(
+        self,
+        elements,
+        font_name,
+        font_size,
+        element_color,
+        border_color,
+        window_size=20,
+        margin=4,
+        **kwargs,
+    ):
+        values = list(elements)
+        window_size = min(window_size, len(values))
+        super().__init__(
+            values,
+            font_name,
+            font_size,
+            element_color,
+            border_color,
+            slot_count=window_size,
+            **kwargs,
+        )
+
+        self.window_size = window_size
+        self.margin = margin
+
+    def is_visible(self, index):
+        """
+        Checks whether the element at the specified index has a cell in the window.
+        """
+        return self.window_start <= index < self.window_start + self.window_size
+
+    def ensure_visible(self, start, end=None):
+        """
+        Scrolls the window so elements from start up to end (exclusive) are visible.
+
+        The window is moved so that margin elements stay visible before start when
+        scrolling forward (or after end when scrolling backward). Returns by how many
+        elements the window moved.
+        """
+        end = start + 1 if end is None else end
+        window_end = self.window_start + self.window_size
+        if self.window_start <= start and end <= window_end:
+            return 0
+
+        if start < self.window_start:
+            new_start = min(start, end + self.margin - self.window_size)
+        else:
+            new_start = start - self.margin
+        new_start = max(0, min(new_start, self.element_count() - self.window_size))
+
+        scrolled = new_start - self.window_start
+        self.window_start = new_start
+        self.refresh_cells()
+        return scrolled
+
+    def refresh_cells(self):
+        """
+        Recycles the cells of the window to show the elements it currently covers.
+        """
+        for slot in range(self.window_size):
+            position = self.window_start + slot - self.storage_start
+            self.set_slot_text(
+                slot, self.create_text(self.values[position], self.colors[position])
+            )
+
+    def slot_of(self, index):
+        """
+        Returns the slot of the element at the specified index, scrolling if needed.
+        """
+        self.ensure_visible(index)
+        return index - self.window_start
+
+    def get_change_range_color_animations(self, start, end, color):
+        """
+        Only elements in the window are animated, the others are recolored in place.
+        """
+        start = max(start, self.storage_start)
+        end = min(end, self.element_count())
+        if start < end:
+            self.colors[start - self.storage_start : end - self.storage_start] = (
+                ManimColor(color).to_hex()
+            )
+        animations = []
+        window_end = self.window_start + self.window_size
+        for index in range(max(start, self.window_start), min(end, window_end)):
+            animations.append(self.get_change_element_color_animation(index, color))
+        return animations
+
+
+class StreamingVisualArray(WindowedVisualArray):
+    """
+    A WindowedVisualArray over a TextSource that only stores the elements in its
+    window, showing each byte of the text as a character.
+
+    The window only scrolls forward, reading the text as it goes, so memory stays
+    constant however large the text is.
+    """
+
+    def __init__(
+        self,
+        source,
+        font_name,
+        font_size,
+        element_color,
+        border_color,
+        window_size=20,
+        margin=4,
+        **kwargs,
+    ):
+        self.source = source
+        super().__init__(
+            source.chars(0, window_size),
+            font_name,
+            font_size,
+            element_color,
+            border_color,
+            window_size=window_size,
+            margin=margin,
+            **kwargs,
+        )
+
+    def is_visible(self, index):
+        return self.window_start <= index < self.window_start + self.window_size
+
+    def ensure_visible(self, start, end=None):
+        """
+        Scrolls the window forward so elements from start up to end are visible.
+        """
+        end = start + 1 if end is None else end
+        window_end = self.window_start + self.window_size
+        if self.window_start <= start and end <= window_end:
+            return 0
+        if start < self.window_start:
+            raise IndexError(f"cannot scroll back to element {start}")
+
+        # Stop at the end of the text, which is only known once it has been read
+        new_start = start - self.margin
+        chars = self.source.chars(new_start, new_start + self.window_size)
+        new_start = max(self.window_start, new_start - (self.window_size - len(chars)))
+
+        scrolled = new_start - self.window_start
+        colors = object_array(
+            [ManimColor(self.default_color).to_hex()] * self.window_size
+        )
+        if scrolled < self.window_size:
+            colors[: self.window_size - scrolled] = self.colors[scrolled:]
+        self.colors = colors
+        self.values = object_array(
+            list(self.source.chars(new_start, new_start + self.window_size))
+        )
+        self.window_start = self.storage_start = new_start
+        self.refresh_cells()
+        return scrolled